@@ -0,0 +1,389 @@
+#!/usr/bin/env python
+from PyQt5.QtCore import QAbstractListModel, QEvent, QModelIndex, QRect, QSize, Qt, pyqtSignal
+from PyQt5.QtGui import QCursor, QIcon, QPixmap
+from PyQt5.QtWidgets import (
+    QApplication,
+    QFrame,
+    QListView,
+    QStyle,
+    QStyledItemDelegate,
+    QStyleOptionButton,
+    QStyleOptionFrame,
+    QStyleOptionProgressBar,
+)
+
+from catalog import app_catalog
+from iconcache import VISIBLE_PRIORITY, icon_cache, icon_loader
+
+
+class AppListModel(QAbstractListModel):
+    """Class for the model holding one row per application for the grid view.
+    Only the data displayed on the tiles is kept and the icons are decoded in the background when a tile is painted for the first time.
+    The view paints only the visible tiles, so their icons are decoded before the others.
+    The decoded icons are kept in the icon cache shared with the app widgets.
+
+    Attributes
+    ----------
+    IdRole : int
+        The item data role for the App ID.
+
+    BusyRole : int
+        The item data role which is True while the application is being launched.
+
+    SelectedRole : int
+        The item data role which is True if the application is selected to be launched with the other selected applications.
+
+    selection_changed : pyqtSignal
+        Signal emitted when an application is selected or unselected.
+
+    apps : list
+        The application rows loaded from the catalog in display order.
+
+    rows : dict
+        The row numbers keyed by App ID, used to update a tile when its icon is decoded.
+
+    busy : set
+        The App IDs of the applications being launched.
+
+    selected : set
+        The App IDs of the selected applications. They are kept while hidden by the search.
+    """
+
+    IdRole: int = Qt.UserRole
+    BusyRole: int = Qt.UserRole + 1
+    SelectedRole: int = Qt.UserRole + 2
+    selection_changed = pyqtSignal()
+    apps: list = []
+    rows: dict = {}
+    busy: set = set()
+    selected: set = set()
+
+    def __init__(self, parent=None):
+        """Initialise the model with no applications.
+
+        Parameters
+        ----------
+        parent: QObject
+            The parent object of the model.
+        """
+        super(AppListModel, self).__init__(parent)
+        self.apps = []
+        self.rows = {}
+        self.busy = set()
+        self.selected = set()
+        icon_loader.loaded.connect(self.icon_loaded)
+
+    def load(self, text=""):
+        """Function for getting the applications whose name matches with the text from the catalog.
+
+        Parameters
+        ----------
+        text: str
+            The text in the search box. All the applications are loaded if it is empty.
+        """
+        self.set_apps(app_catalog.search(text))
+
+    def set_apps(self, apps):
+        """Function for replacing the applications in the model with rows loaded from the catalog.
+
+        Parameters
+        ----------
+        apps: list
+            The application rows as dictionaries in display order.
+        """
+        self.beginResetModel()
+        self.apps = apps
+        self.rows = {app["AppID"]: row for row, app in enumerate(apps)}
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        """Override function to return the number of applications."""
+        if parent.isValid():
+            return 0
+        return len(self.apps)
+
+    def data(self, index, role=Qt.DisplayRole):
+        """Override function to return the name, description, icon and App ID of the application in the row."""
+        if not index.isValid() or index.row() >= len(self.apps):
+            return None
+        app = self.apps[index.row()]
+        if role == Qt.DisplayRole:
+            return app["Name"]
+        elif role == Qt.ToolTipRole:
+            return app["Description"]
+        elif role == Qt.DecorationRole:
+            return self.icon(app["AppID"])
+        elif role == self.IdRole:
+            return app["AppID"]
+        elif role == self.BusyRole:
+            return app["AppID"] in self.busy
+        elif role == self.SelectedRole:
+            return app["AppID"] in self.selected
+        return None
+
+    def icon(self, id):
+        """Function for getting the icon of an application from the icon cache. It is decoded in the background if it is not in the cache yet.
+
+        Returns
+        -------
+        QPixmap
+            The icon scaled to the tile size, or the placeholder until it is decoded. None if the application does not have an icon.
+        """
+        app = app_catalog.app(id)
+        if app is None or not app["IconHash"]:
+            return None
+        pixmap = icon_cache.get(id, app["IconHash"])
+        if pixmap is None:
+            # The PNG data is read only when the icon has to be decoded
+            icon_loader.request(id, app["IconHash"], app_catalog.icon(id), VISIBLE_PRIORITY)
+            return icon_loader.placeholder()
+        return pixmap
+
+    def set_busy(self, id, busy):
+        """Function for showing or hiding the busy indicator on the tile of an application.
+
+        Parameters
+        ----------
+        id: int
+            The App ID saved in the database.
+
+        busy: bool
+            True while the application is being launched.
+        """
+        if busy:
+            self.busy.add(id)
+        else:
+            self.busy.discard(id)
+        if id in self.rows:
+            index = self.index(self.rows[id])
+            self.dataChanged.emit(index, index, [self.BusyRole])
+
+    def set_selected(self, id, selected):
+        """Function for selecting or unselecting an application and highlighting its tile.
+
+        Parameters
+        ----------
+        id: int
+            The App ID saved in the database.
+
+        selected: bool
+            True to select the application.
+        """
+        if selected:
+            self.selected.add(id)
+        else:
+            self.selected.discard(id)
+        if id in self.rows:
+            index = self.index(self.rows[id])
+            self.dataChanged.emit(index, index, [self.SelectedRole])
+        self.selection_changed.emit()
+
+    def icon_loaded(self, id):
+        """Function called when an icon is decoded in the background. It repaints the tile of the application if it is in the model.
+
+        Parameters
+        ----------
+        id: int
+            The App ID of the decoded icon.
+        """
+        if id in self.rows:
+            index = self.index(self.rows[id])
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+
+class AppDelegate(QStyledItemDelegate):
+    """Class for the item delegate painting an application as a tile with the same look as the app widget.
+    The buttons are only painted, and the clicks are dispatched by checking which button area contains the mouse position.
+
+    Attributes
+    ----------
+    launch_requested : pyqtSignal
+        Signal with the App ID emitted when the launch area of a tile is clicked.
+
+    edit_requested : pyqtSignal
+        Signal with the App ID emitted when the edit button of a tile is clicked.
+
+    remove_requested : pyqtSignal
+        Signal with the App ID emitted when the remove button of a tile is clicked.
+
+    tile_size : QSize
+        The size of a tile, which is the same as the app widget.
+
+    bin_icon : QIcon
+        The icon for the remove button.
+    """
+
+    launch_requested = pyqtSignal(int)
+    edit_requested = pyqtSignal(int)
+    remove_requested = pyqtSignal(int)
+    tile_size: QSize = QSize(220, 256)
+    bin_icon: QIcon = None
+
+    def __init__(self, parent=None):
+        """Load the icon for the remove button once for all the tiles.
+
+        Parameters
+        ----------
+        parent: QObject
+            The parent object of the delegate.
+        """
+        super(AppDelegate, self).__init__(parent)
+        self.bin_icon = QIcon(QPixmap("icons/bin.png"))
+
+    def regions(self, rect):
+        """Function for calculating the areas of the tile and its buttons in an item rectangle.
+
+        Parameters
+        ----------
+        rect: QRect
+            The rectangle of the item in the view.
+
+        Returns
+        -------
+        tuple
+            The rectangles of the tile, the launch button, the edit button and the remove button.
+        """
+        tile = QRect(0, 0, self.tile_size.width(), self.tile_size.height())
+        tile.moveCenter(rect.center())
+        launch = QRect(tile.left() + 10, tile.top() + 10, 200, 200)
+        edit = QRect(tile.left() + 10, tile.top() + 218, 164, 28)
+        remove = QRect(tile.left() + 182, tile.top() + 218, 28, 28)
+        return tile, launch, edit, remove
+
+    def sizeHint(self, option, index):
+        """Override function to return the tile size."""
+        return self.tile_size
+
+    def paint(self, painter, option, index):
+        """Override function to paint the frame, the launch button with the icon and name, the edit button and the remove button."""
+        widget = option.widget
+        style = widget.style() if widget is not None else QApplication.style()
+        tile, launch, edit, remove = self.regions(option.rect)
+        # Get the mouse position to highlight the button under the mouse
+        if widget is not None and option.state & QStyle.State_MouseOver:
+            mouse = widget.viewport().mapFromGlobal(QCursor.pos())
+        else:
+            mouse = None
+
+        frame = QStyleOptionFrame()
+        frame.rect = tile
+        frame.palette = option.palette
+        frame.state = QStyle.State_Enabled | QStyle.State_Raised
+        frame.frameShape = QFrame.StyledPanel
+        frame.lineWidth = 1
+        # Highlight the selected tile in the same way as the app widget
+        if index.data(AppListModel.SelectedRole):
+            painter.fillRect(tile, option.palette.highlight())
+        style.drawControl(QStyle.CE_ShapedFrame, frame, painter, widget)
+
+        for rect, text, icon in ((launch, "", None), (edit, "Edit", None), (remove, "", self.bin_icon)):
+            button = QStyleOptionButton()
+            button.rect = rect
+            button.palette = option.palette
+            button.state = QStyle.State_Enabled | QStyle.State_Raised
+            if mouse is not None and rect.contains(mouse):
+                button.state |= QStyle.State_MouseOver
+            button.text = text
+            if icon is not None:
+                button.icon = icon
+                button.iconSize = QSize(16, 16)
+            style.drawControl(QStyle.CE_PushButton, button, painter, widget)
+
+        # Paint the icon and the app name in the launch button in the same layout as the app widget
+        name_rect = QRect(launch.left(), launch.bottom() - 40, launch.width(), 30)
+        pixmap = index.data(Qt.DecorationRole)
+        if pixmap is not None:
+            icon_rect = QRect(0, 0, pixmap.width(), pixmap.height())
+            icon_rect.moveCenter(QRect(launch.left(), launch.top(), launch.width(), launch.height() - 40).center())
+            painter.drawPixmap(icon_rect, pixmap)
+        name = option.fontMetrics.elidedText(index.data(Qt.DisplayRole), Qt.ElideRight, launch.width() - 10)
+        painter.save()
+        painter.setPen(option.palette.buttonText().color())
+        painter.drawText(name_rect, Qt.AlignHCenter | Qt.AlignBottom, name)
+        painter.restore()
+
+        # Paint the busy indicator in the same place as the app widget while the additional commands are running
+        if index.data(AppListModel.BusyRole):
+            bar = QStyleOptionProgressBar()
+            bar.rect = QRect(launch.left() + 10, launch.top() + 8, launch.width() - 20, 8)
+            bar.palette = option.palette
+            bar.state = QStyle.State_Enabled | QStyle.State_Horizontal
+            bar.minimum = 0
+            bar.maximum = 0
+            style.drawControl(QStyle.CE_ProgressBar, bar, painter, widget)
+
+    def editorEvent(self, event, model, option, index):
+        """Override function to emit the signal for the button under the mouse when a tile is clicked.
+        Clicking the launch area with Ctrl selects the application instead of launching it."""
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            tile, launch, edit, remove = self.regions(option.rect)
+            id = index.data(AppListModel.IdRole)
+            if launch.contains(event.pos()) and event.modifiers() & Qt.ControlModifier:
+                model.set_selected(id, not index.data(AppListModel.SelectedRole))
+                return True
+            elif launch.contains(event.pos()):
+                self.launch_requested.emit(id)
+                return True
+            elif edit.contains(event.pos()):
+                self.edit_requested.emit(id)
+                return True
+            elif remove.contains(event.pos()):
+                self.remove_requested.emit(id)
+                return True
+        return super(AppDelegate, self).editorEvent(event, model, option, index)
+
+
+class AppGridView(QListView):
+    """Class for the grid view displaying the applications as tiles.
+    The tiles are laid out in a responsive grid and only the tiles in the viewport are painted.
+
+    Attributes
+    ----------
+    launch_hovered : pyqtSignal
+        Signal with the App ID emitted when the mouse moves onto the launch area of a tile.
+
+    grid_size : QSize
+        The size of a grid cell, which is the tile size with the spacing of the grid layout in the main window.
+
+    hovered : int
+        The App ID of the launch area under the mouse. None if the mouse is not over a launch area.
+    """
+
+    launch_hovered = pyqtSignal(int)
+    grid_size: QSize = QSize(238, 274)
+    hovered: int = None
+
+    def __init__(self, parent=None):
+        """Set the view to display the tiles in a grid and set the delegate.
+
+        Parameters
+        ----------
+        parent: QWidget
+            The parent widget of the view.
+        """
+        super(AppGridView, self).__init__(parent)
+        self.setViewMode(QListView.IconMode)
+        self.setMovement(QListView.Static)
+        self.setResizeMode(QListView.Adjust)
+        self.setLayoutMode(QListView.Batched)
+        self.setUniformItemSizes(True)
+        self.setGridSize(self.grid_size)
+        self.setSelectionMode(QListView.NoSelection)
+        self.setMouseTracking(True)
+        self.setItemDelegate(AppDelegate(self))
+        self.hovered = None
+
+    def mouseMoveEvent(self, event):
+        """Override function to repaint the tile under the mouse to update the highlighted button.
+        The launch_hovered signal is emitted once when the mouse moves onto a launch area."""
+        index = self.indexAt(event.pos())
+        hovered = None
+        if index.isValid():
+            self.viewport().update(self.visualRect(index))
+            if self.itemDelegate().regions(self.visualRect(index))[1].contains(event.pos()):
+                hovered = index.data(AppListModel.IdRole)
+        if hovered != self.hovered:
+            self.hovered = hovered
+            if hovered is not None:
+                self.launch_hovered.emit(hovered)
+        super(AppGridView, self).mouseMoveEvent(event)
@@ -0,0 +1,383 @@
+#!/usr/bin/env python
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from contextlib import redirect_stderr, redirect_stdout
+
+from PyQt5.QtCore import QCoreApplication, QEventLoop, QObject, QProcessEnvironment, pyqtSignal
+from PyQt5.QtSql import QSqlDatabase
+
+from bashpool import bash_pool
+from catalog import app_catalog
+from instance import send_request
+from launcher import LaunchJob, Launcher
+from launchlog import launch_log
+from profiler import profiler
+
+# The database next to this file, so the command works from any directory
+DATABASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "AppDatabase.db")
+
+
+def open_database(path=DATABASE):
+    """Function for connecting to the database and loading the applications into the catalog without creating any widgets.
+
+    Parameters
+    ----------
+    path: str
+        The database file.
+
+    Returns
+    -------
+    bool
+        True if the database is opened.
+    """
+    if not os.path.isfile(path):
+        return False
+    con = QSqlDatabase.addDatabase("QSQLITE")
+    con.setDatabaseName(path)
+    if not con.open():
+        return False
+    app_catalog.load()
+    return True
+
+
+def find_app(name):
+    """Function for finding an application by its name. The name is matched exactly first, then ignoring the case, then by the search.
+
+    Parameters
+    ----------
+    name: str
+        The application name, or the App ID.
+
+    Returns
+    -------
+    list
+        The App IDs of the matching applications. It has one App ID if the application is found.
+    """
+    apps = list(app_catalog.apps.values())
+    for match in (lambda app: app["Name"] == name, lambda app: app["Name"].lower() == name.lower()):
+        ids = [app["AppID"] for app in apps if match(app)]
+        if ids:
+            return ids
+    if name.isdigit() and int(name) in app_catalog.apps:
+        return [int(name)]
+    return [app["AppID"] for app in app_catalog.search(name)]
+
+
+def select_app(name, stderr=None):
+    """Function for finding the application with the name and writing an error if there is no single match.
+
+    Parameters
+    ----------
+    name: str
+        The application name, or the App ID.
+
+    stderr: file
+        The stream the error is written to. The standard error is used if not given.
+
+    Returns
+    -------
+    int
+        The App ID. None if no application or more than one application matches.
+    """
+    stderr = stderr or sys.stderr
+    ids = find_app(name)
+    if len(ids) == 1:
+        return ids[0]
+    if not ids:
+        print(f'No app matches "{name}"', file=stderr)
+    else:
+        names = ", ".join(app_catalog.app(id)["Name"] for id in ids)
+        print(f'More than one app matches "{name}": {names}', file=stderr)
+    return None
+
+
+def prepare_job(id, env=None, stderr=None):
+    """Function for creating the job launching an application from the command line.
+    The error messages are written to the standard error instead of being displayed in message boxes.
+    The additional commands are run by a new bash process, as the bash workers would take as long to start, unless they are running already.
+
+    Parameters
+    ----------
+    id: int
+        The App ID saved in the database.
+
+    env: dict
+        The environment of the invocation, e.g. when the command line is run by the running instance. The system environment is used if not given.
+
+    stderr: file
+        The stream the error messages are written to. The standard error is used if not given.
+
+    Returns
+    -------
+    LaunchJob
+        The job, which is not started yet.
+    """
+    stderr = stderr or sys.stderr
+    launcher = Launcher(id)
+    if env is not None:
+        launcher.base_env = QProcessEnvironment()
+        for name, value in env.items():
+            launcher.base_env.insert(name, value)
+    job = LaunchJob(launcher)
+    if not bash_pool.workers:
+        job.bash_pool = None
+    job.failed.connect(lambda title, message: print(f"{title}: {message.strip()}", file=stderr))
+    return job
+
+
+def list_apps(text="", as_json=False, stdout=None):
+    """Function for printing the applications matching with the text.
+
+    Parameters
+    ----------
+    text: str
+        The text matched in the same way as the search box. All the applications are printed if it is empty.
+
+    as_json: bool
+        True to print the application rows as JSON instead of the names.
+
+    stdout: file
+        The stream the applications are written to. The standard output is used if not given.
+
+    Returns
+    -------
+    int
+        The exit status.
+    """
+    stdout = stdout or sys.stdout
+    apps = app_catalog.search(text)
+    if as_json:
+        print(json.dumps([{column: app[column] for column in ("AppID", "Name", "Path", "Description", "Command", "Argument")} for app in apps], indent=2), file=stdout)
+    else:
+        for app in apps:
+            print(app["Name"], file=stdout)
+    return 0
+
+
+def build_parser():
+    """Function for getting the parser of the command line.
+
+    Returns
+    -------
+    ArgumentParser
+        The parser.
+    """
+    parser = argparse.ArgumentParser(prog="applauncher", description="Launch the apps of the App Launcher without opening the main window.")
+    parser.add_argument("--database", default=DATABASE, help="database file")
+    parser.add_argument("--local", action="store_true", help="run in this process instead of the running App Launcher")
+    parser.add_argument("--profile", action="store_const", const="trace", help="profile the command in this process and write a Chrome trace")
+    parser.add_argument("--pstats", dest="profile", action="store_const", const="pstats", help="profile the command in this process with cProfile")
+    commands = parser.add_subparsers(dest="command", required=True)
+    launch_parser = commands.add_parser("launch", help="launch an app")
+    launch_parser.add_argument("name", help="app name")
+    launch_parser.add_argument("--timing", action="store_true", help="print the time taken to start the app")
+    list_parser = commands.add_parser("list", help="list the apps")
+    list_parser.add_argument("search", nargs="?", default="", help="text matched in the same way as the search box")
+    list_parser.add_argument("--json", action="store_true", help="print the apps as JSON")
+    env_parser = commands.add_parser("env", help="print the environment an app is started with")
+    env_parser.add_argument("name", help="app name")
+    env_parser.add_argument("-0", "--null", action="store_true", help="end each variable with NUL instead of newline")
+    return parser
+
+
+class CommandLine(QObject):
+    """Class for running a command line once the applications are loaded into the catalog.
+    The launch job runs in the background and finished is emitted when it ends, so the running instance keeps serving the other invocations meanwhile.
+    The output is written to the streams of the command line, so the command lines run at the same time do not mix their output.
+
+    Attributes
+    ----------
+    finished : pyqtSignal
+        Signal with the exit status, emitted when the command line ends.
+
+    argv : list
+        The arguments of the invocation.
+
+    env : dict
+        The environment of the invocation. The system environment is used if it is None.
+
+    stdout : file
+        The stream of the output. A new StringIO if not given, e.g. for the reply of the running instance.
+
+    stderr : file
+        The stream of the errors. A new StringIO if not given.
+
+    args : Namespace
+        The arguments given by the parser.
+
+    job : LaunchJob
+        The job launching the app or preparing its environment. None for the commands without a job.
+
+    started : float
+        The time.perf_counter value when the command line is started.
+
+    status : int
+        The exit status. None until the command line ends.
+    """
+
+    finished = pyqtSignal(int)
+    argv: list = []
+    env: dict = None
+    stdout: io.TextIOBase = None
+    stderr: io.TextIOBase = None
+    args: argparse.Namespace = None
+    job: LaunchJob = None
+    started: float = 0.0
+    status: int = None
+
+    def __init__(self, argv, env=None, stdout=None, stderr=None, parent=None):
+        """Initialise the command line. It is run when start is called.
+
+        Parameters
+        ----------
+        argv: list
+            The arguments of the invocation.
+
+        env: dict
+            The environment of the invocation. The system environment is used if not given.
+
+        stdout: file
+            The stream of the output. A new StringIO if not given.
+
+        stderr: file
+            The stream of the errors. A new StringIO if not given.
+
+        parent: QObject
+            The parent object of the command line.
+        """
+        super(CommandLine, self).__init__(parent)
+        self.argv = argv
+        self.env = env
+        self.stdout = stdout if stdout is not None else io.StringIO()
+        self.stderr = stderr if stderr is not None else io.StringIO()
+        self.args = None
+        self.job = None
+        self.status = None
+
+    def start(self):
+        """Function for starting the command line. finished is emitted at once if the command line does not launch a job."""
+        self.started = time.perf_counter()
+        # argparse writes the usage to the standard streams. Nothing else runs while the arguments are parsed, so only the usage is redirected.
+        try:
+            with redirect_stdout(self.stdout), redirect_stderr(self.stderr):
+                self.args = build_parser().parse_args(self.argv)
+        except SystemExit as exit:
+            self.finish(exit.code)
+            return
+        if self.args.command == "list":
+            self.finish(list_apps(self.args.search, self.args.json, self.stdout))
+            return
+        id = select_app(self.args.name, self.stderr)
+        if id is None:
+            self.finish(1)
+            return
+        self.job = prepare_job(id, self.env, self.stderr)
+        self.job.prepare_only = self.args.command == "env"
+        self.job.finished.connect(self.job_finished)
+        self.job.start()
+
+    def job_finished(self, successful):
+        """Function called when the launch job ends. The environment is printed for env, and the time taken for launch with --timing.
+
+        Parameters
+        ----------
+        successful: bool
+            True if the app is started, or its environment is prepared.
+        """
+        self.job.deleteLater()
+        if not successful:
+            self.finish(1)
+            return
+        if self.args.command == "env":
+            env = self.job.launcher.env
+            end = "\0" if self.args.null else "\n"
+            for variable in sorted(env.keys()):
+                self.stdout.write(f"{variable}={env.value(variable)}{end}")
+        elif self.args.timing:
+            print(f"Started {self.job.launcher.name} in {(time.perf_counter() - self.started) * 1000:.1f} ms", file=self.stderr)
+        self.finish(0)
+
+    def finish(self, status):
+        """Function for ending the command line with the exit status."""
+        self.status = status
+        self.finished.emit(status)
+
+    def output(self):
+        """Function for getting the reply of the running instance.
+
+        Returns
+        -------
+        dict
+            The exit status and the standard output and error of the command line, which must use StringIO streams.
+        """
+        return {"status": self.status, "stdout": self.stdout.getvalue(), "stderr": self.stderr.getvalue()}
+
+
+def run(argv):
+    """Function for running a command line in this process and waiting for it to end.
+
+    Parameters
+    ----------
+    argv: list
+        The arguments of the invocation.
+
+    Returns
+    -------
+    int
+        The exit status.
+    """
+    command = CommandLine(argv, stdout=sys.stdout, stderr=sys.stderr)
+    loop = QEventLoop()
+    command.finished.connect(loop.quit)
+    command.start()
+    if command.status is None:
+        loop.exec()
+    return command.status
+
+
+def main(argv=None):
+    """Function for the command line. It launches an app, lists the apps or prints the environment of an app without creating any widgets.
+    The command line is handed to the running App Launcher if there is one, so the catalog and the caches are already loaded.
+
+    Parameters
+    ----------
+    argv: list
+        The arguments. The arguments of the process are used if not given.
+
+    Returns
+    -------
+    int
+        The exit status.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    args = build_parser().parse_args(argv)
+
+    # No widgets are created, so the command does not need a display
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+    # A profiled command is run in this process, so the profile covers it
+    if args.profile is not None:
+        profiler.start(args.profile)
+    if not args.local and profiler.mode is None:
+        request = {"command": "cli", "argv": argv, "database": os.path.abspath(args.database), "env": dict(os.environ)}
+        reply = send_request(request)
+        if reply is not None and reply.get("status") is not None:
+            sys.stdout.write(reply["stdout"])
+            sys.stderr.write(reply["stderr"])
+            return reply["status"]
+    if not open_database(args.database):
+        print(f"Cannot open {args.database}", file=sys.stderr)
+        return 1
+    status = run(argv)
+    # Write the launch to the launch log before exiting
+    launch_log.flush()
+    profiler.save()
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
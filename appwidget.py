@@ -1,92 +1,162 @@
 #!/usr/bin/env python
-import os
-import re
-
-from PyQt5 import uic
-from PyQt5.QtCore import QByteArray, QProcess, QProcessEnvironment, Qt, pyqtSignal
-from PyQt5.QtGui import QIcon, QPixmap
+from PyQt5.QtCore import QByteArray, QEvent, Qt, pyqtSignal
+from PyQt5.QtGui import QIcon, QPalette, QPixmap
 from PyQt5.QtSql import QSqlQuery
-from PyQt5.QtWidgets import QLabel, QMessageBox, QVBoxLayout, QWidget
+from PyQt5.QtWidgets import QLabel, QMessageBox, QProgressBar, QVBoxLayout, QWidget
 
-from editdialog import EditDialog
+from catalog import app_catalog
+from iconcache import icon_cache, icon_loader
+from launcher import LaunchJob, Launcher
+from profiling import profiled
+from uicache import load_ui
 
 
-class AppWidget(QWidget):
+class AppWidget(QWidget, Launcher):
     """Class for the app widget added to the main window.
+    The launch settings and the launch functions are inherited from Launcher.
 
     Attributes
     ----------
     removed : pyqtSignal
         Signal to be sent to main window when the remove button is clicked.
 
-    id : int
-        The App ID saved in the database.
-    
-    name : str
-        The application name.
+    selection_changed : pyqtSignal
+        Signal with True if the app is selected, emitted when the launch button is clicked with Ctrl.
+
+    icon : QByteArray
+        The PNG data of the icon. None if the application does not have an icon.
+
+    icon_hash : str
+        The IconHash of the application, used as the key of the icon cache.
+
+    icon_label : QLabel
+        The label displaying the icon or the placeholder until the icon is decoded.
 
-    path : str
-        The application file path.
+    waiting : bool
+        True while the widget is waiting for the icon to be decoded in the background.
 
-    command : str
-        Additional command to be executed on before launching the app.
+    job : LaunchJob
+        The last launch of the app. It can be cancelled by clicking the launch button while the additional commands are running.
 
-    arg : str
-        Arguments for launching the app.
+    busy_bar : QProgressBar
+        The busy indicator displayed on the launch button while the additional commands are running.
 
-    env : QProcessEnvironment
-        System environment variables.
+    selected : bool
+        True if the app is selected to be launched with the other selected apps.
     """
 
     removed = pyqtSignal()
-    id: int = None
-    name: str = ""
-    path: str = ""
-    command: str = ""
-    arg: str = ""
-    env: QProcessEnvironment = QProcessEnvironment.systemEnvironment()
-
-    def __init__(self, id):
+    selection_changed = pyqtSignal(bool)
+    icon: QByteArray = None
+    icon_hash: str = None
+    icon_label: QLabel = None
+    waiting: bool = False
+    job: LaunchJob = None
+    busy_bar: QProgressBar = None
+    selected: bool = False
+
+    @profiled
+    def __init__(self, id, row=None):
         """Load UI, get data from the database and connect the button to the corresponding functions.
 
         Parameters
         ----------
         id: int
             The App ID saved in the database.
+
+        row: dict
+            The application row already loaded from the catalog. It is taken from the catalog if not given.
         """
         super(AppWidget, self).__init__()
+        self.icon = None
+        self.icon_hash = None
+        self.icon_label = None
+        self.waiting = False
+        self.job = None
+        self.selected = False
         # Load UI
-        uic.loadUi("ui/app.ui", self)
+        load_ui("ui/app.ui", self)
         # Set icon for the remove button
         bin_icon = QPixmap("icons/bin.png")
         self.remove_btn.setIcon(QIcon(bin_icon))
         # Set layout for the launch button instead of setting an icon and text as the layout control is limited in that way
         self.launch_btn.setLayout(QVBoxLayout())
+        # Add the busy indicator over the top of the launch button, outside of its layout
+        self.busy_bar = QProgressBar(self.launch_btn)
+        self.busy_bar.setRange(0, 0)
+        self.busy_bar.setTextVisible(False)
+        self.busy_bar.setGeometry(10, 8, 180, 8)
+        self.busy_bar.hide()
         self.id = id
+        # Use the app widget as the parent of the message boxes displayed on launch
+        self.widget = self
         # Get the app data
-        self.get_data()
+        self.get_data(row)
         # Connect button clicked signal to corresponding functions
-        self.launch_btn.clicked.connect(self.launch)
+        self.launch_btn.clicked.connect(self.launch_clicked)
         self.edit_btn.clicked.connect(self.edit)
         self.remove_btn.clicked.connect(self.remove)
+        # Prepare the launch when the mouse moves over the launch button
+        self.launch_btn.installEventFilter(self)
+
+    def eventFilter(self, object, event):
+        """Override function to pre-warm the launch when the mouse enters the launch button.
+        Clicking the launch button with Ctrl selects the app instead of launching it."""
+        if object is self.launch_btn and event.type() == QEvent.Enter:
+            # The pre-warmer is imported when first used, so it does not slow down the start-up
+            from prewarm import prewarmer
+
+            prewarmer.warm(self.id)
+        if object is self.launch_btn and event.type() == QEvent.MouseButtonPress and event.modifiers() & Qt.ControlModifier:
+            self.set_selected(not self.selected)
+            self.selection_changed.emit(self.selected)
+            return True
+        return super(AppWidget, self).eventFilter(object, event)
+
+    def set_selected(self, selected):
+        """Function for selecting the app. The selected app widget is highlighted.
+
+        Parameters
+        ----------
+        selected: bool
+            True to select the app.
+        """
+        self.selected = selected
+        self.frame.setBackgroundRole(QPalette.Highlight if selected else QPalette.Window)
+        self.frame.setAutoFillBackground(selected)
 
-    def get_data(self):
-        """Function for getting data from the database and set the icon to the launch button."""
-        query = QSqlQuery(f"SELECT * FROM App WHERE AppID = {self.id}")
-        query.next()
-        self.name = query.value("Name")
-        icon = query.value("Icon")
+    @profiled
+    def get_data(self, row=None):
+        """Function for getting data from the database and set the icon to the launch button.
+
+        Parameters
+        ----------
+        row: dict
+            The application row already loaded from the catalog. It is taken from the catalog if not given.
+        """
+        if row is None:
+            row = app_catalog.app(self.id)
+        self.name = row["Name"]
+        # The icon is loaded from the database only the first time it is displayed
+        self.icon = app_catalog.icon(self.id)
+        self.icon_hash = row["IconHash"]
+        self.icon_label = None
+        self.waiting = False
         # Clear the launch button layout
         while self.launch_btn.layout().count():
             self.launch_btn.layout().takeAt(0).widget().deleteLater()
         # Set the icon to the launch button if available
-        if type(icon) == QByteArray:
-            pixmap = QPixmap()
-            pixmap.loadFromData(QByteArray(icon), "png")
-            button = QLabel()
-            pixmap = pixmap.scaled(128, 128)
-            button.setPixmap(pixmap)
-            self.launch_btn.layout().addWidget(button)
+        if self.icon is not None:
+            self.icon_label = QLabel()
+            # The scaled icon is decoded only once and shared with the other widgets
+            pixmap = icon_cache.get(self.id, self.icon_hash)
+            if pixmap is None:
+                # Display a placeholder until the icon is decoded in the background
+                pixmap = icon_loader.placeholder()
+                self.waiting = True
+                icon_loader.request(self.id, self.icon_hash, self.icon, callback=self.icon_loaded)
+            self.icon_label.setPixmap(pixmap)
+            self.launch_btn.layout().addWidget(self.icon_label)
         # Set the app name to the launch button
         label = QLabel()
         label.setText(self.name)
@@ -95,108 +165,72 @@ class AppWidget(QWidget):
         self.launch_btn.layout().addWidget(label)
         self.launch_btn.layout().setAlignment(Qt.AlignCenter)
         # Set app description to the launch button as a tooltip
-        self.launch_btn.setToolTip(query.value("Description"))
-        self.path = query.value("Path")
-        self.command = query.value("Command")
-        self.arg = query.value("Argument")
-
-    def launch(self):
-        """Run the additional commands, set environment variables and launch the app."""
-        # Try launching the app if no additional commands or commands successfully executed.
-        if self.command == "" or self.run_commands(self.command):
-            # Get the environment variable from the database and set them to the process in order
-            query = QSqlQuery(f"SELECT * FROM Env WHERE AppID = {self.id} ORDER BY ExeOrder ASC")
-            while query.next():
-                value = query.value("Value")
-                value = self.replace_env(value)
-                self.env.insert(query.value("Name"), value)
-            process = QProcess()
-            process.setProgram(self.replace_env(self.path))
-            process.setArguments(self.arg.split())
-            process.setProcessEnvironment(self.env)
-            orig_path = os.environ["PATH"]
-            os.environ["PATH"] = process.processEnvironment().value("PATH")
-            if process.startDetached()[0] == False:
-                QMessageBox.critical(
-                    self, "Launch Failed", "Please check the configuration"
-                )
-            os.environ["PATH"] = orig_path
-
-    def run_commands(self, commands):
-        """Run the additional commands. It runs backtick commands first and replace the returned value with the commands.
-
-        Returns
-        -------
-        bool
-            True if commands are successfully executed, otherwise False.
+        self.launch_btn.setToolTip(row["Description"])
+        self.path = row["Path"]
+        self.command = row["Command"]
+        self.arg = row["Argument"]
+
+    def icon_loaded(self, id):
+        """Function called by the icon loader when the icon requested by this widget is decoded. It replaces the placeholder
+        unless the icon is changed in the meantime.
+
+        Parameters
+        ----------
+        id: int
+            The App ID of the decoded icon.
         """
-        process = QProcess()
-
-        # Replace backtick commands
-        if (count := int(commands.count("`") / 2)) > 0:
-            sub = commands
-            for i in range(count):
-                firstindex = sub.find("`") + 1
-                sub = sub[firstindex::]
-                secondindex = sub.find("`")
-                backtick = sub[0:secondindex]
-                sub = sub[secondindex + 1 : :]
-                process.start(backtick)
-                process.waitForFinished()
-                replacement = process.readLine().data().decode()
-                commands = commands.replace("`" + backtick + "`", replacement)
-
-        # Run commands
-        commands = re.sub(r"(\n+)", r"; ", commands)
-        bash = f'bash -c " {commands} ; env"'
-        process.start(bash)
-        if process.waitForStarted() and process.waitForFinished():
-            error = process.readAllStandardError().data().decode()
-            # If no error, replace all the system environment variables with the environment variables set with the commands 
-            if error == "":
-                self.env.clear()
-                for env in process.readAll().data().decode().splitlines():
-                    if env.count("=") == 1:
-                        name = env.split("=")[0]
-                        val = env.split("=")[1]
-                        self.env.insert(name, val)
-                return True
-            # Otherwise, pop up a message box and display the error
-            else :
-                QMessageBox.critical(
-                    self, "Run Additional Command Failed", error
-                )
-                return False
-        # Pop up a message box if it failed to execute the commands
-        else:
-            QMessageBox.critical(
-                self, "Run Additional Command Failed", "Please check the configuration"
-            )
-            return False
-
-    def replace_env(self, text):
-        """Replace environment variables in a text with the actual values.
-
-        Returns
-        -------
-        text : str
-            Replaced text.
+        if id != self.id or self.icon is None:
+            return
+        pixmap = icon_cache.get(self.id, self.icon_hash)
+        if pixmap is None:
+            return
+        self.icon_label.setPixmap(pixmap)
+        self.waiting = False
+
+    def launch_clicked(self):
+        """Function for the launch button. It launches the app, or cancels the launch if the additional commands are still running.
+        The busy indicator is displayed until the additional commands finish and the standard error is displayed as its tooltip."""
+        if self.job is not None and self.job.is_running():
+            self.job.cancel()
+            return
+        # Use the pre-warmed environment if the launch is prepared
+        from prewarm import prewarmer
+
+        prewarmer.apply(self)
+        self.job = self.launch()
+        if self.job.is_running():
+            self.busy_bar.setToolTip("Running the additional commands. Click to cancel.")
+            self.busy_bar.show()
+            self.job.stderr_received.connect(self.show_stderr)
+            self.job.finished.connect(self.launch_finished)
+
+    def show_stderr(self, text):
+        """Function for displaying the last lines written to the standard error by the additional commands on the busy indicator.
+
+        Parameters
+        ----------
+        text: str
+            The text written to the standard error.
         """
-        if (count := text.count("$")) > 0:
-            sub = text
-            for i in range(count):
-                firstindex = sub.find('"$') + 2
-                sub = sub[firstindex::]
-                secondindex = sub.find('"')
-                v = sub[0:secondindex]
-                sub = sub[secondindex + 1 : :]
-                replacement = self.env.value(v)
-                text = text.replace(f'"${v}"', replacement)
-        return text
+        lines = (self.busy_bar.toolTip() + "\n" + text).splitlines()
+        self.busy_bar.setToolTip("\n".join(lines[-10:]))
+
+    def launch_finished(self, launched):
+        """Function called when the launch finishes. It hides the busy indicator.
+
+        Parameters
+        ----------
+        launched: bool
+            True if the app is started.
+        """
+        self.busy_bar.hide()
 
     def edit(self):
         """Function for Edit button. It displays an Edit Dialog with exisitng data.
         Replace the data with new data if editted. Otherwise, remove the newly added environment variables and get the previously saved ones."""
+        # The dialogs are imported when first used, so they do not slow down the start-up
+        from editdialog import EditDialog
+
         self.editdialog = EditDialog(self.id)
         # Update the data if the update on the edit dialog is saved
         if self.editdialog.exec():
@@ -208,7 +242,7 @@ class AppWidget(QWidget):
 
     def remove(self):
         """Function for the Remove button. It displays a message box to confirm the action.
-        Remove the data from the database and emit the removed signal if confirmed."""
+        Remove the data from the database and the catalog and emit the removed signal if confirmed."""
         msg = QMessageBox.question(
             self,
             "Remove App",
@@ -217,4 +251,5 @@ class AppWidget(QWidget):
         if msg == QMessageBox.Yes:
             QSqlQuery(f"DELETE FROM App WHERE AppID = {self.id}")
             QSqlQuery(f"DELETE FROM Env WHERE AppID = {self.id}")
+            app_catalog.remove_app(self.id)
             self.removed.emit()
@@ -0,0 +1,440 @@
+#!/usr/bin/env python
+import uuid
+
+from PyQt5.QtCore import QEventLoop, QObject, QProcess, QProcessEnvironment, QTimer, pyqtSignal
+
+from envreader import EnvReader
+
+# The script run by each worker. It reads the requests framed by NUL characters from the standard input:
+# the token, the number and the list of the environment variables to set, the number and the list of the names to unset, and the commands.
+# Only the differences from the environment of the worker are sent, as bash reads the standard input one byte at a time.
+# The commands are run in a subshell with the given environment, so they do not change the worker or each other.
+# The environment is printed NUL-delimited after the token, and the exit status is printed after the token at the end.
+# The tokens are printed after a NUL character, so they are separate entries even if the output of the commands does not end with one.
+# The token is also printed to the standard error, so the reader knows the standard error of the request is complete.
+# The variables of the script are prefixed, so they do not hide the environment variables of the same names.
+WORKER_SCRIPT = """
+while IFS= read -r -d '' __worker_token; do
+    __worker_set=()
+    IFS= read -r -d '' __worker_count
+    for ((__worker_i = 0; __worker_i < __worker_count; __worker_i++)); do
+        IFS= read -r -d '' __worker_entry
+        __worker_set+=("$__worker_entry")
+    done
+    __worker_unset=()
+    IFS= read -r -d '' __worker_count
+    for ((__worker_i = 0; __worker_i < __worker_count; __worker_i++)); do
+        IFS= read -r -d '' __worker_entry
+        __worker_unset+=("$__worker_entry")
+    done
+    IFS= read -r -d '' __worker_commands
+    (
+        unset "${__worker_unset[@]}" 2>/dev/null
+        for __worker_entry in "${__worker_set[@]}"; do
+            export "$__worker_entry" 2>/dev/null
+        done
+        unset __worker_set __worker_unset __worker_entry __worker_count __worker_i
+        eval "$__worker_commands"
+        printf '\\0%s\\0' "$__worker_token"
+        env -0
+    ) </dev/null
+    printf '\\0%s %s\\0' "$__worker_token" "$?"
+    printf '%s\\n' "$__worker_token" >&2
+done
+"""
+
+
+class BashRequest(QObject):
+    """Class for the additional commands sent to a bash worker.
+
+    Attributes
+    ----------
+    stderr_received : pyqtSignal
+        Signal with the text written to the standard error by the commands, emitted as soon as it is written.
+
+    finished : pyqtSignal
+        Signal emitted when the commands finish.
+
+    commands : str
+        The additional commands.
+
+    env : dict
+        The values of the environment variables the commands are run in keyed by name.
+
+    values : dict
+        The environment variables set by the commands keyed by name. None until the commands finish,
+        or if the commands exit before the environment is printed.
+
+    token : str
+        The random token marking the end of the output of the request.
+
+    status : int
+        The exit status of the subshell, which is not 0 if the commands exit before the environment is printed. -1 until they finish.
+
+    worker : BashWorker
+        The worker running the commands.
+    """
+
+    stderr_received = pyqtSignal(str)
+    finished = pyqtSignal()
+    commands: str = ""
+    env: dict = {}
+    values: dict = None
+    token: str = ""
+    status: int = -1
+    worker: "BashWorker" = None
+
+    def __init__(self, commands, env, parent=None):
+        """Initialise the request. It is run when it is given to a worker.
+
+        Parameters
+        ----------
+        commands: str
+            The additional commands.
+
+        env: QProcessEnvironment
+            The environment variables the commands are run in.
+
+        parent: QObject
+            The parent object.
+        """
+        super(BashRequest, self).__init__(parent)
+        self.commands = commands
+        self.env = {name: env.value(name) for name in env.keys()}
+        self.values = None
+        self.token = uuid.uuid4().hex
+        self.status = -1
+        self.worker = None
+
+    def frame(self, base):
+        """Function for getting the request in the format read by the worker script.
+
+        Parameters
+        ----------
+        base: dict
+            The values of the environment variables of the worker keyed by name.
+
+        Returns
+        -------
+        bytes
+            The token, the environment variables to set and to unset with their numbers and the commands, each followed by a NUL character.
+        """
+        changed = [f"{name}={value}" for name, value in self.env.items() if base.get(name) != value]
+        removed = [name for name in base if name not in self.env]
+        fields = [self.token, str(len(changed))] + changed + [str(len(removed))] + removed + [self.commands]
+        return b"".join(field.encode() + b"\0" for field in fields)
+
+    def cancel(self):
+        """Function for stopping the commands. The worker is killed, as the commands cannot be interrupted otherwise.
+        A request still waiting for a worker is taken out of the queue of the pool."""
+        if self.worker is not None:
+            self.worker.kill()
+        elif isinstance(self.parent(), BashPool):
+            self.parent().dequeue(self)
+
+    def wait(self, msecs=30000):
+        """Function for waiting for the commands to finish while processing the events.
+
+        Parameters
+        ----------
+        msecs: int
+            The maximum time to wait in milliseconds.
+
+        Returns
+        -------
+        bool
+            True if the commands finished.
+        """
+        if self.status == -1:
+            loop = QEventLoop()
+            self.finished.connect(loop.quit)
+            QTimer.singleShot(msecs, loop.quit)
+            loop.exec()
+        return self.status != -1
+
+
+class BashWorker(QObject):
+    """Class for a long-lived, non-login bash without the rc files running one request at a time.
+
+    Attributes
+    ----------
+    exited : pyqtSignal
+        Signal emitted when the worker stops, so the pool can drop it.
+
+    process : QProcess
+        The bash process.
+
+    env : dict
+        The values of the environment variables of the bash process keyed by name.
+
+    request : BashRequest
+        The request being run. None if the worker is idle.
+
+    reader : EnvReader
+        The reader of the environment variables printed by the request.
+
+    stderr : bytearray
+        The standard error of the request read so far but not emitted yet.
+
+    stderr_done : bool
+        True when the end of the standard error of the request is read.
+    """
+
+    exited = pyqtSignal()
+    process: QProcess = None
+    env: dict = {}
+    request: BashRequest = None
+    reader: EnvReader = None
+    stderr: bytearray = None
+    stderr_done: bool = False
+
+    def __init__(self, env, parent=None):
+        """Start the bash process with the worker script.
+
+        Parameters
+        ----------
+        env: QProcessEnvironment
+            The environment variables of the bash process.
+
+        parent: QObject
+            The parent object.
+        """
+        super(BashWorker, self).__init__(parent)
+        self.env = {name: env.value(name) for name in env.keys()}
+        self.request = None
+        self.reader = None
+        self.stderr = bytearray()
+        self.stderr_done = False
+        self.process = QProcess(self)
+        self.process.readyReadStandardOutput.connect(self.read_stdout)
+        self.process.readyReadStandardError.connect(self.read_stderr)
+        self.process.finished.connect(self.process_finished)
+        self.process.errorOccurred.connect(self.process_error)
+        self.process.setProcessEnvironment(env)
+        self.process.start("bash", ["--noprofile", "--norc", "-c", WORKER_SCRIPT])
+
+    def is_idle(self):
+        """Function for checking if the worker can take a request."""
+        return self.request is None and self.process.state() != QProcess.NotRunning
+
+    def submit(self, request):
+        """Function for sending a request to the worker.
+
+        Parameters
+        ----------
+        request: BashRequest
+            The request to run.
+        """
+        self.request = request
+        request.worker = self
+        token = request.token.encode()
+        self.reader = EnvReader(token, token + b" ")
+        self.stderr = bytearray()
+        self.stderr_done = False
+        self.process.write(request.frame(self.env))
+
+    def read_stdout(self):
+        """Function called when the worker writes to the standard output. The environment variables are read as they are received,
+        and the request finishes when the end of the output is read."""
+        data = self.process.readAllStandardOutput().data()
+        if self.request is None:
+            return
+        self.reader.feed(data)
+        self.check_finished()
+
+    def read_stderr(self):
+        """Function called when the worker writes to the standard error. The text before the token is emitted at once."""
+        self.stderr += self.process.readAllStandardError().data()
+        if self.request is None:
+            return
+        marker = (self.request.token + "\n").encode()
+        end = self.stderr.find(marker)
+        if end != -1:
+            text = self.stderr[:end]
+            self.stderr = self.stderr[end + len(marker) :]
+            self.stderr_done = True
+        else:
+            # Keep the end of the text back if it can be the beginning of the token
+            keep = max((i for i in range(1, len(marker)) if self.stderr.endswith(marker[:i])), default=0)
+            text = self.stderr[: len(self.stderr) - keep]
+            self.stderr = self.stderr[len(self.stderr) - keep :]
+        if text:
+            self.request.stderr_received.emit(bytes(text).decode(errors="replace"))
+        self.check_finished()
+
+    def check_finished(self):
+        """Function for finishing the request when the exit status and the end of the standard error are read."""
+        if self.request is None or not self.stderr_done or not self.reader.ended:
+            return
+        request = self.request
+        request.status = int(self.reader.end_entry.split(" ")[1])
+        request.values = self.reader.finish()
+        self.request = None
+        request.worker = None
+        request.finished.emit()
+
+    def process_finished(self):
+        """Function called when the bash process stops. The request being run finishes without the environment."""
+        request = self.request
+        self.request = None
+        if request is not None:
+            request.worker = None
+            request.status = 255
+            request.finished.emit()
+        self.exited.emit()
+
+    def process_error(self, error):
+        """Function called when the bash process cannot be started."""
+        if error == QProcess.FailedToStart:
+            self.process_finished()
+
+    def kill(self):
+        """Function for killing the worker without finishing the request being run.
+        The request does not emit finished, so it is deleted here instead of by the pool."""
+        request = self.request
+        self.request = None
+        if request is not None:
+            request.worker = None
+            request.deleteLater()
+        self.process.finished.disconnect()
+        self.process.errorOccurred.disconnect()
+        self.process.kill()
+        self.process.waitForFinished(1000)
+        self.exited.emit()
+
+    def stop(self):
+        """Function for stopping an idle worker by closing its standard input."""
+        self.process.closeWriteChannel()
+
+
+class BashPool(QObject):
+    """Class for the pool of the bash workers kept alive to run the additional commands, so each launch does not start bash.
+    More workers are started when all the workers are busy, up to max_size, and the extra workers stop once they are idle.
+    The requests beyond max_size wait in a queue until a worker is idle.
+
+    Attributes
+    ----------
+    size : int
+        The number of workers kept alive.
+
+    max_size : int
+        The maximum number of workers running at the same time.
+
+    workers : list
+        The running workers.
+
+    queue : list
+        The requests waiting for a worker in order.
+    """
+
+    size: int = 2
+    max_size: int = 4
+    workers: list = []
+    queue: list = []
+
+    def __init__(self, size=2, max_size=4):
+        """Initialise the pool. The workers are started by start, or by the first request.
+
+        Parameters
+        ----------
+        size: int
+            The number of workers kept alive.
+
+        max_size: int
+            The maximum number of workers running at the same time. It is at least size.
+        """
+        super(BashPool, self).__init__()
+        self.size = size
+        self.max_size = max(size, max_size)
+        self.workers = []
+        self.queue = []
+
+    def start(self):
+        """Function for starting the workers, e.g. after the main window is displayed."""
+        while len(self.workers) < self.size:
+            self.add_worker()
+
+    def add_worker(self):
+        """Function for starting a new worker.
+
+        Returns
+        -------
+        BashWorker
+            The new worker.
+        """
+        worker = BashWorker(QProcessEnvironment.systemEnvironment(), self)
+        worker.exited.connect(lambda: self.remove_worker(worker))
+        self.workers.append(worker)
+        return worker
+
+    def remove_worker(self, worker):
+        """Function for dropping a worker after it stops. A new worker is started for the waiting requests."""
+        if worker in self.workers:
+            self.workers.remove(worker)
+        worker.deleteLater()
+        self.dispatch()
+
+    def run(self, commands, env=None):
+        """Function for running the additional commands on an idle worker without waiting for them.
+        The request waits in the queue if max_size workers are busy.
+
+        Parameters
+        ----------
+        commands: str
+            The additional commands.
+
+        env: QProcessEnvironment
+            The environment variables the commands are run in. The system environment is used if not given.
+
+        Returns
+        -------
+        BashRequest
+            The request, which emits the finished signal when the commands finish.
+        """
+        if env is None:
+            env = QProcessEnvironment.systemEnvironment()
+        request = BashRequest(commands, env, self)
+        request.finished.connect(self.request_finished)
+        request.finished.connect(request.deleteLater)
+        self.queue.append(request)
+        self.dispatch()
+        return request
+
+    def dispatch(self):
+        """Function for giving the waiting requests to the idle workers in order. New workers are started while there are fewer than max_size."""
+        while self.queue:
+            worker = next((worker for worker in self.workers if worker.is_idle()), None)
+            if worker is None:
+                if len(self.workers) >= self.max_size:
+                    return
+                worker = self.add_worker()
+            worker.submit(self.queue.pop(0))
+
+    def dequeue(self, request):
+        """Function for dropping a request waiting for a worker, e.g. when it is cancelled.
+        The request does not emit finished, so it is deleted here as the cancelled requests of the workers are."""
+        if request in self.queue:
+            self.queue.remove(request)
+            request.deleteLater()
+
+    def request_finished(self):
+        """Function called when a request finishes. The waiting requests are run and the extra idle workers are stopped."""
+        self.dispatch()
+        idle = [worker for worker in self.workers if worker.is_idle()]
+        for worker in idle[: max(0, len(self.workers) - self.size)]:
+            self.workers.remove(worker)
+            worker.stop()
+
+    def close(self):
+        """Function for stopping all the workers. The waiting requests finish without the environment, as when their worker stops."""
+        queue = self.queue
+        self.queue = []
+        for worker in list(self.workers):
+            worker.kill()
+        for request in queue:
+            request.status = 255
+            request.finished.emit()
+
+
+# The bash workers shared by the launches
+bash_pool = BashPool()
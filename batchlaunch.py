@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+import time
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from launcher import LaunchJob, Launcher
+from prewarm import prewarmer
+
+
+class BatchLaunch(QObject):
+    """Class for launching several applications at once, e.g. the tools opened at the start of every shift.
+    The additional commands and the environment variables of the apps are prepared at the same time, up to max_workers at once,
+    and the apps are started together once all of them are prepared. The apps which fail to prepare are not started.
+
+    Attributes
+    ----------
+    app_started : pyqtSignal
+        Signal with the App ID emitted when the preparation of an app starts.
+
+    app_finished : pyqtSignal
+        Signal with the App ID emitted when the preparation of an app finishes or fails.
+
+    finished : pyqtSignal
+        Signal with the results emitted once all the apps are started.
+
+    max_workers : int
+        The number of apps prepared at the same time.
+
+    pending : list
+        The App IDs waiting to be prepared in order.
+
+    jobs : dict
+        The jobs preparing the launches keyed by App ID.
+
+    started : dict
+        The time the preparation of each app started keyed by App ID.
+
+    results : dict
+        The result of each app keyed by App ID as a dictionary with its name, the preparation time in seconds, whether it is launched and the error.
+
+    launchers : dict
+        The prepared launchers keyed by App ID, which are started once all the apps are prepared.
+    """
+
+    app_started = pyqtSignal(int)
+    app_finished = pyqtSignal(int)
+    finished = pyqtSignal(list)
+    max_workers: int = 4
+    pending: list = []
+    jobs: dict = {}
+    started: dict = {}
+    results: dict = {}
+    launchers: dict = {}
+
+    def __init__(self, ids, parent=None, max_workers=None):
+        """Initialise the batch. It does not prepare anything until start is called.
+
+        Parameters
+        ----------
+        ids: list
+            The App IDs of the applications to launch. An app given twice is launched once.
+
+        parent: QObject
+            The parent object of the batch.
+
+        max_workers: int
+            The number of apps prepared at the same time. The class default is used if not given.
+        """
+        super(BatchLaunch, self).__init__(parent)
+        if max_workers is not None:
+            self.max_workers = max_workers
+        self.pending = list(dict.fromkeys(ids))
+        self.jobs = {}
+        self.started = {}
+        self.results = {id: {"AppID": id, "Name": "", "Time": 0.0, "Launched": False, "Error": ""} for id in self.pending}
+        self.launchers = {}
+
+    def start(self):
+        """Function for starting the preparation of the first apps."""
+        if not self.pending:
+            self.launch_all()
+            return
+        while self.pending and len(self.jobs) < self.max_workers:
+            self.prepare(self.pending.pop(0))
+
+    def prepare(self, id):
+        """Function for running the additional commands and setting the environment variables of an app without starting it.
+
+        Parameters
+        ----------
+        id: int
+            The App ID saved in the database.
+        """
+        launcher = Launcher(id)
+        self.results[id]["Name"] = launcher.name
+        self.started[id] = time.perf_counter()
+        # Use the pre-warmed environment if the launch is prepared
+        prewarmer.apply(launcher)
+        job = LaunchJob(launcher, self)
+        job.prepare_only = True
+        job.failed.connect(lambda title, message: self.prepare_failed(id, message))
+        job.finished.connect(lambda prepared: self.prepared(id, prepared))
+        self.jobs[id] = job
+        self.app_started.emit(id)
+        job.start()
+
+    def prepare_failed(self, id, message):
+        """Function called when the preparation of an app fails. The error is kept for the summary.
+
+        Parameters
+        ----------
+        id: int
+            The App ID saved in the database.
+
+        message: str
+            The error message.
+        """
+        self.results[id]["Error"] = message.strip()
+
+    def prepared(self, id, prepared):
+        """Function called when the preparation of an app finishes. The next app is prepared, and the apps are started once all of them are prepared.
+
+        Parameters
+        ----------
+        id: int
+            The App ID saved in the database.
+
+        prepared: bool
+            True if the launcher is prepared.
+        """
+        job = self.jobs.pop(id, None)
+        if job is None:
+            return
+        self.results[id]["Time"] = time.perf_counter() - self.started[id]
+        if prepared:
+            self.launchers[id] = job.launcher
+        elif self.results[id]["Error"] == "":
+            self.results[id]["Error"] = "Cancelled"
+        job.deleteLater()
+        self.app_finished.emit(id)
+        if self.pending:
+            self.prepare(self.pending.pop(0))
+        elif not self.jobs:
+            self.launch_all()
+
+    def launch_all(self):
+        """Function for starting all the prepared apps together and emitting the results."""
+        for id, launcher in self.launchers.items():
+            job = LaunchJob(launcher, self)
+            job.start()
+            self.results[id]["Launched"] = job.state == LaunchJob.LAUNCHED
+            job.deleteLater()
+        self.launchers = {}
+        self.finished.emit(list(self.results.values()))
+
+    def is_running(self):
+        """Function for checking if an app is still being prepared.
+
+        Returns
+        -------
+        bool
+            True until all the apps are prepared.
+        """
+        return bool(self.jobs or self.pending)
+
+    def cancel(self):
+        """Function for cancelling the apps not prepared yet. The apps already prepared are started."""
+        self.pending = []
+        for job in list(self.jobs.values()):
+            job.cancel()
+
+
+def summary(results):
+    """Function for getting the summary of a batch launch with the preparation time and the error of each app.
+
+    Parameters
+    ----------
+    results: list
+        The results emitted by BatchLaunch.finished.
+
+    Returns
+    -------
+    str
+        The number of apps launched followed by one line per app.
+    """
+    launched = sum(1 for result in results if result["Launched"])
+    lines = [f"Launched {launched} of {len(results)} apps"]
+    for result in results:
+        line = f"{result['Name'] or result['AppID']}: prepared in {result['Time'] * 1000:.0f} ms"
+        if result["Error"] != "":
+            line = f"{result['Name'] or result['AppID']}: failed after {result['Time'] * 1000:.0f} ms - {result['Error']}"
+        elif not result["Launched"]:
+            line = line + ", failed to start"
+        lines.append(line)
+    return "\n".join(lines)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+# Run from the repository root, so the modules are found
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Additional commands similar to an app setting up its environment
+COMMANDS = 'export BENCH_VERSION=1.0\nexport BENCH_ROOT=/opt/bench/"$BENCH_VERSION"\nexport PATH="$BENCH_ROOT"/bin:"$PATH"'
+
+
+def measure(launches=50, commands=COMMANDS):
+    """Function for measuring the time of running the additional commands by starting bash for each launch and by the bash workers.
+
+    Parameters
+    ----------
+    launches: int
+        The number of times the commands are run by each method.
+
+    commands: str
+        The additional commands.
+
+    Returns
+    -------
+    dict
+        The median and the mean time in seconds of running the commands by each method.
+    """
+    os.chdir(ROOT)
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    from PyQt5.QtCore import QCoreApplication, QProcess
+
+    from bashpool import BashPool
+    from launcher import bash_script
+
+    app = QCoreApplication.instance() or QCoreApplication([])
+    times = {"fork": [], "pool": []}
+    for i in range(launches):
+        start = time.perf_counter()
+        process = QProcess()
+        process.start("bash", ["-c", bash_script(commands)])
+        process.waitForFinished()
+        process.readAllStandardOutput()
+        times["fork"].append(time.perf_counter() - start)
+
+    pool = BashPool()
+    pool.start()
+    # Wait for the workers to start, as they are started before the first launch
+    pool.run("true").wait()
+    for i in range(launches):
+        start = time.perf_counter()
+        request = pool.run(commands)
+        request.wait()
+        times["pool"].append(time.perf_counter() - start)
+    pool.close()
+    app.processEvents()
+    return {method: {"median": statistics.median(values), "mean": statistics.mean(values)} for method, values in times.items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare running the additional commands on the bash workers with starting bash for each launch.")
+    parser.add_argument("--launches", type=int, default=50, help="number of launches measured for each method")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    results = measure(args.launches)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for method, result in results.items():
+            print(f"{method:6}{result['median'] * 1000:10.2f} ms median{result['mean'] * 1000:10.2f} ms mean")
+        print(f"speed-up {results['fork']['median'] / results['pool']['median']:.1f}x")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+import argparse
+import json
+import os
+import sys
+import time
+
+# Run from the repository root, so the modules are found
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The numbers of references in the PATH-style values measured
+SIZES = (100, 1000, 10000)
+
+
+def legacy_replace(text, env):
+    """Function for replacing the "$VAR" references in the same way as Launcher.replace_env before the expander, for comparison."""
+    if (count := text.count("$")) > 0:
+        sub = text
+        for i in range(count):
+            firstindex = sub.find('"$') + 2
+            sub = sub[firstindex::]
+            secondindex = sub.find('"')
+            v = sub[0:secondindex]
+            sub = sub[secondindex + 1 : :]
+            text = text.replace(f'"${v}"', env.value(v))
+    return text
+
+
+def timed(function, repeat=3):
+    """Function for getting the shortest time in seconds of calling a function."""
+    times = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def measure(sizes=SIZES):
+    """Function for measuring the time of expanding PATH-style values with an increasing number of references.
+
+    Parameters
+    ----------
+    sizes: tuple
+        The numbers of references in the values.
+
+    Returns
+    -------
+    dict
+        The time in seconds of the expander without the kept results, with them and of the previous implementation keyed by the number of references.
+    """
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    from PyQt5.QtCore import QProcessEnvironment
+
+    from expander import Expander, compile_template, new_version
+
+    env = QProcessEnvironment()
+    for i in range(100):
+        env.insert(f"BENCH_{i}", f"/opt/bench/{i}/bin")
+    results = {}
+    for size in sizes:
+        text = ":".join(f'"$BENCH_{i % 100}"' for i in range(size))
+        expander = Expander()
+        version = new_version()
+
+        def expand():
+            compile_template.cache_clear()
+            expander.expand(text, env)
+
+        expander.expand(text, env, version)
+        results[size] = {
+            "expander": timed(expand),
+            "memoized": timed(lambda: expander.expand(text, env, version)),
+            "legacy": timed(lambda: legacy_replace(text, env), repeat=1),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the expansion of the environment variables in long PATH-style values.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="numbers of references in the values")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    results = measure(args.sizes)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'refs':>8}{'expander':>14}{'memoized':>14}{'legacy':>14}")
+        for size, result in results.items():
+            print(f"{size:8}" + "".join(f"{result[method] * 1000:11.3f} ms" for method in ("expander", "memoized", "legacy")))
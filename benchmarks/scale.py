@@ -0,0 +1,422 @@
+#!/usr/bin/env python
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+
+# Run from the repository root, so the modules, the .ui files and the icons are found
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The numbers of apps in the generated catalogs
+SIZES = (100, 1000, 10000)
+
+# The largest number of environment variables of an app
+MAX_ENVS = 50
+
+# The text typed into the search box one keystroke at a time
+SEARCH_TEXT = "Bench App 12"
+
+# The window widths the main window is resized to in turn
+WIDTHS = (1600, 900, 1300, 700)
+
+# The number of apps whose launches are prepared
+LAUNCHES = 10
+
+
+def png(width, height, color):
+    """Function for encoding an image filled with one color as PNG without Qt, so the generator does not need a display.
+
+    Parameters
+    ----------
+    width: int
+        The width in pixels.
+
+    height: int
+        The height in pixels.
+
+    color: tuple
+        The red, green and blue values.
+
+    Returns
+    -------
+    bytes
+        The PNG data.
+    """
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    rows = b"".join(b"\x00" + bytes(color) * width for row in range(height))
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(rows)) + chunk(b"IEND", b"")
+
+
+def generate(path, size, max_envs=MAX_ENVS):
+    """Function for generating a catalog of apps in a new database with the schema of the App Launcher.
+    Every app has its own icon, additional commands and between 0 and max_envs environment variables, so no two launches share an environment snapshot.
+
+    Parameters
+    ----------
+    path: str
+        The database file. It is replaced if it exists.
+
+    size: int
+        The number of apps.
+
+    max_envs: int
+        The largest number of environment variables of an app.
+    """
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    from catalog import ICON_TABLE, LAUNCH_COUNT_TABLE, SEARCH_INDEX, icon_hash
+
+    if os.path.exists(path):
+        os.remove(path)
+    con = sqlite3.connect(path)
+    con.execute(
+        """CREATE TABLE 'App' (
+            'Name' TEXT NOT NULL,
+            'Path' TEXT NOT NULL,
+            'Description' TEXT,
+            'Command' TEXT,
+            'Argument' TEXT,
+            'AppID' INTEGER PRIMARY KEY AUTOINCREMENT,
+            'IconHash' TEXT
+        )"""
+    )
+    con.execute(
+        """CREATE TABLE 'Env' (
+            'Name' TEXT NOT NULL,
+            'Value' TEXT NOT NULL,
+            'ExeOrder' INTEGER NOT NULL,
+            'EnvID' INTEGER PRIMARY KEY AUTOINCREMENT,
+            'AppID' INTEGER NOT NULL
+        )"""
+    )
+    con.execute(ICON_TABLE)
+    con.execute(LAUNCH_COUNT_TABLE)
+    for statement in SEARCH_INDEX:
+        con.execute(statement)
+    apps = []
+    icons = []
+    envs = []
+    for id in range(1, size + 1):
+        data = png(96, 96, (id % 256, id // 256 % 256, id * 37 % 256))
+        hash = icon_hash(data)
+        icons.append((hash, data))
+        name = f"Bench App {id}"
+        description = f"Generated app {id} of {size} for the scale benchmark"
+        command = f"export BENCH_ROOT=/opt/bench/{id}\nexport BENCH_VERSION=`echo {id}`"
+        apps.append((id, name, "true", description, command, "", hash))
+        for order in range(id % (max_envs + 1)):
+            envs.append((f"BENCH_VAR_{order}", f'"$BENCH_ROOT"/lib/{order}:"$BENCH_VERSION"', order + 1, id))
+    con.executemany("INSERT OR IGNORE INTO Icon (Hash, Data) VALUES (?,?)", icons)
+    con.executemany("INSERT INTO App (AppID, Name, Path, Description, Command, Argument, IconHash) VALUES (?,?,?,?,?,?,?)", apps)
+    con.executemany("INSERT INTO Env (Name, Value, ExeOrder, AppID) VALUES (?,?,?,?)", envs)
+    con.commit()
+    con.close()
+
+
+def settle(app):
+    """Function for processing the pending events, so the layout and the paint are included in the time."""
+    app.processEvents()
+    app.sendPostedEvents()
+    app.processEvents()
+
+
+def summarise(times):
+    """Function for getting the statistics of repeated measurements.
+
+    Parameters
+    ----------
+    times: list
+        The times in seconds.
+
+    Returns
+    -------
+    dict
+        The p50, the p95 and the largest time in seconds, and the number of measurements.
+    """
+    from launchlog import percentile
+
+    return {"p50": percentile(times, 0.5), "p95": percentile(times, 0.95), "max": max(times), "count": len(times)}
+
+
+def measure(database, grid=True):
+    """Function for measuring the App Launcher with a catalog in the current process.
+
+    Parameters
+    ----------
+    database: str
+        The database file of the catalog.
+
+    grid: bool
+        True to start the main window in the grid view mode.
+
+    Returns
+    -------
+    dict
+        The time in seconds of loading the catalog, creating the main window, each search keystroke, each resize,
+        opening the Edit Dialog of the app with the most environment variables, moving its environment variables and preparing launches.
+    """
+    os.chdir(ROOT)
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    database = os.path.abspath(database)
+    from PyQt5.QtCore import QEventLoop, QTimer
+    from PyQt5.QtSql import QSqlQuery
+    from PyQt5.QtWidgets import QApplication
+
+    from bashpool import bash_pool
+    from catalog import app_catalog
+    from launcher import LaunchJob, Launcher
+    from mainwindow import MainWindow
+
+    app = QApplication.instance() or QApplication([])
+    results = {}
+
+    start = time.perf_counter()
+    window = MainWindow(grid=grid, database=database)
+    settle(app)
+    results["window"] = time.perf_counter() - start
+    results["apps"] = len(app_catalog.apps)
+
+    # Reload the catalog without updating the widgets, so only the catalog is measured
+    app_catalog.blockSignals(True)
+    start = time.perf_counter()
+    app_catalog.load()
+    results["catalog_load"] = time.perf_counter() - start
+    app_catalog.blockSignals(False)
+
+    # Type into the search box, running each search at once instead of waiting for the search timer
+    times = []
+    for end in range(1, len(SEARCH_TEXT) + 1):
+        start = time.perf_counter()
+        window.search.setText(SEARCH_TEXT[:end])
+        window.search_now()
+        settle(app)
+        times.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    window.search.setText("")
+    window.search_now()
+    settle(app)
+    results["search_keystroke"] = summarise(times)
+    results["search_clear"] = time.perf_counter() - start
+
+    # Resize the window, which lays out the app widgets again in another number of columns
+    window.showNormal()
+    settle(app)
+    times = []
+    for width in WIDTHS:
+        start = time.perf_counter()
+        window.resize(width, 800)
+        settle(app)
+        times.append(time.perf_counter() - start)
+    results["resize"] = summarise(times)
+
+    # Open the Edit Dialog of the app with the most environment variables and move its first variable to the end
+    envs = {id: len(app_catalog.get_envs(id)) for id in list(app_catalog.apps)[: MAX_ENVS + 1]}
+    id = max(envs, key=envs.get) if envs else None
+    if id is not None:
+        from editdialog import EditDialog
+
+        start = time.perf_counter()
+        dialog = EditDialog(id)
+        dialog.show()
+        settle(app)
+        results["edit_dialog"] = time.perf_counter() - start
+        results["edit_dialog_envs"] = envs[id]
+        times = []
+        for row in range(envs[id] - 1):
+            dialog.env_table.selectRow(row)
+            start = time.perf_counter()
+            dialog.down()
+            settle(app)
+            times.append(time.perf_counter() - start)
+        if times:
+            results["env_reorder"] = summarise(times)
+        dialog.close()
+        # Discard the moves in the same way as cancelling the dialog
+        QSqlQuery("DELETE FROM Env WHERE AppID = -1")
+        QSqlQuery(f"UPDATE Env Set AppID = {id} WHERE AppID = -2")
+
+    # Prepare the launches of the apps with the most environment variables, one at a time
+    bash_pool.start()
+    ids = sorted(app_catalog.apps, key=lambda id: (-(id % (MAX_ENVS + 1)), id))[:LAUNCHES]
+    times = []
+    failed = 0
+    for id in ids:
+        launcher = Launcher(id)
+        job = LaunchJob(launcher)
+        job.prepare_only = True
+        loop = QEventLoop()
+        prepared = []
+        job.finished.connect(lambda result: (prepared.append(result), loop.quit()))
+        start = time.perf_counter()
+        job.start()
+        if not prepared:
+            QTimer.singleShot(30000, loop.quit)
+            loop.exec()
+        times.append(time.perf_counter() - start)
+        failed = failed + (prepared != [True])
+    if times:
+        results["launch_prepare"] = summarise(times)
+        results["launch_prepare_failed"] = failed
+    bash_pool.close()
+    window.con.close()
+    return results
+
+
+def run_sizes(sizes, directory, grid=True):
+    """Function for generating a catalog of each size and measuring it in a new process, so the measurements do not share any caches.
+
+    Parameters
+    ----------
+    sizes: list
+        The numbers of apps.
+
+    directory: str
+        The directory of the generated catalogs, the results of each process and the caches.
+
+    grid: bool
+        True to start the main window in the grid view mode.
+
+    Returns
+    -------
+    dict
+        The results of the measure function keyed by the number of apps as text.
+    """
+    results = {}
+    env = dict(os.environ, XDG_CACHE_HOME=os.path.join(directory, "cache"))
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    for size in sizes:
+        database = os.path.join(directory, f"scale-{size}.db")
+        output = os.path.join(directory, f"scale-{size}.json")
+        start = time.perf_counter()
+        generate(database, size)
+        generated = time.perf_counter() - start
+        command = [sys.executable, os.path.abspath(__file__), "--database", database, "--output", output]
+        if not grid:
+            command.append("--widgets")
+        process = subprocess.run(command, env=env, capture_output=True, text=True)
+        if process.returncode != 0 or not os.path.exists(output):
+            results[str(size)] = {"error": process.stderr.strip().splitlines()[-1:] or ["no results"]}
+            continue
+        with open(output) as file:
+            results[str(size)] = dict(json.load(file), generate=generated)
+    return results
+
+
+def flatten(results, prefix=""):
+    """Function for getting the times of the results keyed by their path, e.g. "1000/search_keystroke/p95", for comparing them."""
+    times = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            times.update(flatten(value, f"{prefix}{key}/"))
+        elif isinstance(value, float) and key != "generate":
+            times[prefix + key] = value
+    return times
+
+
+def compare(old, new, threshold=1.5):
+    """Function for comparing the results of two runs, e.g. of two commits.
+
+    Parameters
+    ----------
+    old: dict
+        The results of the earlier run as written by this benchmark.
+
+    new: dict
+        The results of the later run.
+
+    threshold: float
+        The ratio of the new time to the old time above which a time is reported as slower.
+
+    Returns
+    -------
+    list
+        The names, the old and new times in seconds and the ratio of the times measured in both runs, and the names of the slower times.
+    """
+    old_times = flatten(old["results"])
+    new_times = flatten(new["results"])
+    rows = []
+    slower = []
+    for name in sorted(old_times.keys() & new_times.keys(), key=lambda name: (int(name.split("/")[0]), name)):
+        ratio = new_times[name] / old_times[name] if old_times[name] > 0 else float("inf")
+        rows.append((name, old_times[name], new_times[name], ratio))
+        if ratio > threshold:
+            slower.append(name)
+    return rows, slower
+
+
+def commit():
+    """Function for getting the commit of the repository, so the results can be matched with the code they measure."""
+    process = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+    return process.stdout.strip() if process.returncode == 0 else ""
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the App Launcher with generated catalogs of an increasing number of apps.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="numbers of apps in the generated catalogs")
+    parser.add_argument("--directory", help="directory to keep the generated catalogs in, instead of a temporary one")
+    parser.add_argument("--database", help="measure this catalog in this process instead of generating catalogs")
+    parser.add_argument("--widgets", action="store_true", help="start with the app widgets instead of the grid view")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    parser.add_argument("--compare", help="compare the results with the results of an earlier run written by --output")
+    parser.add_argument("--threshold", type=float, default=1.5, help="ratio of the times above which --compare fails")
+    args = parser.parse_args()
+    # Measure without a window on a machine without a display, e.g. a CI server
+    if "DISPLAY" not in os.environ and "WAYLAND_DISPLAY" not in os.environ:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    # Measure one catalog, e.g. in the process started for each size
+    if args.database is not None:
+        results = measure(args.database, grid=not args.widgets)
+        if args.output is not None:
+            with open(args.output, "w") as file:
+                json.dump(results, file, indent=2)
+        else:
+            print(json.dumps(results, indent=2))
+        sys.exit(0)
+
+    from PyQt5.QtCore import QT_VERSION_STR
+
+    with tempfile.TemporaryDirectory() as directory:
+        if args.directory is not None:
+            directory = args.directory
+            os.makedirs(directory, exist_ok=True)
+        run = {
+            "commit": commit(),
+            "python": platform.python_version(),
+            "qt": QT_VERSION_STR,
+            "platform": os.environ.get("QT_QPA_PLATFORM", ""),
+            "mode": "widgets" if args.widgets else "grid",
+            "results": run_sizes(args.sizes, directory, grid=not args.widgets),
+        }
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump(run, file, indent=2)
+    errors = [f"{size} apps: {result['error'][0]}" for size, result in run["results"].items() if "error" in result]
+    if args.json:
+        print(json.dumps(run, indent=2))
+    else:
+        for size, result in run["results"].items():
+            for name, value in flatten(result).items():
+                print(f"{size:>6} {name:28}{value * 1000:10.1f} ms")
+        for error in errors:
+            print("Error ", error)
+    slower = []
+    if args.compare is not None:
+        with open(args.compare) as file:
+            rows, slower = compare(json.load(file), run, args.threshold)
+        for name, old, new, ratio in rows:
+            print(f"{name:36}{old * 1000:10.1f}{new * 1000:10.1f} ms{ratio:7.2f}x{'  slower' if name in slower else ''}")
+    sys.exit(1 if errors or slower else 0)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Run from the repository root, so the modules, the .ui files and the database are found
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Default budgets in seconds for each start-up stage
+BUDGETS = {"import": 0.5, "window": 1.0, "paint": 0.5}
+
+# Modules which must not be imported before the first paint: the dialogs and the modules used only after a launch, a batch launch or with profiling
+LAZY_MODULES = (
+    "editdialog",
+    "envdialog",
+    "tkinter",
+    "PyQt5.uic",
+    "batchlaunch",
+    "instance",
+    "launchlog",
+    "prewarm",
+    "profiler",
+    "PyQt5.QtNetwork",
+)
+
+
+def measure(grid=True):
+    """Function for measuring the start-up of the App Launcher in the current process.
+    It must be called before the App Launcher modules are imported, so the import time is measured from cold.
+
+    Parameters
+    ----------
+    grid: bool
+        True to start the main window in the grid view mode.
+
+    Returns
+    -------
+    dict
+        The time in seconds of importing the main window, creating it and painting the apps for the first time,
+        and the modules in LAZY_MODULES imported before the first paint.
+    """
+    os.chdir(ROOT)
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    # Compile the forms in another process first, as a deployed application has them compiled and uic must not be imported by the measured start-up
+    subprocess.run([sys.executable, "uicache.py"], capture_output=True)
+    start = time.perf_counter()
+    from PyQt5.QtCore import QEvent, QObject
+    from PyQt5.QtWidgets import QApplication
+
+    from mainwindow import MainWindow
+
+    imported = time.perf_counter()
+    app = QApplication.instance() or QApplication([])
+    window = MainWindow(grid=grid)
+    created = time.perf_counter()
+
+    # The first paint of the grid view, or of the scroll area with the app widgets
+    viewport = window.grid_view.viewport() if grid else window.scrollArea.viewport()
+
+    class PaintFilter(QObject):
+        painted = False
+
+        def eventFilter(self, object, event):
+            if event.type() == QEvent.Paint and (object is viewport or viewport.isAncestorOf(object)):
+                self.painted = True
+            return False
+
+    paint_filter = PaintFilter()
+    app.installEventFilter(paint_filter)
+    while not paint_filter.painted and time.perf_counter() - created < 10:
+        app.processEvents()
+    painted = time.perf_counter()
+    app.removeEventFilter(paint_filter)
+    window.con.close()
+    return {
+        "import": imported - start,
+        "window": created - imported,
+        "paint": painted - created,
+        "total": painted - start,
+        "lazy_modules_loaded": [module for module in LAZY_MODULES if module in sys.modules],
+    }
+
+
+def check(results, budgets):
+    """Function for comparing the results with the budgets.
+
+    Parameters
+    ----------
+    results: dict
+        The results of the measure function.
+
+    budgets: dict
+        The budgets in seconds keyed by stage.
+
+    Returns
+    -------
+    list
+        The messages for the stages over budget and the modules imported too early. Empty if the start-up is within the budgets.
+    """
+    errors = []
+    for stage, budget in budgets.items():
+        if results[stage] > budget:
+            errors.append(f"{stage} took {results[stage]:.3f}s, over the budget of {budget:.3f}s")
+    for module in results["lazy_modules_loaded"]:
+        errors.append(f"{module} is imported before the first paint")
+    return errors
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the start-up time of the App Launcher and check it against a budget.")
+    for stage, budget in BUDGETS.items():
+        parser.add_argument(f"--{stage}-budget", type=float, default=budget, help=f"budget in seconds for the {stage} stage")
+    parser.add_argument("--widgets", action="store_true", help="start with the app widgets instead of the grid view")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+    # Measure without a window on a machine without a display, e.g. a CI server
+    if "DISPLAY" not in os.environ and "WAYLAND_DISPLAY" not in os.environ:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    results = measure(grid=not args.widgets)
+    errors = check(results, {stage: getattr(args, f"{stage}_budget") for stage in BUDGETS})
+    if args.json:
+        print(json.dumps(dict(results, errors=errors), indent=2))
+    else:
+        for stage in ("import", "window", "paint", "total"):
+            print(f"{stage:8}{results[stage] * 1000:10.1f} ms")
+        for error in errors:
+            print("Error ", error)
+    sys.exit(1 if errors else 0)
@@ -0,0 +1,586 @@
+#!/usr/bin/env python
+import hashlib
+import re
+
+from PyQt5.QtCore import QByteArray, QObject, pyqtSignal
+from PyQt5.QtSql import QSqlDatabase, QSqlQuery
+
+from searchindex import TrigramIndex
+
+# Columns displayed on the tiles and used for launching. The icon is fetched separately by load_icon.
+APP_COLUMNS = ("AppID", "Name", "Path", "Description", "Command", "Argument", "IconHash")
+
+# Statement creating the table of the icons. Each PNG is saved once, keyed by its SHA-256 hash, and App refers to it by IconHash.
+ICON_TABLE = """CREATE TABLE IF NOT EXISTS Icon (
+    'Hash' TEXT PRIMARY KEY,
+    'Data' BLOB NOT NULL
+)"""
+
+# Statement creating the table of the number of times each application is launched, for pre-warming the most launched applications
+LAUNCH_COUNT_TABLE = """CREATE TABLE IF NOT EXISTS LaunchCount (
+    'AppID' INTEGER PRIMARY KEY,
+    'Count' INTEGER NOT NULL DEFAULT 0
+)"""
+
+# Statements creating the full-text search index over the App table and the triggers keeping it in sync with App.
+# They are the same as sql/appSearch.sql, which adds the index to an existing database with sqlite3.
+SEARCH_INDEX = (
+    """CREATE VIRTUAL TABLE IF NOT EXISTS AppSearch USING fts5(
+        Name, Description, Command, Argument, content='App', content_rowid='AppID', prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS AppSearch_insert AFTER INSERT ON App BEGIN
+        INSERT INTO AppSearch (rowid, Name, Description, Command, Argument)
+        VALUES (new.AppID, new.Name, new.Description, new.Command, new.Argument);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS AppSearch_delete AFTER DELETE ON App BEGIN
+        INSERT INTO AppSearch (AppSearch, rowid, Name, Description, Command, Argument)
+        VALUES ('delete', old.AppID, old.Name, old.Description, old.Command, old.Argument);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS AppSearch_update AFTER UPDATE ON App BEGIN
+        INSERT INTO AppSearch (AppSearch, rowid, Name, Description, Command, Argument)
+        VALUES ('delete', old.AppID, old.Name, old.Description, old.Command, old.Argument);
+        INSERT INTO AppSearch (rowid, Name, Description, Command, Argument)
+        VALUES (new.AppID, new.Name, new.Description, new.Command, new.Argument);
+    END""",
+)
+
+# Weights of Name, Description, Command and Argument for ranking the search results with bm25
+SEARCH_WEIGHTS = (10.0, 4.0, 1.0, 1.0)
+
+
+def read_app(query):
+    """Function for reading the current row of a query into a dictionary.
+
+    Parameters
+    ----------
+    query: QSqlQuery
+        A query selecting the APP_COLUMNS, positioned on a valid row.
+
+    Returns
+    -------
+    dict
+        The values of the row keyed by column name.
+    """
+    return {column: query.value(i) for i, column in enumerate(APP_COLUMNS)}
+
+
+def load_apps(text=""):
+    """Function for getting all the applications whose name matches with the text in a single query.
+    The icons are not fetched, so the query only reads the metadata.
+
+    Parameters
+    ----------
+    text: str
+        The text in the search box. All the applications are returned if it is empty.
+
+    Returns
+    -------
+    list
+        The application rows as dictionaries sorted by name.
+    """
+    query = QSqlQuery()
+    if text == "":
+        query.prepare(f"SELECT {', '.join(APP_COLUMNS)} FROM App ORDER BY Name ASC")
+    else:
+        query.prepare(f"SELECT {', '.join(APP_COLUMNS)} FROM App WHERE Name LIKE ? ORDER BY Name ASC")
+        query.bindValue(0, f"%{text}%")
+    if not query.exec():
+        print("Error ", query.lastError().text())
+    apps = []
+    while query.next():
+        apps.append(read_app(query))
+    return apps
+
+
+def load_app(id):
+    """Function for getting a single application without the icon.
+
+    Parameters
+    ----------
+    id: int
+        The App ID saved in the database.
+
+    Returns
+    -------
+    dict
+        The application row. None if the application does not exist.
+    """
+    query = QSqlQuery()
+    query.prepare(f"SELECT {', '.join(APP_COLUMNS)} FROM App WHERE AppID = ?")
+    query.bindValue(0, id)
+    if not query.exec():
+        print("Error ", query.lastError().text())
+    if query.next():
+        return read_app(query)
+    return None
+
+
+def icon_hash(data):
+    """Function for getting the key of an icon in the Icon table.
+
+    Parameters
+    ----------
+    data: QByteArray
+        The PNG data of the icon.
+
+    Returns
+    -------
+    str
+        The SHA-256 hash of the PNG data. None if the data is empty.
+    """
+    if data is None or len(data) == 0:
+        return None
+    return hashlib.sha256(bytes(data)).hexdigest()
+
+
+def save_icon(data):
+    """Function for saving an icon in the Icon table. The same PNG data is saved only once.
+
+    Parameters
+    ----------
+    data: QByteArray
+        The PNG data of the icon.
+
+    Returns
+    -------
+    str
+        The hash to save in the IconHash column of App. None if the data is empty.
+    """
+    hash = icon_hash(data)
+    if hash is None:
+        return None
+    query = QSqlQuery()
+    query.prepare("INSERT OR IGNORE INTO Icon (Hash, Data) VALUES (?,?)")
+    query.bindValue(0, hash)
+    query.bindValue(1, QByteArray(data))
+    if not query.exec():
+        print("Error ", query.lastError().text())
+    return hash
+
+
+def load_icon(hash):
+    """Function for getting an icon from the Icon table. It is called only when the icon is displayed.
+
+    Parameters
+    ----------
+    hash: str
+        The IconHash of the application.
+
+    Returns
+    -------
+    QByteArray
+        The PNG data of the icon. None if the application does not have an icon.
+    """
+    if not hash:
+        return None
+    query = QSqlQuery()
+    query.prepare("SELECT Data FROM Icon WHERE Hash = ?")
+    query.bindValue(0, hash)
+    if not query.exec():
+        print("Error ", query.lastError().text())
+    if query.next():
+        icon = query.value(0)
+        if type(icon) == QByteArray and not icon.isEmpty():
+            return QByteArray(icon)
+    return None
+
+
+def table_columns(table):
+    """Function for getting the column names of a table.
+
+    Returns
+    -------
+    list
+        The column names in the order of the table.
+    """
+    query = QSqlQuery(f"PRAGMA table_info({table})")
+    columns = []
+    while query.next():
+        columns.append(query.value("name"))
+    return columns
+
+
+def migrate_icons():
+    """Function for moving the icons saved in the Icon column of App into the Icon table.
+    The icons are deduplicated by hash, App keeps only the IconHash and the Icon column is dropped.
+    The icons which are not used by any application are removed as well.
+    It does not write to a database which is already migrated, so the start-up does not wait for a write transaction.
+
+    Returns
+    -------
+    bool
+        True if the Icon table is available.
+    """
+    query = QSqlQuery()
+    if not query.exec(ICON_TABLE):
+        print("Error ", query.lastError().text())
+        return False
+    columns = table_columns("App")
+    if "IconHash" not in columns:
+        query = QSqlQuery()
+        if not query.exec("ALTER TABLE App ADD COLUMN IconHash TEXT"):
+            print("Error ", query.lastError().text())
+            return False
+    if "Icon" in columns:
+        database = QSqlDatabase.database()
+        database.transaction()
+        query = QSqlQuery("SELECT AppID, Icon FROM App WHERE typeof(Icon) = 'blob' AND length(Icon) > 0")
+        icons = []
+        while query.next():
+            icons.append((query.value(0), query.value(1)))
+        for id, icon in icons:
+            query = QSqlQuery()
+            query.prepare("UPDATE App SET IconHash = ? WHERE AppID = ?")
+            query.bindValue(0, save_icon(icon))
+            query.bindValue(1, id)
+            if not query.exec():
+                print("Error ", query.lastError().text())
+        # Older SQLite cannot drop columns, so the icon data is removed instead
+        query = QSqlQuery()
+        if not query.exec("ALTER TABLE App DROP COLUMN Icon"):
+            QSqlQuery("UPDATE App SET Icon = NULL")
+        QSqlQuery("DELETE FROM Icon WHERE Hash NOT IN (SELECT IconHash FROM App WHERE IconHash IS NOT NULL)")
+        database.commit()
+    return True
+
+
+def remove_icon(hash):
+    """Function for removing an icon from the Icon table once no application uses it, e.g. after the icon of an application is changed.
+
+    Parameters
+    ----------
+    hash: str
+        The IconHash the application used.
+    """
+    if not hash:
+        return
+    query = QSqlQuery()
+    query.prepare("DELETE FROM Icon WHERE Hash = ? AND NOT EXISTS (SELECT 1 FROM App WHERE IconHash = ?)")
+    query.bindValue(0, hash)
+    query.bindValue(1, hash)
+    if not query.exec():
+        print("Error ", query.lastError().text())
+
+
+def count_launch(id):
+    """Function for adding one to the number of times an application is launched.
+
+    Parameters
+    ----------
+    id: int
+        The App ID saved in the database.
+    """
+    query = QSqlQuery()
+    query.prepare("INSERT INTO LaunchCount (AppID, Count) VALUES (?, 1) ON CONFLICT (AppID) DO UPDATE SET Count = Count + 1")
+    query.bindValue(0, id)
+    if not query.exec():
+        print("Error ", query.lastError().text())
+
+
+def most_launched(count):
+    """Function for getting the most launched applications.
+
+    Parameters
+    ----------
+    count: int
+        The number of applications to get.
+
+    Returns
+    -------
+    list
+        The App IDs of the existing applications ordered by the number of launches.
+    """
+    query = QSqlQuery()
+    query.prepare("SELECT LaunchCount.AppID FROM LaunchCount JOIN App ON App.AppID = LaunchCount.AppID ORDER BY Count DESC LIMIT ?")
+    query.bindValue(0, count)
+    if not query.exec():
+        print("Error ", query.lastError().text())
+    ids = []
+    while query.next():
+        ids.append(query.value(0))
+    return ids
+
+
+def create_search_index():
+    """Function for adding the full-text search index and its triggers to the database if they do not exist yet.
+    The index is filled with the existing applications when it is created.
+
+    Returns
+    -------
+    bool
+        True if the index is available, otherwise False, for example if SQLite is built without FTS5.
+    """
+    query = QSqlQuery("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'AppSearch'")
+    exists = query.next()
+    for statement in SEARCH_INDEX:
+        query = QSqlQuery()
+        if not query.exec(statement):
+            print("Error ", query.lastError().text())
+            return False
+    if not exists:
+        query = QSqlQuery()
+        if not query.exec("INSERT INTO AppSearch (AppSearch) VALUES ('rebuild')"):
+            print("Error ", query.lastError().text())
+            return False
+    return True
+
+
+def search_apps(text):
+    """Function for searching the applications by name, description, command and argument with the full-text search index.
+    Each word in the text matches as a prefix, so "hou" finds "Houdini".
+
+    Parameters
+    ----------
+    text: str
+        The text in the search box.
+
+    Returns
+    -------
+    list
+        The App IDs ordered by relevance. None if the text does not contain any words.
+    """
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    match = " ".join('"' + word.replace('"', '""') + '"*' for word in words)
+    query = QSqlQuery()
+    query.prepare(
+        "SELECT App.AppID FROM AppSearch JOIN App ON App.AppID = AppSearch.rowid WHERE AppSearch MATCH ? "
+        f"ORDER BY bm25(AppSearch, {', '.join(str(weight) for weight in SEARCH_WEIGHTS)}), App.Name ASC"
+    )
+    query.bindValue(0, match)
+    if not query.exec():
+        print("Error ", query.lastError().text())
+    ids = []
+    while query.next():
+        ids.append(query.value(0))
+    return ids
+
+
+def load_envs(id):
+    """Function for getting the environment variables of an application in execution order.
+
+    Parameters
+    ----------
+    id: int
+        The App ID saved in the database.
+
+    Returns
+    -------
+    list
+        The names and values of the environment variables as tuples.
+    """
+    query = QSqlQuery()
+    query.prepare("SELECT Name, Value FROM Env WHERE AppID = ? ORDER BY ExeOrder ASC")
+    query.bindValue(0, id)
+    if not query.exec():
+        print("Error ", query.lastError().text())
+    envs = []
+    while query.next():
+        envs.append((query.value(0), query.value(1)))
+    return envs
+
+
+class Catalog(QObject):
+    """Class for the process-wide cache of the applications, so searching and laying out the apps does not read the database.
+    The App rows are loaded once, and the icons and the environment variables are loaded when first used.
+    The dialogs and the app widgets patch the cache after writing to the database, and the cache emits signals for the views.
+
+    Attributes
+    ----------
+    changed : pyqtSignal
+        Signal emitted when the whole catalog is reloaded.
+
+    app_changed : pyqtSignal
+        Signal with the App ID emitted when an application is added or updated.
+
+    app_removed : pyqtSignal
+        Signal with the App ID emitted when an application is removed.
+
+    envs_changed : pyqtSignal
+        Signal with the App ID emitted when the environment variables of an application are changed.
+
+    apps : dict
+        The application rows keyed by App ID.
+
+    icons : dict
+        The PNG data of the icons keyed by IconHash, so the applications sharing an icon share the data.
+
+    envs : dict
+        The environment variables keyed by App ID.
+
+    search_index : bool
+        True if the full-text search index is available in the database.
+
+    fuzzy_index : TrigramIndex
+        The in-memory trigram index of the app names and descriptions for fuzzy search.
+    """
+
+    changed = pyqtSignal()
+    app_changed = pyqtSignal(int)
+    app_removed = pyqtSignal(int)
+    envs_changed = pyqtSignal(int)
+    apps: dict = {}
+    icons: dict = {}
+    envs: dict = {}
+    search_index: bool = False
+    fuzzy_index: TrigramIndex = None
+
+    def __init__(self):
+        """Initialise an empty catalog. It is filled by load function once the database is connected."""
+        super(Catalog, self).__init__()
+        self.apps = {}
+        self.icons = {}
+        self.envs = {}
+        self.fuzzy_index = TrigramIndex()
+
+    def load(self):
+        """Function for loading all the application rows from the database in a single query.
+        It also moves the icons into the Icon table and adds the full-text search index and the LaunchCount table to the database if they do not exist yet."""
+        migrate_icons()
+        query = QSqlQuery()
+        if not query.exec(LAUNCH_COUNT_TABLE):
+            print("Error ", query.lastError().text())
+        self.search_index = create_search_index()
+        self.apps = {app["AppID"]: app for app in load_apps()}
+        self.icons = {}
+        self.envs = {}
+        self.fuzzy_index = TrigramIndex()
+        for app in self.apps.values():
+            self.fuzzy_index.add(app["AppID"], app["Name"], app["Description"])
+        self.changed.emit()
+
+    def search(self, text="", fuzzy=False):
+        """Function for getting the applications matching with the text.
+        The matching App IDs are ranked by the full-text search index and the rows are taken from the catalog.
+        The names are matched in memory if the text has no words or the index is not available.
+
+        Parameters
+        ----------
+        text: str
+            The text in the search box. All the applications are returned if it is empty.
+
+        fuzzy: bool
+            True to match the text approximately with the in-memory trigram index instead of the full-text search index.
+
+        Returns
+        -------
+        list
+            The application rows ordered by relevance, or sorted by name if the text is empty.
+        """
+        if text != "" and fuzzy:
+            results = self.fuzzy_index.search(text)
+            # Order the apps with the same score by name
+            results.sort(key=lambda result: (-result[1], self.apps[result[0]]["Name"]))
+            return [self.apps[id] for id, score in results]
+        if text != "" and self.search_index:
+            ids = search_apps(text)
+            if ids is not None:
+                return [self.apps[id] for id in ids if id in self.apps]
+        text = text.lower()
+        apps = [app for app in self.apps.values() if text in app["Name"].lower()]
+        apps.sort(key=lambda app: app["Name"])
+        return apps
+
+    def app(self, id):
+        """Function for getting an application row. It is loaded from the database if it is not in the cache yet.
+
+        Parameters
+        ----------
+        id: int
+            The App ID saved in the database.
+
+        Returns
+        -------
+        dict
+            The application row. None if the application does not exist.
+        """
+        if id not in self.apps:
+            app = load_app(id)
+            if app is None:
+                return None
+            self.apps[id] = app
+            self.fuzzy_index.add(id, app["Name"], app["Description"])
+        return self.apps[id]
+
+    def icon(self, id):
+        """Function for getting the icon of an application. It is loaded from the database when first used.
+
+        Returns
+        -------
+        QByteArray
+            The PNG data of the icon. None if the application does not have an icon.
+        """
+        app = self.app(id)
+        if app is None or not app["IconHash"]:
+            return None
+        hash = app["IconHash"]
+        if hash not in self.icons:
+            self.icons[hash] = load_icon(hash)
+        return self.icons[hash]
+
+    def get_envs(self, id):
+        """Function for getting the environment variables of an application. They are loaded from the database when first used.
+
+        Returns
+        -------
+        list
+            The names and values of the environment variables as tuples in execution order.
+        """
+        if id not in self.envs:
+            self.envs[id] = load_envs(id)
+        return self.envs[id]
+
+    def update_app(self, id):
+        """Function for reloading an application after it is added or updated in the database.
+
+        Parameters
+        ----------
+        id: int
+            The App ID saved in the database.
+        """
+        self.envs.pop(id, None)
+        app = load_app(id)
+        if app is None:
+            self.remove_app(id)
+        else:
+            # Drop the previous icon if no other application uses it
+            previous = self.apps.get(id)
+            if previous is not None and previous["IconHash"] != app["IconHash"]:
+                remove_icon(previous["IconHash"])
+                self.icons.pop(previous["IconHash"], None)
+            self.apps[id] = app
+            self.fuzzy_index.add(id, app["Name"], app["Description"])
+            self.app_changed.emit(id)
+
+    def remove_app(self, id):
+        """Function for removing an application from the cache after it is removed from the database.
+        Its icon is removed from the Icon table if no other application uses it.
+
+        Parameters
+        ----------
+        id: int
+            The App ID saved in the database.
+        """
+        app = self.apps.pop(id, None)
+        if app is not None:
+            remove_icon(app["IconHash"])
+            self.icons.pop(app["IconHash"], None)
+        self.envs.pop(id, None)
+        self.fuzzy_index.remove(id)
+        self.app_removed.emit(id)
+
+    def invalidate_envs(self, id):
+        """Function for dropping the cached environment variables of an application after they are changed in the database.
+
+        Parameters
+        ----------
+        id: int
+            The App ID saved in the database.
+        """
+        self.envs.pop(id, None)
+        self.envs_changed.emit(id)
+
+
+# The catalog shared by the main window, the app widgets and the dialogs
+app_catalog = Catalog()
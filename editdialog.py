@@ -1,11 +1,14 @@
 #!/usr/bin/env python
-from PyQt5 import uic
 from PyQt5.QtCore import QBuffer, QByteArray, QIODevice, Qt
 from PyQt5.QtGui import QIcon, QPixmap
 from PyQt5.QtSql import QSqlQuery, QSqlQueryModel
 from PyQt5.QtWidgets import QAbstractItemView, QDialog, QFileDialog, QMessageBox
 
+from catalog import APP_COLUMNS, app_catalog, load_icon, save_icon
 from envdialog import EnvDialog
+from launchplan import launch_plans
+from profiling import profiled
+from uicache import load_ui
 
 
 class EditDialog(QDialog):
@@ -37,7 +40,7 @@ class EditDialog(QDialog):
         """
         super(EditDialog, self).__init__()
         # Load UI
-        uic.loadUi("ui/edit.ui", self)
+        load_ui("ui/edit.ui", self)
         self.id = id
         self.icon_img.clear()
         # Set icons to the toolbuttons
@@ -62,13 +65,13 @@ class EditDialog(QDialog):
         if self.id != -1:
             self.new = False
             self.setWindowTitle("Edit")
-            query = QSqlQuery(f"SELECT * FROM App WHERE AppID = {self.id}")
+            query = QSqlQuery(f"SELECT {', '.join(APP_COLUMNS)} FROM App WHERE AppID = {self.id}")
             query.next()
             # Set the icon to the icon button if available
-            icon = query.value("Icon")
-            if type(icon) == QByteArray:
+            icon = load_icon(query.value("IconHash"))
+            if icon is not None:
                 pixmap = QPixmap()
-                pixmap.loadFromData(QByteArray(icon), "png")
+                pixmap.loadFromData(icon, "png")
                 self.icon.setIcon(QIcon(pixmap))
                 buffer = QBuffer(self.icon_img)
                 buffer.open(QIODevice.WriteOnly)
@@ -81,6 +84,7 @@ class EditDialog(QDialog):
             # Add environment variables
             self.add_envs()
 
+    @profiled
     def add_envs(self):
         """Function to get data from database and add environment variables in the table view in the dialog."""
         self.query = QSqlQueryModel()
@@ -130,12 +134,12 @@ class EditDialog(QDialog):
             # Insert new app
             query = QSqlQuery()
             query.prepare(
-                "INSERT INTO App (Name, Path, Description, Icon, Command, Argument) VALUES (?,?,?,?,?,?)"
+                "INSERT INTO App (Name, Path, Description, IconHash, Command, Argument) VALUES (?,?,?,?,?,?)"
             )
             query.bindValue(0, self.name.text())
             query.bindValue(1, self.path.text())
             query.bindValue(2, self.description.toPlainText())
-            query.bindValue(3, self.icon_img)
+            query.bindValue(3, save_icon(self.icon_img))
             query.bindValue(4, self.command.toPlainText())
             query.bindValue(5, self.argument.text())
             if not query.exec():
@@ -149,17 +153,20 @@ class EditDialog(QDialog):
                 print("Error ", query.lastError().text())
             # Remove environment variables whose AppID had been set to -2 to hide from the table temporary
             QSqlQuery("DELETE FROM Env WHERE AppID = -2")
+            # Add the new app to the catalog and compile its launch plan
+            app_catalog.update_app(id)
+            launch_plans.compile(id)
             self.accept()
         else:
             # Update the app data with the user inputs
             query = QSqlQuery()
             query.prepare(
-                "UPDATE App SET Name = ?, Path = ?, Description = ?, Icon = ?, Command = ?, Argument = ? WHERE AppID = ?"
+                "UPDATE App SET Name = ?, Path = ?, Description = ?, IconHash = ?, Command = ?, Argument = ? WHERE AppID = ?"
             )
             query.bindValue(0, self.name.text())
             query.bindValue(1, self.path.text())
             query.bindValue(2, self.description.toPlainText())
-            query.bindValue(3, self.icon_img)
+            query.bindValue(3, save_icon(self.icon_img))
             query.bindValue(4, self.command.toPlainText())
             query.bindValue(5, self.argument.text())
             query.bindValue(6, self.id)
@@ -173,6 +180,9 @@ class EditDialog(QDialog):
                 print("Error ", query.lastError().text())
             # Remove environment variables whose AppID had been set to -2 to hide from the table temporary
             QSqlQuery("DELETE FROM Env WHERE AppID = -2")
+            # Reload the app and its environment variables in the catalog and compile its launch plan again
+            app_catalog.update_app(self.id)
+            launch_plans.compile(self.id)
             self.accept()
 
     def remove_icon(self):
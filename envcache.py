@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+
+# The directory of the environment snapshots
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "applauncher", "env")
+
+
+def expand(text, variables):
+    """Function for replacing $VAR and ${VAR} in a text with the values of the variables and removing the quotes.
+
+    Parameters
+    ----------
+    text: str
+        A word in the additional commands, e.g. /opt/"$HOUDINI_VERSION".
+
+    variables: dict
+        The values of the environment variables keyed by name.
+
+    Returns
+    -------
+    str
+        The expanded text.
+    """
+    text = re.sub(r"\$\{(\w+)\}|\$(\w+)", lambda match: variables.get(match.group(1) or match.group(2), ""), text)
+    return text.replace('"', "").replace("'", "")
+
+
+def sourced_files(commands, variables):
+    """Function for finding the files sourced by the additional commands, so the snapshot is not used after they are modified.
+    The exports and the cd commands before each source command are followed to find the path of the file.
+
+    Parameters
+    ----------
+    commands: str
+        The additional commands with the backtick commands substituted.
+
+    variables: dict
+        The values of the environment variables before the commands are run keyed by name.
+
+    Returns
+    -------
+    list
+        The absolute paths of the sourced files in order.
+    """
+    variables = dict(variables)
+    directory = os.getcwd()
+    files = []
+    for command in re.split(r"[\n;]", commands):
+        words = command.split()
+        if len(words) < 2:
+            continue
+        if words[0] == "export" and "=" in words[1]:
+            name, value = words[1].split("=", 1)
+            variables[name] = expand(value, variables)
+        elif words[0] == "cd":
+            directory = os.path.join(directory, expand(words[1], variables))
+        elif words[0] in ("source", "."):
+            files.append(os.path.normpath(os.path.join(directory, expand(words[1], variables))))
+    return files
+
+
+class EnvCache:
+    """Class for the on-disk cache of the environment variables set by the additional commands.
+    A snapshot is keyed by a hash of the commands, the environment they are run in and the modification times of the files they source,
+    so a repeat launch can start the app without running bash. The snapshots expire after the time to live.
+
+    Attributes
+    ----------
+    directory : str
+        The directory of the snapshots. Each snapshot is saved in a JSON file named after its key.
+
+    ttl : float
+        The time to live of a snapshot in seconds.
+    """
+
+    directory: str = CACHE_DIR
+    ttl: float = 3600
+
+    def __init__(self, directory=CACHE_DIR, ttl=3600):
+        """Initialise the cache. The directory is created when the first snapshot is saved.
+
+        Parameters
+        ----------
+        directory: str
+            The directory of the snapshots.
+
+        ttl: float
+            The time to live of a snapshot in seconds.
+        """
+        self.directory = directory
+        self.ttl = ttl
+
+    def key(self, commands, env):
+        """Function for getting the key of a snapshot.
+
+        Parameters
+        ----------
+        commands: str
+            The additional commands with the backtick commands substituted.
+
+        env: dict
+            The environment variables the commands are run in keyed by name.
+
+        Returns
+        -------
+        str
+            The SHA-256 hash of the commands, the environment and the modification times of the sourced files.
+        """
+        digest = hashlib.sha256()
+        digest.update(commands.encode())
+        for name in sorted(env):
+            digest.update(f"\0{name}={env[name]}".encode())
+        for path in sourced_files(commands, env):
+            mtime = os.path.getmtime(path) if os.path.exists(path) else None
+            digest.update(f"\0{path}:{mtime}".encode())
+        return digest.hexdigest()
+
+    def path(self, key):
+        """Function for getting the path of the file of a snapshot."""
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        """Function for getting a snapshot. The expired snapshot is removed.
+
+        Parameters
+        ----------
+        key: str
+            The key given by the key function.
+
+        Returns
+        -------
+        dict
+            The environment variables set by the commands keyed by name. None if there is no valid snapshot.
+        """
+        try:
+            with open(self.path(key)) as file:
+                snapshot = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if time.time() - snapshot["created"] > self.ttl:
+            self.remove(key)
+            return None
+        return snapshot["env"]
+
+    def put(self, key, env):
+        """Function for saving a snapshot. The file is replaced in one step, so a launch never reads a partly written snapshot.
+        The snapshot can hold tokens and passwords set by the commands, so the directory and the files are only readable by the user.
+
+        Parameters
+        ----------
+        key: str
+            The key given by the key function.
+
+        env: dict
+            The environment variables set by the commands keyed by name.
+        """
+        try:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            # The mode given to makedirs is not applied to an existing directory
+            os.chmod(self.directory, 0o700)
+            temp = self.path(key) + f".{os.getpid()}.tmp"
+            # Remove the file left by a process which stopped while writing, as the file must be new to get its mode
+            if os.path.exists(temp):
+                os.remove(temp)
+            with os.fdopen(os.open(temp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), "w") as file:
+                json.dump({"created": time.time(), "env": env}, file)
+            os.replace(temp, self.path(key))
+        except OSError as error:
+            print("Error ", error)
+
+    def remove(self, key):
+        """Function for removing a snapshot.
+
+        Parameters
+        ----------
+        key: str
+            The key given by the key function.
+        """
+        try:
+            os.remove(self.path(key))
+        except OSError:
+            pass
+
+    def clear(self):
+        """Function for removing all the snapshots, e.g. after a sourced script is changed in a way the modification time does not show."""
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                self.remove(name[:-5])
+
+
+# The environment cache shared by the launches
+env_cache = EnvCache()
+
+
+if __name__ == "__main__":
+    # Remove all the snapshots, e.g. after installing a new version of an app
+    if sys.argv[1:] == ["--clear"]:
+        env_cache.clear()
+        print(f"Cleared {env_cache.directory}")
+    else:
+        print("Usage: python envcache.py --clear")
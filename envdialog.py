@@ -1,9 +1,10 @@
 #!/usr/bin/env python
-from tkinter import E
-from PyQt5 import uic
 from PyQt5.QtSql import QSqlQuery
 from PyQt5.QtWidgets import QDialog, QFileDialog, QMessageBox
 
+from catalog import app_catalog
+from uicache import load_ui
+
 
 class EnvDialog(QDialog):
     """Class for the edit dialog used for adding new application and editing the exiting applications.
@@ -38,7 +39,7 @@ class EnvDialog(QDialog):
         """
         super(EnvDialog, self).__init__()
         # Load UI
-        uic.loadUi("ui/env.ui", self)
+        load_ui("ui/env.ui", self)
         self.id = id
         self.appid = appid
         # Connect the button clicked signals to the corresponding functions.
@@ -122,5 +123,7 @@ class EnvDialog(QDialog):
                 query.bindValue(0, self.id)
                 if not query.exec():
                     print("Error ", query.lastError().text())
-            
+
+            # Drop the cached environment variables of the app
+            app_catalog.invalidate_envs(self.appid)
             self.accept()
\ No newline at end of file
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+
+
+class EnvReader:
+    """Class for reading the environment variables printed by env -0 while the output is received.
+    Each entry ends with a NUL character, so the values containing = or newlines are kept.
+    Only the last incomplete entry is kept between the chunks, so the whole output is never copied or decoded at once.
+
+    Attributes
+    ----------
+    start : bytes
+        The entry printed before the environment variables. The output of the commands before it is skipped. None if env -0 is printed first.
+
+    end : bytes
+        The beginning of the entry printed after the environment variables. None if the output ends with the environment variables.
+
+    values : dict
+        The environment variables read so far keyed by name.
+
+    started : bool
+        True once the start entry is read.
+
+    ended : bool
+        True once the end entry is read.
+
+    end_entry : str
+        The end entry. Empty until it is read.
+
+    buffer : bytes
+        The incomplete entry at the end of the last chunk.
+    """
+
+    start: bytes = None
+    end: bytes = None
+    values: dict = {}
+    started: bool = True
+    ended: bool = False
+    end_entry: str = ""
+    buffer: bytes = b""
+
+    def __init__(self, start=None, end=None):
+        """Initialise the reader without any environment variables.
+
+        Parameters
+        ----------
+        start: bytes
+            The entry printed before the environment variables.
+
+        end: bytes
+            The beginning of the entry printed after the environment variables.
+        """
+        self.start = start
+        self.end = end
+        self.values = {}
+        self.started = start is None
+        self.ended = False
+        self.end_entry = ""
+        self.buffer = b""
+
+    def feed(self, data):
+        """Function for reading a chunk of the output.
+
+        Parameters
+        ----------
+        data: bytes
+            The chunk read from the process.
+        """
+        if self.ended:
+            return
+        entries = (self.buffer + bytes(data)).split(b"\0")
+        self.buffer = entries.pop()
+        for entry in entries:
+            self.read_entry(entry)
+            if self.ended:
+                return
+
+    def read_entry(self, entry):
+        """Function for reading a complete entry.
+
+        Parameters
+        ----------
+        entry: bytes
+            The entry without the NUL character.
+        """
+        if self.end is not None and entry.startswith(self.end):
+            self.ended = True
+            self.end_entry = entry.decode(errors="replace")
+        elif not self.started:
+            self.started = entry == self.start
+        elif b"=" in entry:
+            name, value = entry.decode(errors="replace").split("=", 1)
+            self.values[name] = value
+
+    def finish(self):
+        """Function for reading the last entry if it does not end with a NUL character, once the output is closed.
+
+        Returns
+        -------
+        dict
+            The environment variables keyed by name. None if the start entry is not read.
+        """
+        if self.buffer and not self.ended:
+            self.read_entry(self.buffer)
+        self.buffer = b""
+        return self.values if self.started else None
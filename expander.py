@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+import itertools
+import re
+from collections import OrderedDict
+from functools import lru_cache
+
+# The variable references: "$VAR", "${VAR}" and "${VAR:-default}" with the quotes, then the same without the quotes
+REFERENCE = re.compile(r'"\$(?:(\w+)|\{(\w+)(?::-([^}]*))?\})"|\$(?:(\w+)|\{(\w+)(?::-([^}]*))?\})')
+
+# The versions given to the environments, which are never reused
+versions = itertools.count(1)
+
+
+def new_version():
+    """Function for getting a new environment version, e.g. after an environment variable is changed.
+
+    Returns
+    -------
+    int
+        A version not used by any environment.
+    """
+    return next(versions)
+
+
+@lru_cache(maxsize=1024)
+def compile_template(template):
+    """Function for compiling a text with variable references into its parts in a single pass.
+    The quotes around a reference are removed with it, in the same way as the shell.
+
+    Parameters
+    ----------
+    template: str
+        The text, e.g. a path, an argument or the value of an environment variable.
+
+    Returns
+    -------
+    tuple
+        The literal texts as str and the references as tuples of the name and the default value, which is None without a default.
+    """
+    parts = []
+    position = 0
+    for match in REFERENCE.finditer(template):
+        if match.start() > position:
+            parts.append(template[position : match.start()])
+        quoted, braced, quoted_default, name, braced_name, default = match.groups()
+        if match.group(0).startswith('"'):
+            parts.append((quoted or braced, quoted_default))
+        else:
+            parts.append((name or braced_name, default))
+        position = match.end()
+    if position < len(template):
+        parts.append(template[position:])
+    return tuple(parts)
+
+
+class Expander:
+    """Class for replacing the variable references in a text with the values of the environment variables.
+    The texts are compiled once, and the results are kept for each text and environment version,
+    so the same path, argument or value is not expanded again until the environment changes.
+
+    Attributes
+    ----------
+    max_size : int
+        The number of results kept.
+
+    results : OrderedDict
+        The expanded texts keyed by the text and the environment version, in the order of use.
+    """
+
+    max_size: int = 4096
+    results: OrderedDict = OrderedDict()
+
+    def __init__(self, max_size=4096):
+        """Initialise an empty expander.
+
+        Parameters
+        ----------
+        max_size: int
+            The number of results kept.
+        """
+        self.max_size = max_size
+        self.results = OrderedDict()
+
+    def expand(self, template, env, version=None):
+        """Function for replacing $VAR, ${VAR}, ${VAR:-default} and the quoted forms with the values of the environment variables.
+        An unset variable is replaced with an empty text, or with the default value if it is given. The default is used if the value is empty as well.
+
+        Parameters
+        ----------
+        template: str
+            The text with the variable references.
+
+        env: QProcessEnvironment
+            The environment variables.
+
+        version: int
+            The version of the environment given by new_version. The result is not kept if it is not given.
+
+        Returns
+        -------
+        str
+            The expanded text.
+        """
+        key = (template, version)
+        if version is not None and key in self.results:
+            self.results.move_to_end(key)
+            return self.results[key]
+        text = []
+        for part in compile_template(template):
+            if isinstance(part, str):
+                text.append(part)
+            else:
+                name, default = part
+                value = env.value(name)
+                text.append(value if value != "" or default is None else default)
+        text = "".join(text)
+        if version is not None:
+            self.results[key] = text
+            if len(self.results) > self.max_size:
+                self.results.popitem(last=False)
+        return text
+
+
+# The expander shared by the launches
+expander = Expander()
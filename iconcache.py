@@ -0,0 +1,356 @@
+#!/usr/bin/env python
+import weakref
+from collections import OrderedDict
+
+from PyQt5 import sip
+from PyQt5.QtCore import QCoreApplication, QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QColor, QImage, QPixmap
+
+# The size of the icons displayed on the launch buttons
+ICON_SIZE = 128
+
+# Thread pool priorities of the icons. The icons of the visible tiles are decoded first.
+HIDDEN_PRIORITY = 0
+VISIBLE_PRIORITY = 1
+
+
+class IconCache:
+    """Class for the cache of the decoded icons scaled to the launch button size, so the same PNG data is never decoded twice.
+    The icons are keyed by App ID and the IconHash saved in the catalog, so an updated icon never hits the old entry
+    and the PNG data is not hashed again on every lookup.
+    The least recently used icons are removed when the cache is full.
+
+    Attributes
+    ----------
+    max_size : int
+        The maximum number of icons kept in the cache.
+
+    pixmaps : OrderedDict
+        The scaled icons keyed by App ID and hash, from the least recently used to the most recently used.
+
+    hits : int
+        The number of icons found in the cache.
+
+    misses : int
+        The number of icons decoded.
+    """
+
+    max_size: int = 512
+    pixmaps: OrderedDict = None
+    hits: int = 0
+    misses: int = 0
+
+    def __init__(self, max_size=512):
+        """Initialise an empty cache.
+
+        Parameters
+        ----------
+        max_size: int
+            The maximum number of icons kept in the cache.
+        """
+        self.max_size = max_size
+        self.pixmaps = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        """Return the number of icons in the cache."""
+        return len(self.pixmaps)
+
+    def key(self, id, hash):
+        """Function for getting the cache key of an icon.
+
+        Parameters
+        ----------
+        id: int
+            The App ID saved in the database.
+
+        hash: str
+            The IconHash of the application saved in the database.
+
+        Returns
+        -------
+        tuple
+            The App ID and the IconHash.
+        """
+        return (id, hash)
+
+    def pixmap(self, id, hash, data):
+        """Function for getting the icon scaled to the launch button size. It is decoded only if it is not in the cache.
+
+        Parameters
+        ----------
+        id: int
+            The App ID saved in the database.
+
+        hash: str
+            The IconHash of the application saved in the database.
+
+        data: QByteArray
+            The PNG data of the icon.
+
+        Returns
+        -------
+        QPixmap
+            The scaled icon.
+        """
+        pixmap = self.get(id, hash)
+        if pixmap is None:
+            pixmap = QPixmap()
+            pixmap.loadFromData(data, "png")
+            pixmap = pixmap.scaled(ICON_SIZE, ICON_SIZE)
+            self.insert(self.key(id, hash), pixmap)
+        return pixmap
+
+    def get(self, id, hash):
+        """Function for getting the icon from the cache without decoding it.
+
+        Parameters
+        ----------
+        id: int
+            The App ID saved in the database.
+
+        hash: str
+            The IconHash of the application saved in the database.
+
+        Returns
+        -------
+        QPixmap
+            The scaled icon. None if it is not in the cache.
+        """
+        key = self.key(id, hash)
+        if key not in self.pixmaps:
+            self.misses = self.misses + 1
+            return None
+        self.hits = self.hits + 1
+        self.pixmaps.move_to_end(key)
+        return self.pixmaps[key]
+
+    def insert(self, key, pixmap):
+        """Function for adding a decoded icon to the cache.
+
+        Parameters
+        ----------
+        key: tuple
+            The cache key given by the key function.
+
+        pixmap: QPixmap
+            The scaled icon.
+        """
+        self.pixmaps[key] = pixmap
+        self.pixmaps.move_to_end(key)
+        # Remove the least recently used icons
+        while len(self.pixmaps) > self.max_size:
+            self.pixmaps.popitem(last=False)
+
+    def discard(self, id):
+        """Function for removing all the icons of an application, e.g. when it is removed.
+
+        Parameters
+        ----------
+        id: int
+            The App ID saved in the database.
+        """
+        for key in [key for key in self.pixmaps if key[0] == id]:
+            del self.pixmaps[key]
+
+    def clear(self):
+        """Function for removing all the icons from the cache."""
+        self.pixmaps.clear()
+
+
+# The icon cache shared by the app widgets and the grid view
+icon_cache = IconCache()
+
+
+class IconTaskSignals(QObject):
+    """Class for the signal of the icon decoding task. QRunnable cannot emit signals itself.
+
+    Attributes
+    ----------
+    decoded : pyqtSignal
+        Signal with the cache key and the scaled image emitted when the icon is decoded.
+    """
+
+    decoded = pyqtSignal(tuple, QImage)
+
+
+class IconTask(QRunnable):
+    """Class for decoding an icon into a QImage on a thread pool worker. QPixmap can only be used on the GUI thread.
+
+    Attributes
+    ----------
+    key : tuple
+        The cache key of the icon.
+
+    data : bytes
+        The PNG data of the icon.
+
+    priority : int
+        The priority of the task in the thread pool.
+
+    signals : IconTaskSignals
+        The signals delivering the result to the GUI thread.
+    """
+
+    key: tuple = None
+    data: bytes = b""
+    priority: int = HIDDEN_PRIORITY
+    signals: IconTaskSignals = None
+
+    def __init__(self, key, data, signals, priority=HIDDEN_PRIORITY):
+        """Initialise the task. The task is kept by the loader, so it is not deleted by the thread pool.
+
+        Parameters
+        ----------
+        key: tuple
+            The cache key of the icon.
+
+        data: QByteArray
+            The PNG data of the icon.
+
+        signals: IconTaskSignals
+            The signals delivering the result to the GUI thread.
+
+        priority: int
+            The priority of the task in the thread pool.
+        """
+        super(IconTask, self).__init__()
+        self.setAutoDelete(False)
+        self.key = key
+        self.data = bytes(data)
+        self.signals = signals
+        self.priority = priority
+
+    def run(self):
+        """Decode and scale the icon, and send it to the GUI thread."""
+        image = QImage()
+        image.loadFromData(self.data, "png")
+        self.signals.decoded.emit(self.key, image.scaled(ICON_SIZE, ICON_SIZE))
+
+
+class IconLoader(QObject):
+    """Class for decoding the icons in the background, so the window is not blocked while a large catalog is displayed.
+    The icons are decoded into QImage on a thread pool, converted to QPixmap on the GUI thread and added to the icon cache.
+    The tiles show a placeholder until the loaded signal is emitted with their App ID, and the app widgets until their callback is called,
+    so each decoded icon only calls the widgets waiting for it.
+
+    Attributes
+    ----------
+    loaded : pyqtSignal
+        Signal with the App ID emitted when an icon is added to the icon cache.
+
+    pool : QThreadPool
+        The thread pool decoding the icons.
+
+    pending : dict
+        The tasks waiting for the result keyed by the cache key.
+
+    callbacks : dict
+        The weak references to the methods called with the App ID when the icon is decoded keyed by the cache key.
+
+    signals : IconTaskSignals
+        The signals shared by the tasks.
+
+    placeholder_pixmap : QPixmap
+        The pixmap displayed until the icon is decoded. It is created when first used.
+    """
+
+    loaded = pyqtSignal(int)
+    pool: QThreadPool = None
+    pending: dict = {}
+    callbacks: dict = {}
+    signals: IconTaskSignals = None
+    placeholder_pixmap: QPixmap = None
+
+    def __init__(self):
+        """Initialise the thread pool. It is separated from the global thread pool, so the icons do not wait for other tasks."""
+        super(IconLoader, self).__init__()
+        self.pool = QThreadPool()
+        self.pending = {}
+        self.callbacks = {}
+        self.signals = IconTaskSignals()
+        self.signals.decoded.connect(self.decoded)
+
+    def request(self, id, hash, data, priority=HIDDEN_PRIORITY, callback=None):
+        """Function for decoding an icon in the background. The task is moved up if the icon is already requested with a lower priority.
+
+        Parameters
+        ----------
+        id: int
+            The App ID saved in the database.
+
+        hash: str
+            The IconHash of the application saved in the database.
+
+        data: QByteArray
+            The PNG data of the icon.
+
+        priority: int
+            VISIBLE_PRIORITY for the icons on the screen, otherwise HIDDEN_PRIORITY.
+
+        callback: method
+            The method of a QObject called with the App ID when the icon is decoded. It is only weakly referenced like a signal connection,
+            and is not called if the object is deleted by then.
+        """
+        key = icon_cache.key(id, hash)
+        if callback is not None and weakref.WeakMethod(callback) not in self.callbacks.setdefault(key, []):
+            self.callbacks[key].append(weakref.WeakMethod(callback))
+        if key in self.pending:
+            self.move_up(self.pending[key], priority)
+            return
+        task = IconTask(key, data, self.signals, priority)
+        self.pending[key] = task
+        self.pool.start(task, priority)
+
+    def promote(self, id):
+        """Function for decoding the icons of an application before the others, e.g. when its tile is scrolled into the view.
+
+        Parameters
+        ----------
+        id: int
+            The App ID saved in the database.
+        """
+        for key, task in list(self.pending.items()):
+            if key[0] == id:
+                self.move_up(task, VISIBLE_PRIORITY)
+
+    def move_up(self, task, priority):
+        """Function for starting a waiting task again with a higher priority. The tasks already running are left as they are."""
+        if priority > task.priority and self.pool.tryTake(task):
+            task.priority = priority
+            self.pool.start(task, priority)
+
+    def decoded(self, key, image):
+        """Function called on the GUI thread when an icon is decoded. It adds the icon to the cache, calls the callbacks waiting for it
+        and emits the loaded signal."""
+        self.pending.pop(key, None)
+        icon_cache.insert(key, QPixmap.fromImage(image))
+        for reference in self.callbacks.pop(key, []):
+            callback = reference()
+            if callback is not None and not sip.isdeleted(callback.__self__):
+                callback(key[0])
+        self.loaded.emit(key[0])
+
+    def placeholder(self):
+        """Function for getting the pixmap displayed until the icon is decoded.
+
+        Returns
+        -------
+        QPixmap
+            A plain pixmap with the icon size.
+        """
+        if self.placeholder_pixmap is None:
+            self.placeholder_pixmap = QPixmap(ICON_SIZE, ICON_SIZE)
+            self.placeholder_pixmap.fill(QColor(128, 128, 128, 40))
+        return self.placeholder_pixmap
+
+    def wait(self):
+        """Function for waiting until all the requested icons are decoded and delivered, e.g. before taking a screenshot or in the tests."""
+        while self.pending:
+            self.pool.waitForDone()
+            QCoreApplication.processEvents()
+
+
+# The icon loader shared by the app widgets and the grid view
+icon_loader = IconLoader()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python
+import getpass
+import json
+import os
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from PyQt5.QtNetwork import QLocalServer, QLocalSocket
+
+# The name of the local socket of the running instance. Each user has their own instance, and APPLAUNCHER_INSTANCE gives another name.
+SERVER_NAME = os.environ.get("APPLAUNCHER_INSTANCE", f"applauncher-{getpass.getuser()}")
+
+
+def send_request(request, timeout=120000, name=SERVER_NAME):
+    """Function for handing a request to the running instance and waiting for its reply.
+
+    Parameters
+    ----------
+    request: dict
+        The request. "command" is "show" to raise the main window, "quit" to stop the instance, "ping" to check it or "cli" to run a command line.
+
+    timeout: int
+        The time in milliseconds to wait for the reply, e.g. while the additional commands of a launch are running.
+
+    name: str
+        The name of the local socket.
+
+    Returns
+    -------
+    dict
+        The reply. None if no instance is running or it did not reply.
+    """
+    socket = QLocalSocket()
+    socket.connectToServer(name)
+    if not socket.waitForConnected(100):
+        return None
+    socket.write(json.dumps(request).encode() + b"\n")
+    socket.flush()
+    data = b""
+    while not data.endswith(b"\n"):
+        if not socket.waitForReadyRead(timeout):
+            return None
+        data = data + socket.readAll().data()
+    socket.disconnectFromServer()
+    return json.loads(data)
+
+
+class InstanceServer(QObject):
+    """Class for the local server of the first instance, so the later invocations hand their requests to it instead of starting cold.
+    The catalog, the icons, the launch plans, the environment cache and the bash workers stay loaded between the requests.
+    Each request and reply is a line of JSON.
+
+    Attributes
+    ----------
+    show_requested : pyqtSignal
+        Signal emitted when another invocation of the main window asks for the window to be raised.
+
+    quit_requested : pyqtSignal
+        Signal emitted when another invocation asks the instance to stop.
+
+    name : str
+        The name of the local socket.
+
+    database : str
+        The absolute path of the database used by the instance. The command lines using another database are not run by the instance.
+
+    server : QLocalServer
+        The server accepting the connections.
+
+    buffers : dict
+        The data received so far keyed by the socket.
+
+    commands : dict
+        The command lines running in the background keyed by the socket of their invocation.
+    """
+
+    show_requested = pyqtSignal()
+    quit_requested = pyqtSignal()
+    name: str = SERVER_NAME
+    database: str = ""
+    server: QLocalServer = None
+    buffers: dict = {}
+    commands: dict = {}
+
+    def __init__(self, database, parent=None, name=SERVER_NAME):
+        """Initialise the server. It does not accept any connections until listen is called.
+
+        Parameters
+        ----------
+        database: str
+            The absolute path of the database used by the instance.
+
+        parent: QObject
+            The parent object of the server.
+
+        name: str
+            The name of the local socket.
+        """
+        super(InstanceServer, self).__init__(parent)
+        self.name = name
+        self.database = database
+        self.buffers = {}
+        self.commands = {}
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.UserAccessOption)
+        self.server.newConnection.connect(self.new_connection)
+
+    def listen(self):
+        """Function for accepting the requests. The socket left by an instance which did not exit cleanly is removed.
+
+        Returns
+        -------
+        bool
+            True if the server is listening. False if another instance is running.
+        """
+        if self.server.listen(self.name):
+            return True
+        if send_request({"command": "ping"}, 1000, self.name) is not None:
+            return False
+        QLocalServer.removeServer(self.name)
+        return self.server.listen(self.name)
+
+    def close(self):
+        """Function for closing the server, e.g. when the application quits."""
+        self.server.close()
+
+    def new_connection(self):
+        """Function called when another invocation connects. The request is read once the whole line is received."""
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            self.buffers[socket] = b""
+            socket.readyRead.connect(lambda socket=socket: self.read(socket))
+            socket.disconnected.connect(lambda socket=socket: self.disconnected(socket))
+
+    def read(self, socket):
+        """Function for reading a request and writing the reply. The reply of a command line is written when it ends.
+
+        Parameters
+        ----------
+        socket: QLocalSocket
+            The connection of the invocation.
+        """
+        self.buffers[socket] = self.buffers.get(socket, b"") + socket.readAll().data()
+        if b"\n" not in self.buffers[socket]:
+            return
+        line = self.buffers[socket].split(b"\n", 1)[0]
+        self.buffers[socket] = b""
+        try:
+            reply = self.handle(json.loads(line), socket)
+        except ValueError:
+            reply = {"status": None, "error": "Invalid request"}
+        if reply is not None:
+            self.reply(socket, reply)
+
+    def reply(self, socket, reply):
+        """Function for writing the reply to an invocation, unless it has disconnected.
+
+        Parameters
+        ----------
+        socket: QLocalSocket
+            The connection of the invocation.
+
+        reply: dict
+            The reply.
+        """
+        if socket is not None and socket.state() == QLocalSocket.ConnectedState:
+            socket.write(json.dumps(reply).encode() + b"\n")
+            socket.flush()
+            socket.disconnectFromServer()
+
+    def command_finished(self, socket, command):
+        """Function called when a command line handed to the instance ends. Its output is written to the invocation.
+
+        Parameters
+        ----------
+        socket: QLocalSocket
+            The connection of the invocation.
+
+        command: CommandLine
+            The command line.
+        """
+        self.commands.pop(socket, None)
+        self.reply(socket, command.output())
+        command.deleteLater()
+
+    def disconnected(self, socket):
+        """Function called when an invocation disconnects."""
+        self.buffers.pop(socket, None)
+        # A command line still running, e.g. a launch, goes on without writing its reply
+        command = self.commands.pop(socket, None)
+        if command is not None:
+            command.finished.disconnect()
+            command.finished.connect(command.deleteLater)
+        socket.deleteLater()
+
+    def handle(self, request, socket=None):
+        """Function for performing a request. A command line is run in the background and its reply is written when it ends,
+        so a slow launch does not hold up the replies to the other invocations.
+
+        Parameters
+        ----------
+        request: dict
+            The request given by send_request.
+
+        socket: QLocalSocket
+            The connection of the invocation, which the reply of a command line is written to.
+
+        Returns
+        -------
+        dict
+            The reply. The status is None if the request is not performed, so the invocation performs it by itself.
+            None if the reply of a command line is written when it ends.
+        """
+        command = request.get("command")
+        if command == "ping":
+            return {"status": 0}
+        elif command == "show":
+            self.show_requested.emit()
+            return {"status": 0}
+        elif command == "quit":
+            # Quit once the reply is written
+            QTimer.singleShot(0, self.quit_requested.emit)
+            return {"status": 0}
+        elif command == "cli" and request.get("database") == self.database:
+            # The command line is imported when first used, so it does not slow down the start-up
+            from applauncher import CommandLine
+
+            command_line = CommandLine(request.get("argv", []), request.get("env"), parent=self)
+            command_line.finished.connect(lambda status: self.command_finished(socket, command_line))
+            if socket is not None:
+                self.commands[socket] = command_line
+            command_line.start()
+            return None
+        return {"status": None}
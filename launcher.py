@@ -0,0 +1,841 @@
+#!/usr/bin/env python
+import os
+import sys
+import time
+
+from PyQt5.QtCore import QObject, QProcess, QProcessEnvironment, QTimer, pyqtSignal
+from PyQt5.QtWidgets import QMessageBox, QWidget
+
+from bashpool import BashPool, BashRequest, bash_pool
+from catalog import app_catalog, count_launch
+from envcache import EnvCache, env_cache
+from envreader import EnvReader
+from expander import expander, new_version
+from launchplan import LaunchPlan, launch_plans
+from profiling import profiled
+
+
+def find_backticks(commands):
+    """Function for finding the backtick commands in the additional commands.
+
+    Returns
+    -------
+    list
+        The commands between backticks in order.
+    """
+    backticks = []
+    if (count := int(commands.count("`") / 2)) > 0:
+        sub = commands
+        for i in range(count):
+            firstindex = sub.find("`") + 1
+            sub = sub[firstindex::]
+            secondindex = sub.find("`")
+            backticks.append(sub[0:secondindex])
+            sub = sub[secondindex + 1 : :]
+    return backticks
+
+
+def substitute(commands, results):
+    """Function for replacing the backtick commands in the additional commands with their results in order.
+
+    Parameters
+    ----------
+    commands: str
+        The additional commands.
+
+    results: dict
+        The first line of the output of each backtick command keyed by the command.
+
+    Returns
+    -------
+    str
+        The additional commands with the backtick commands replaced.
+    """
+    parts = commands.split("`")
+    count = int((len(parts) - 1) / 2)
+    text = parts[0]
+    for i in range(count):
+        text = text + results[parts[2 * i + 1]] + parts[2 * i + 2]
+    # An unmatched backtick is kept
+    if len(parts) % 2 == 0:
+        text = text + "`" + parts[-1]
+    return text
+
+
+def run_backticks(backticks, max_workers=4):
+    """Function for running the backtick commands and waiting for them. Up to max_workers commands are run at the same time and each
+    identical command is only run once.
+
+    Parameters
+    ----------
+    backticks: list
+        The backtick commands given by find_backticks.
+
+    max_workers: int
+        The number of commands run at the same time.
+
+    Returns
+    -------
+    dict
+        The first line of the output of each backtick command keyed by the command.
+    """
+    results = {}
+    pending = list(dict.fromkeys(backticks))
+    while pending:
+        batch = pending[:max_workers]
+        pending = pending[max_workers:]
+        processes = []
+        for backtick in batch:
+            process = QProcess()
+            process.start(backtick)
+            processes.append(process)
+        for backtick, process in zip(batch, processes):
+            process.waitForFinished()
+            results[backtick] = process.readLine().data().decode()
+    return results
+
+
+def bash_script(commands):
+    """Function for getting the bash script running the additional commands and printing the environment variables with env -0.
+    An empty entry is printed before them, so the output of the commands is skipped by EnvReader(b"").
+    The script is given to bash -c as a single argument, so the quotes and the newlines in the commands are kept.
+
+    Returns
+    -------
+    str
+        The bash script.
+    """
+    return f"{commands}\nprintf '\\0\\0'\nenv -0"
+
+
+class Launcher:
+    """Class for launching an application with its additional commands and environment variables.
+    It does not create any widgets, so it can be used by the app widgets and by the grid view in the main window.
+
+    Attributes
+    ----------
+    id : int
+        The App ID saved in the database.
+
+    name : str
+        The application name.
+
+    path : str
+        The application file path.
+
+    command : str
+        Additional command to be executed on before launching the app.
+
+    arg : str
+        Arguments for launching the app.
+
+    base_env : QProcessEnvironment
+        The environment each launch starts from. It is the system environment, or the environment of the invocation when the command line is run
+        by the running instance. It is not changed by the launches.
+
+    env : QProcessEnvironment
+        The environment variables of the application. It is copied from base_env for each launch, so a launch does not inherit the variables set by the previous one.
+
+    widget : QWidget
+        The widget used as the parent of the message boxes.
+
+    prepared : bool
+        True if the additional commands are run and the environment variables are set, so the app can be started at once.
+
+    env_version : int
+        The version of the environment variables, which changes whenever they are changed, so the expanded texts are not reused.
+
+    timings : dict
+        The time in seconds of each stage of the last launch keyed by the stage in launchlog.STAGES.
+    """
+
+    id: int = None
+    name: str = ""
+    path: str = ""
+    command: str = ""
+    arg: str = ""
+    base_env: QProcessEnvironment = QProcessEnvironment.systemEnvironment()
+    env: QProcessEnvironment = QProcessEnvironment.systemEnvironment()
+    widget: QWidget = None
+    prepared: bool = False
+    env_version: int = 0
+    timings: dict = {}
+
+    def __init__(self, id=None, widget=None):
+        """Set the App ID and get the launch settings from the catalog.
+
+        Parameters
+        ----------
+        id: int
+            The App ID saved in the database.
+
+        widget: QWidget
+            The widget used as the parent of the message boxes.
+        """
+        self.id = id
+        self.widget = widget
+        self.prepared = False
+        self.base_env = QProcessEnvironment.systemEnvironment()
+        self.reset_env()
+        self.timings = {}
+        if self.id is not None:
+            self.get_launch_data()
+
+    def get_launch_data(self):
+        """Function for getting the launch settings from the catalog without the icon."""
+        row = app_catalog.app(self.id)
+        self.name = row["Name"]
+        self.path = row["Path"]
+        self.command = row["Command"]
+        self.arg = row["Argument"]
+
+    @profiled
+    def launch(self, timeout=None):
+        """Start launching the app. The additional commands are run in the background and the app is launched when they finish.
+        The failures are displayed in message boxes.
+
+        Parameters
+        ----------
+        timeout: int
+            The time in milliseconds each command can take. LaunchJob.timeout is used if not given.
+
+        Returns
+        -------
+        LaunchJob
+            The job running the launch, which can be cancelled.
+        """
+        parent = self.widget if isinstance(self.widget, QObject) else None
+        job = LaunchJob(self, parent, timeout)
+        job.failed.connect(self.show_error)
+        job.finished.connect(job.deleteLater)
+        job.start()
+        return job
+
+    def reset_env(self):
+        """Function for setting the environment variables back to a copy of base_env, e.g. before each launch, so the launches do not change the environment of each other."""
+        self.env = QProcessEnvironment(self.base_env)
+        self.env_version = new_version()
+
+    def plan(self):
+        """Function for getting the launch plan of the app. It is compiled from the launch settings if the app is not saved.
+
+        Returns
+        -------
+        LaunchPlan
+            The launch plan.
+        """
+        plan = launch_plans.get(self.id) if self.id is not None else None
+        if plan is None:
+            plan = LaunchPlan.build(self.id, {"Path": self.path, "Argument": self.arg, "Command": self.command}, [])
+        return plan
+
+    def set_envs(self, plan=None):
+        """Function for setting the environment variables of the launch plan to the process in order.
+
+        Parameters
+        ----------
+        plan: LaunchPlan
+            The launch plan. It is taken from the launch plans if not given.
+        """
+        if plan is None:
+            plan = self.plan()
+        for name, value in plan.envs:
+            value = self.replace_env(value)
+            self.env.insert(name, value)
+            self.env_version = new_version()
+
+    def start_app(self):
+        """Function for setting the environment variables of the app and starting it detached.
+        It is called once the additional commands are executed. The program, the arguments and the environment variables are taken from the launch plan,
+        and the environment variables are not set again if the launcher is prepared.
+
+        Returns
+        -------
+        bool
+            True if the app is started, otherwise False.
+        """
+        start = time.perf_counter()
+        plan = self.plan()
+        if self.prepared:
+            self.prepared = False
+        else:
+            self.set_envs(plan)
+        process = QProcess()
+        process.setProgram(self.replace_env(plan.program))
+        process.setArguments([self.replace_env(argument) for argument in plan.arguments])
+        process.setProcessEnvironment(self.env)
+        self.timings["Env"] = time.perf_counter() - start
+        start = time.perf_counter()
+        orig_path = os.environ["PATH"]
+        os.environ["PATH"] = process.processEnvironment().value("PATH")
+        started = process.startDetached()[0]
+        os.environ["PATH"] = orig_path
+        self.timings["Exec"] = time.perf_counter() - start
+        return started
+
+    def show_error(self, title, message):
+        """Function for displaying a launch failure in a message box.
+
+        Parameters
+        ----------
+        title: str
+            The title of the message box.
+
+        message: str
+            The error message.
+        """
+        QMessageBox.critical(self.widget, title, message)
+
+    def load_env(self, values):
+        """Function for replacing all the environment variables with the given values.
+
+        Parameters
+        ----------
+        values: dict
+            The values of the environment variables keyed by name.
+        """
+        self.env.clear()
+        for name, value in values.items():
+            self.env.insert(name, value)
+        self.env_version = new_version()
+
+    def run_commands(self, commands):
+        """Run the additional commands and wait for them. It runs backtick commands first and replace the returned value with the commands.
+        The launch button uses LaunchJob instead, which does not block the window.
+
+        Returns
+        -------
+        bool
+            True if commands are successfully executed, otherwise False.
+        """
+        process = QProcess()
+
+        # Replace backtick commands, which are run at the same time
+        start = time.perf_counter()
+        commands = substitute(commands, run_backticks(find_backticks(commands)))
+        self.timings["Substitution"] = time.perf_counter() - start
+
+        # Run commands
+        start = time.perf_counter()
+        process.start("bash", ["-c", bash_script(commands)])
+        finished = process.waitForStarted() and process.waitForFinished()
+        self.timings["Commands"] = time.perf_counter() - start
+        if finished:
+            error = process.readAllStandardError().data().decode()
+            reader = EnvReader(b"")
+            reader.feed(process.readAllStandardOutput().data())
+            values = reader.finish()
+            # If no error, replace all the system environment variables with the environment variables set with the commands
+            if error == "" and values is not None:
+                self.load_env(values)
+                return True
+            # Otherwise, pop up a message box and display the error
+            else :
+                QMessageBox.critical(
+                    self.widget, "Run Additional Command Failed", error or "Please check the configuration"
+                )
+                return False
+        # Pop up a message box if it failed to execute the commands
+        else:
+            QMessageBox.critical(
+                self.widget, "Run Additional Command Failed", "Please check the configuration"
+            )
+            return False
+
+    def replace_env(self, text):
+        """Replace the environment variables in a text with the actual values.
+        $VAR, ${VAR}, ${VAR:-default} and the quoted forms are replaced in a single pass, and the result is kept until the environment changes.
+
+        Returns
+        -------
+        text : str
+            Replaced text.
+        """
+        return expander.expand(text, self.env, self.env_version)
+
+
+class Substitution(QObject):
+    """Class for running the backtick commands of the additional commands without waiting for them.
+    Up to max_workers commands run at the same time, so the commands querying several tools do not add up.
+    Each identical command is only run once, and the results are substituted in order when all the commands finish.
+
+    Attributes
+    ----------
+    stderr_received : pyqtSignal
+        Signal with the text written to the standard error by a command.
+
+    failed : pyqtSignal
+        Signal emitted when a command cannot be run.
+
+    finished : pyqtSignal
+        Signal with the additional commands with the backtick commands replaced, emitted when all the commands finish.
+
+    max_workers : int
+        The number of commands run at the same time.
+
+    commands : str
+        The additional commands.
+
+    pending : list
+        The backtick commands waiting to be run.
+
+    processes : dict
+        The backtick command of each running process keyed by the process.
+
+    results : dict
+        The first line of the output of each finished command keyed by the command.
+    """
+
+    stderr_received = pyqtSignal(str)
+    failed = pyqtSignal()
+    finished = pyqtSignal(str)
+    max_workers: int = 4
+    commands: str = ""
+    pending: list = []
+    processes: dict = {}
+    results: dict = {}
+
+    def __init__(self, commands, parent=None, max_workers=None):
+        """Find the backtick commands. They are not run until start is called.
+
+        Parameters
+        ----------
+        commands: str
+            The additional commands.
+
+        parent: QObject
+            The parent object.
+
+        max_workers: int
+            The number of commands run at the same time. The class default is used if not given.
+        """
+        super(Substitution, self).__init__(parent)
+        if max_workers is not None:
+            self.max_workers = max_workers
+        self.commands = commands
+        self.pending = list(dict.fromkeys(find_backticks(commands)))
+        self.processes = {}
+        self.results = {}
+
+    def start(self):
+        """Function for running the waiting commands while fewer than max_workers commands are running."""
+        while self.pending and len(self.processes) < self.max_workers:
+            self.run(self.pending.pop(0))
+
+    def run(self, backtick):
+        """Function for running a backtick command in a new process."""
+        process = QProcess(self)
+        self.processes[process] = backtick
+        process.finished.connect(lambda: self.process_finished(process))
+        process.errorOccurred.connect(self.process_error)
+        process.readyReadStandardError.connect(lambda: self.stderr_received.emit(process.readAllStandardError().data().decode()))
+        process.start(backtick)
+
+    def process_finished(self, process):
+        """Function called when a backtick command finishes. The next command is run, and the commands are substituted if it is the last one."""
+        self.results[self.processes.pop(process)] = process.readLine().data().decode()
+        process.deleteLater()
+        self.start()
+        if not self.processes:
+            self.finished.emit(substitute(self.commands, self.results))
+
+    def process_error(self, error):
+        """Function called when a backtick command cannot be run."""
+        if error == QProcess.FailedToStart:
+            self.failed.emit()
+
+    def stop(self):
+        """Function for killing the running commands without substituting them."""
+        self.pending = []
+        for process in self.processes:
+            process.finished.disconnect()
+            process.errorOccurred.disconnect()
+            process.kill()
+            process.waitForFinished(1000)
+        self.processes = {}
+
+
+class LaunchJob(QObject):
+    """Class for launching an application without blocking the window.
+    It is a state machine driven by the QProcess signals. The backtick commands are substituted first, the additional commands are run next
+    and the app is started when they finish. The environment set by the commands is cached, so a repeat launch starts the app without running bash.
+    Each command can be cancelled and is stopped if it takes longer than the timeout.
+
+    Attributes
+    ----------
+    state_changed : pyqtSignal
+        Signal with the new state emitted when the job moves to the next step.
+
+    stderr_received : pyqtSignal
+        Signal with the text written to the standard error by the commands, emitted as soon as it is written.
+
+    failed : pyqtSignal
+        Signal with the title and the message of the error emitted when the launch fails or times out.
+
+    finished : pyqtSignal
+        Signal emitted at the end of the job with True if the app is started, otherwise False.
+
+    timeout : int
+        The time in milliseconds each command can take.
+
+    launcher : Launcher
+        The launcher with the launch settings of the app.
+
+    state : str
+        The current state, one of the states below.
+
+    commands : str
+        The additional commands, with the backtick commands replaced once they are substituted.
+
+    substitution : Substitution
+        The backtick commands running at the same time.
+
+    process : QProcess
+        The process running the additional commands if they are not run by the bash workers.
+
+    reader : EnvReader
+        The reader of the environment variables printed by the additional commands if they are not run by the bash workers.
+
+    bash_pool : BashPool
+        The bash workers running the additional commands. None to start bash for each launch.
+
+    request : BashRequest
+        The additional commands running on a bash worker.
+
+    timer : QTimer
+        The timer stopping the current command when it takes too long.
+
+    error : str
+        The standard error of the current command.
+
+    env_cache : EnvCache
+        The cache of the environment variables set by the additional commands. None to always run the commands.
+
+    cache_key : str
+        The key of the environment snapshot of the additional commands.
+
+    prepare_only : bool
+        True to stop after setting the environment variables without starting the app, e.g. to pre-warm the launch.
+
+    launch_log : LaunchLog
+        The log recording the time of each stage of the launches. The shared launch log is used if None,
+        which is imported when the first launch ends, so it does not slow down the start-up.
+
+    started : float
+        The time the job started, for the total time of the launch.
+
+    stage_started : float
+        The time the current stage started.
+    """
+
+    IDLE = "idle"
+    SUBSTITUTING = "substituting"
+    PREPARING = "preparing"
+    STARTING = "starting"
+    LAUNCHED = "launched"
+    PREPARED = "prepared"
+    FAILED = "failed"
+    TIMED_OUT = "timed out"
+    CANCELLED = "cancelled"
+    # The states in which a command is running
+    RUNNING = (SUBSTITUTING, PREPARING)
+
+    state_changed = pyqtSignal(str)
+    stderr_received = pyqtSignal(str)
+    failed = pyqtSignal(str, str)
+    finished = pyqtSignal(bool)
+    timeout: int = 30000
+    launcher: Launcher = None
+    state: str = IDLE
+    commands: str = ""
+    substitution: "Substitution" = None
+    process: QProcess = None
+    reader: EnvReader = None
+    bash_pool: BashPool = bash_pool
+    request: BashRequest = None
+    timer: QTimer = None
+    error: str = ""
+    env_cache: EnvCache = env_cache
+    cache_key: str = None
+    prepare_only: bool = False
+    launch_log: "LaunchLog" = None
+    started: float = 0
+    stage_started: float = 0
+
+    def __init__(self, launcher, parent=None, timeout=None):
+        """Initialise the job. It does not run anything until start is called.
+
+        Parameters
+        ----------
+        launcher: Launcher
+            The launcher with the launch settings of the app.
+
+        parent: QObject
+            The parent object of the job.
+
+        timeout: int
+            The time in milliseconds each command can take. The class default is used if not given.
+        """
+        super(LaunchJob, self).__init__(parent)
+        self.launcher = launcher
+        if timeout is not None:
+            self.timeout = timeout
+        self.state = self.IDLE
+        self.commands = launcher.command
+        self.substitution = None
+        self.process = None
+        self.reader = None
+        self.request = None
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.timed_out)
+        self.error = ""
+        self.cache_key = None
+        self.prepare_only = False
+        self.started = 0
+        self.stage_started = 0
+
+    def is_running(self):
+        """Function for checking if the job has started and not finished yet.
+
+        Returns
+        -------
+        bool
+            True if a command is running or the app is being started.
+        """
+        return self.state in self.RUNNING or self.state == self.STARTING
+
+    def set_state(self, state):
+        """Function for moving to a state and emitting the state_changed signal. The launch is recorded in the launch log when it ends."""
+        self.state = state
+        if state in (self.LAUNCHED, self.FAILED, self.TIMED_OUT, self.CANCELLED):
+            self.log()
+        self.state_changed.emit(state)
+
+    def log(self):
+        """Function for recording the time of each stage of the launch in the launch log, and in the trace if profiling is on.
+        The preparations without starting the app are not recorded."""
+        if self.prepare_only or self.launcher.id is None:
+            return
+        total = time.perf_counter() - self.started
+        launch_log = self.launch_log
+        if launch_log is None:
+            from launchlog import launch_log
+        launch_log.record(self.launcher.id, self.launcher.timings, total, self.state)
+        # The launch runs in the background after Launcher.launch returns, so it is traced as a span of its own.
+        # Profiling is off until the profiler is imported.
+        profiler = getattr(sys.modules.get("profiler"), "profiler", None)
+        if profiler is not None and profiler.mode == "trace":
+            args = {stage: duration * 1000 for stage, duration in self.launcher.timings.items()}
+            args["State"] = self.state
+            profiler.record(f"LaunchJob {self.launcher.name}", self.started, total, args)
+
+    def stage_finished(self, stage):
+        """Function for keeping the time of a stage of the launch, from stage_started until now.
+
+        Parameters
+        ----------
+        stage: str
+            The stage in launchlog.STAGES.
+        """
+        self.launcher.timings[stage] = time.perf_counter() - self.stage_started
+
+    def start(self):
+        """Function for starting the job. The app is started at once if it does not have additional commands or the launcher is prepared."""
+        self.started = time.perf_counter()
+        # A prepared launcher keeps the time of the stages and the environment it is prepared with
+        if not self.launcher.prepared:
+            self.launcher.timings = {}
+            self.launcher.reset_env()
+        if self.launcher.command == "" or self.launcher.prepared:
+            self.start_app()
+        else:
+            self.substitute()
+
+    def run(self, script, finished):
+        """Function for running a bash script in a new process without waiting for it.
+
+        Parameters
+        ----------
+        script: str
+            The script given to bash -c.
+
+        finished: function
+            The function called when the command finishes.
+        """
+        self.error = ""
+        self.process = QProcess(self)
+        # Run the command in the base environment of the launcher, e.g. of the invocation handing the command line to the running instance
+        self.process.setProcessEnvironment(self.launcher.base_env)
+        self.process.finished.connect(finished)
+        self.process.errorOccurred.connect(self.process_error)
+        self.process.readyReadStandardError.connect(self.read_stderr)
+        self.timer.start(self.timeout)
+        self.process.start("bash", ["-c", script])
+
+    def substitute(self):
+        """Function for running the backtick commands at the same time, or the additional commands if there are no backtick commands."""
+        if not find_backticks(self.commands):
+            self.prepare()
+            return
+        self.set_state(self.SUBSTITUTING)
+        self.stage_started = time.perf_counter()
+        self.substitution = Substitution(self.commands, self)
+        self.substitution.stderr_received.connect(self.stderr_received)
+        self.substitution.failed.connect(self.substitution_failed)
+        self.substitution.finished.connect(self.substitution_finished)
+        self.timer.start(self.timeout)
+        self.substitution.start()
+
+    def substitution_finished(self, commands):
+        """Function called when all the backtick commands finish. The additional commands are run with the backtick commands replaced."""
+        self.timer.stop()
+        self.stage_finished("Substitution")
+        self.commands = commands
+        self.prepare()
+
+    def substitution_failed(self):
+        """Function called when a backtick command cannot be run."""
+        if self.state == self.SUBSTITUTING:
+            self.stop_process()
+            self.fail(self.FAILED, "Run Additional Command Failed", "Please check the configuration")
+
+    def prepare(self):
+        """Function for running the additional commands. If the environment they set is in the cache, the app is started with it without running bash."""
+        self.stage_started = time.perf_counter()
+        if self.env_cache is not None:
+            # The key is built from the base environment, which the previous launches do not change
+            env = self.launcher.base_env
+            self.cache_key = self.env_cache.key(self.commands, {name: env.value(name) for name in env.keys()})
+            snapshot = self.env_cache.get(self.cache_key)
+            if snapshot is not None:
+                self.launcher.load_env(snapshot)
+                self.stage_finished("Commands")
+                self.start_app()
+                return
+        self.set_state(self.PREPARING)
+        if self.bash_pool is None:
+            # Read the environment variables while the commands print them
+            self.reader = EnvReader(b"")
+            self.run(bash_script(self.commands), self.commands_finished)
+            self.process.readyReadStandardOutput.connect(lambda: self.reader.feed(self.process.readAllStandardOutput().data()))
+            return
+        # Run the commands on a bash worker which is already running
+        self.error = ""
+        self.request = self.bash_pool.run(self.commands, self.launcher.base_env)
+        self.request.stderr_received.connect(self.append_stderr)
+        self.request.finished.connect(self.request_finished)
+        self.timer.start(self.timeout)
+
+    def commands_finished(self):
+        """Function called when the additional commands finish. The app is started with their environment variables if there is no error."""
+        self.timer.stop()
+        if self.error != "":
+            self.fail(self.FAILED, "Run Additional Command Failed", self.error)
+            return
+        self.reader.feed(self.process.readAllStandardOutput().data())
+        values = self.reader.finish()
+        if values is None:
+            self.fail(self.FAILED, "Run Additional Command Failed", "Please check the configuration")
+            return
+        self.launcher.load_env(values)
+        self.env_ready()
+
+    def request_finished(self):
+        """Function called when the additional commands finish on a bash worker. The app is started with their environment variables if there is no error."""
+        self.timer.stop()
+        if self.error != "":
+            self.fail(self.FAILED, "Run Additional Command Failed", self.error)
+            return
+        if self.request.values is None:
+            self.fail(self.FAILED, "Run Additional Command Failed", "Please check the configuration")
+            return
+        self.launcher.load_env(self.request.values)
+        self.env_ready()
+
+    def env_ready(self):
+        """Function called when the environment variables are set by the additional commands. They are cached and the app is started."""
+        self.stage_finished("Commands")
+        if self.cache_key is not None:
+            env = self.launcher.env
+            self.env_cache.put(self.cache_key, {name: env.value(name) for name in env.keys()})
+        self.start_app()
+
+    def start_app(self):
+        """Function for starting the app detached, or for setting its environment variables only if prepare_only is True."""
+        if self.prepare_only:
+            # A pre-warmed launcher has its environment variables set already, and setting them again would expand them twice
+            if not self.launcher.prepared:
+                self.launcher.set_envs()
+            self.launcher.prepared = True
+            self.set_state(self.PREPARED)
+            self.finished.emit(True)
+            return
+        self.set_state(self.STARTING)
+        if self.launcher.start_app():
+            if self.launcher.id is not None:
+                count_launch(self.launcher.id)
+            self.set_state(self.LAUNCHED)
+            self.finished.emit(True)
+        else:
+            self.fail(self.FAILED, "Launch Failed", "Please check the configuration")
+
+    def read_stderr(self):
+        """Function called when the current command writes to the standard error. The text is kept for the error message and emitted at once."""
+        self.append_stderr(self.process.readAllStandardError().data().decode())
+
+    def append_stderr(self, text):
+        """Function for keeping the text written to the standard error for the error message and emitting it at once."""
+        self.error = self.error + text
+        self.stderr_received.emit(text)
+
+    def process_error(self, error):
+        """Function called when the current command cannot be run."""
+        if error == QProcess.FailedToStart and self.state in self.RUNNING:
+            self.stop_process()
+            self.fail(self.FAILED, "Run Additional Command Failed", "Please check the configuration")
+
+    def timed_out(self):
+        """Function called when the current command takes longer than the timeout. The command is killed."""
+        if self.state in self.RUNNING:
+            self.stop_process()
+            self.fail(self.TIMED_OUT, "Run Additional Command Failed", f"The commands did not finish in {self.timeout / 1000:g} seconds")
+
+    def cancel(self):
+        """Function for cancelling the job. The running command is killed and the app is not started."""
+        if self.state in self.RUNNING:
+            self.stop_process()
+            self.set_state(self.CANCELLED)
+            self.finished.emit(False)
+
+    def stop_process(self):
+        """Function for killing the current commands without calling their finished functions."""
+        self.timer.stop()
+        if self.substitution is not None:
+            self.substitution.stop()
+        if self.request is not None:
+            self.request.cancel()
+            self.request = None
+        if self.process is not None:
+            self.process.finished.disconnect()
+            self.process.errorOccurred.disconnect()
+            self.process.kill()
+            self.process.waitForFinished(1000)
+
+    def fail(self, state, title, message):
+        """Function for ending the job with an error.
+
+        Parameters
+        ----------
+        state: str
+            FAILED or TIMED_OUT.
+
+        title: str
+            The title of the error message.
+
+        message: str
+            The error message.
+        """
+        self.set_state(state)
+        self.failed.emit(title, message)
+        self.finished.emit(False)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+import math
+import time
+
+from PyQt5.QtCore import QObject, QTimer
+from PyQt5.QtSql import QSqlDatabase, QSqlQuery
+
+# The stages of a launch timed separately, in the order they run
+STAGES = ("Substitution", "Commands", "Env", "Exec")
+
+# Statement creating the append-only table of the launches with the time in milliseconds of each stage. A stage which is not run is NULL.
+LAUNCH_LOG_TABLE = """CREATE TABLE IF NOT EXISTS LaunchLog (
+    'LogID' INTEGER PRIMARY KEY AUTOINCREMENT,
+    'AppID' INTEGER NOT NULL,
+    'Started' REAL NOT NULL,
+    'Substitution' REAL,
+    'Commands' REAL,
+    'Env' REAL,
+    'Exec' REAL,
+    'Total' REAL NOT NULL,
+    'State' TEXT NOT NULL
+)"""
+
+
+def percentile(values, fraction):
+    """Function for getting a percentile of the values by the nearest rank.
+
+    Parameters
+    ----------
+    values: list
+        The values.
+
+    fraction: float
+        The percentile as a fraction, e.g. 0.95 for p95.
+
+    Returns
+    -------
+    float
+        The smallest value which is not less than the fraction of the values. None if there are no values.
+    """
+    if not values:
+        return None
+    values = sorted(values)
+    return values[max(0, math.ceil(fraction * len(values)) - 1)]
+
+
+class LaunchLog(QObject):
+    """Class for recording the time of each stage of the launches, so a slow launch can be traced to the backtick commands,
+    the additional commands, the expansion of the environment variables or the start of the app.
+    The launches are kept in memory and written to the LaunchLog table in batches, in one transaction, so a launch does not wait for the database.
+
+    Attributes
+    ----------
+    batch_size : int
+        The number of launches kept before they are written.
+
+    delay : int
+        The time in milliseconds the launches are kept before they are written.
+
+    pending : list
+        The launches not written yet.
+
+    timer : QTimer
+        The timer writing the pending launches.
+
+    table : bool
+        True once the LaunchLog table is created in the database.
+
+    written : int
+        The number of launches written, for checking that they are written in batches.
+    """
+
+    batch_size: int = 20
+    delay: int = 5000
+    pending: list = []
+    timer: QTimer = None
+    table: bool = False
+    written: int = 0
+
+    def __init__(self):
+        """Initialise the log without any pending launches."""
+        super(LaunchLog, self).__init__()
+        self.pending = []
+        self.table = False
+        self.written = 0
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.flush)
+
+    def create_table(self):
+        """Function for adding the LaunchLog table to the database if it does not exist yet."""
+        if not self.table:
+            query = QSqlQuery()
+            if not query.exec(LAUNCH_LOG_TABLE):
+                print("Error ", query.lastError().text())
+            self.table = True
+
+    def record(self, id, timings, total, state):
+        """Function for recording a launch. It is written with the next batch.
+
+        Parameters
+        ----------
+        id: int
+            The App ID saved in the database.
+
+        timings: dict
+            The time in seconds of each stage keyed by the stage in STAGES.
+
+        total: float
+            The time in seconds from the click to the end of the launch.
+
+        state: str
+            The final state of the launch, e.g. "launched" or "failed".
+        """
+        row = [id, time.time()]
+        row.extend(timings[stage] * 1000 if stage in timings else None for stage in STAGES)
+        row.extend([total * 1000, state])
+        self.pending.append(row)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+        elif not self.timer.isActive():
+            self.timer.start(self.delay)
+
+    def flush(self):
+        """Function for writing the pending launches to the database in one transaction, e.g. when the application quits."""
+        self.timer.stop()
+        if not self.pending or not QSqlDatabase.database().isOpen():
+            return
+        self.create_table()
+        columns = ("AppID", "Started") + STAGES + ("Total", "State")
+        database = QSqlDatabase.database()
+        database.transaction()
+        query = QSqlQuery()
+        query.prepare(f"INSERT INTO LaunchLog ({', '.join(columns)}) VALUES ({','.join('?' * len(columns))})")
+        for column in range(len(columns)):
+            query.addBindValue([row[column] for row in self.pending])
+        if not query.execBatch():
+            print("Error ", query.lastError().text())
+            database.rollback()
+            return
+        database.commit()
+        self.written = self.written + len(self.pending)
+        self.pending = []
+
+    def statistics(self):
+        """Function for getting the p50 and p95 of the launch time of each app and each of its stages. The pending launches are written first.
+
+        Returns
+        -------
+        dict
+            The statistics of each app keyed by App ID as a dictionary with the number of launches, the number of failed launches,
+            and the p50 and p95 in milliseconds of the total time and of each stage of the successful launches.
+        """
+        self.flush()
+        self.create_table()
+        query = QSqlQuery()
+        if not query.exec(f"SELECT AppID, {', '.join(STAGES)}, Total, State FROM LaunchLog ORDER BY LogID"):
+            print("Error ", query.lastError().text())
+            return {}
+        launches = {}
+        while query.next():
+            launches.setdefault(query.value(0), []).append([query.value(column) for column in range(1, len(STAGES) + 3)])
+        statistics = {}
+        for id, rows in launches.items():
+            launched = [row for row in rows if row[-1] == "launched"]
+            result = {"Count": len(rows), "Failed": len(rows) - len(launched)}
+            for column, name in enumerate(STAGES + ("Total",)):
+                values = [row[column] for row in launched if row[column] != "" and row[column] is not None]
+                result[name] = (percentile(values, 0.5), percentile(values, 0.95))
+            statistics[id] = result
+        return statistics
+
+
+# The launch log shared by the launches
+launch_log = LaunchLog()
@@ -0,0 +1,282 @@
+#!/usr/bin/env python
+import hashlib
+import json
+import shlex
+
+from PyQt5.QtSql import QSqlQuery
+
+from catalog import app_catalog
+
+# The version of the format of the launch plans. The plans saved with another version are compiled again.
+PLAN_VERSION = 1
+
+# Statement creating the table of the launch plans
+LAUNCH_PLAN_TABLE = """CREATE TABLE IF NOT EXISTS LaunchPlan (
+    'AppID' INTEGER PRIMARY KEY,
+    'Version' INTEGER NOT NULL,
+    'Stamp' TEXT NOT NULL,
+    'Program' TEXT NOT NULL,
+    'Arguments' TEXT NOT NULL,
+    'Env' TEXT NOT NULL
+)"""
+
+
+def plan_stamp(row, envs):
+    """Function for getting the stamp of the inputs of a launch plan, which changes when the app or its environment variables are changed.
+
+    Parameters
+    ----------
+    row: dict
+        The application row.
+
+    envs: list
+        The names and values of the environment variables as tuples in execution order.
+
+    Returns
+    -------
+    str
+        The SHA-1 hash of the path, the arguments, the additional commands and the environment variables.
+    """
+    inputs = json.dumps([row["Path"], row["Argument"], row["Command"], [list(env) for env in envs]])
+    return hashlib.sha1(inputs.encode()).hexdigest()
+
+
+def split_arguments(text):
+    """Function for splitting the arguments in the same way as the shell, so a quoted argument can contain spaces.
+
+    Returns
+    -------
+    list
+        The arguments. They are split at the spaces if the quotes are not closed.
+    """
+    try:
+        return shlex.split(text)
+    except ValueError:
+        return text.split()
+
+
+class LaunchPlan:
+    """Class for the launch plan of an application, which holds everything needed to start it apart from the environment.
+    The variables in the program, the arguments and the environment variables are replaced when the app is launched,
+    as their values depend on the additional commands.
+
+    Attributes
+    ----------
+    id : int
+        The App ID saved in the database.
+
+    version : int
+        The version of the format of the plan.
+
+    stamp : str
+        The stamp of the inputs the plan is compiled from.
+
+    program : str
+        The application file path.
+
+    arguments : list
+        The arguments split in the same way as the shell.
+
+    envs : list
+        The names and values of the environment variables as tuples in execution order.
+    """
+
+    id: int = None
+    version: int = PLAN_VERSION
+    stamp: str = ""
+    program: str = ""
+    arguments: list = []
+    envs: list = []
+
+    def __init__(self, id, version, stamp, program, arguments, envs):
+        """Initialise the plan.
+
+        Parameters
+        ----------
+        id: int
+            The App ID saved in the database.
+
+        version: int
+            The version of the format of the plan.
+
+        stamp: str
+            The stamp of the inputs the plan is compiled from.
+
+        program: str
+            The application file path.
+
+        arguments: list
+            The arguments.
+
+        envs: list
+            The names and values of the environment variables as tuples in execution order.
+        """
+        self.id = id
+        self.version = version
+        self.stamp = stamp
+        self.program = program
+        self.arguments = arguments
+        self.envs = envs
+
+    @staticmethod
+    def build(id, row, envs):
+        """Function for compiling the plan of an application.
+
+        Parameters
+        ----------
+        id: int
+            The App ID saved in the database.
+
+        row: dict
+            The application row.
+
+        envs: list
+            The names and values of the environment variables as tuples in execution order.
+
+        Returns
+        -------
+        LaunchPlan
+            The compiled plan.
+        """
+        return LaunchPlan(id, PLAN_VERSION, plan_stamp(row, envs), row["Path"], split_arguments(row["Argument"]), list(envs))
+
+
+def load_plan(id):
+    """Function for getting the launch plan of an application from the database.
+
+    Returns
+    -------
+    LaunchPlan
+        The saved plan. None if the application does not have a plan.
+    """
+    query = QSqlQuery()
+    query.prepare("SELECT Version, Stamp, Program, Arguments, Env FROM LaunchPlan WHERE AppID = ?")
+    query.bindValue(0, id)
+    if not query.exec():
+        print("Error ", query.lastError().text())
+        return None
+    if not query.next():
+        return None
+    envs = [tuple(env) for env in json.loads(query.value(4))]
+    return LaunchPlan(id, query.value(0), query.value(1), query.value(2), json.loads(query.value(3)), envs)
+
+
+def save_plan(plan):
+    """Function for saving a launch plan in the database. It replaces the previous plan of the application.
+
+    Parameters
+    ----------
+    plan: LaunchPlan
+        The plan to save.
+    """
+    query = QSqlQuery()
+    query.prepare("INSERT OR REPLACE INTO LaunchPlan (AppID, Version, Stamp, Program, Arguments, Env) VALUES (?,?,?,?,?,?)")
+    query.bindValue(0, plan.id)
+    query.bindValue(1, plan.version)
+    query.bindValue(2, plan.stamp)
+    query.bindValue(3, plan.program)
+    query.bindValue(4, json.dumps(plan.arguments))
+    query.bindValue(5, json.dumps(plan.envs))
+    if not query.exec():
+        print("Error ", query.lastError().text())
+
+
+class LaunchPlans:
+    """Class for the launch plans of the applications, which are compiled when an app is saved and kept in memory once used.
+    A plan is dropped from memory when the app is changed, and it is compiled again when it is next used if its inputs are changed.
+
+    Attributes
+    ----------
+    plans : dict
+        The launch plans keyed by App ID.
+
+    compiled : int
+        The number of plans compiled, for checking that a plan is not compiled again.
+
+    table : bool
+        True once the LaunchPlan table is created in the database.
+    """
+
+    plans: dict = {}
+    compiled: int = 0
+    table: bool = False
+
+    def __init__(self):
+        """Initialise without any plans and drop the plan of an app when it is changed in the catalog."""
+        self.plans = {}
+        self.compiled = 0
+        self.table = False
+        app_catalog.app_changed.connect(self.discard)
+        app_catalog.app_removed.connect(self.remove)
+        app_catalog.envs_changed.connect(self.discard)
+
+    def create_table(self):
+        """Function for adding the LaunchPlan table to the database if it does not exist yet."""
+        if not self.table:
+            query = QSqlQuery()
+            if not query.exec(LAUNCH_PLAN_TABLE):
+                print("Error ", query.lastError().text())
+            self.table = True
+
+    def compile(self, id):
+        """Function for compiling the launch plan of an application and saving it in the database, e.g. when the app is saved.
+
+        Parameters
+        ----------
+        id: int
+            The App ID saved in the database.
+
+        Returns
+        -------
+        LaunchPlan
+            The compiled plan. None if the application does not exist.
+        """
+        row = app_catalog.app(id)
+        if row is None:
+            return None
+        self.create_table()
+        plan = LaunchPlan.build(id, row, app_catalog.get_envs(id))
+        save_plan(plan)
+        self.plans[id] = plan
+        self.compiled = self.compiled + 1
+        return plan
+
+    def get(self, id):
+        """Function for getting the launch plan of an application.
+        It is taken from memory, or from the database if its inputs are not changed. Otherwise, it is compiled again.
+
+        Parameters
+        ----------
+        id: int
+            The App ID saved in the database.
+
+        Returns
+        -------
+        LaunchPlan
+            The plan. None if the application does not exist.
+        """
+        if id in self.plans:
+            return self.plans[id]
+        row = app_catalog.app(id)
+        if row is None:
+            return None
+        self.create_table()
+        plan = load_plan(id)
+        if plan is None or plan.version != PLAN_VERSION or plan.stamp != plan_stamp(row, app_catalog.get_envs(id)):
+            return self.compile(id)
+        self.plans[id] = plan
+        return plan
+
+    def discard(self, id):
+        """Function for dropping the plan of an application from memory, so it is checked against its inputs when it is next used."""
+        self.plans.pop(id, None)
+
+    def remove(self, id):
+        """Function for removing the plan of an application after the application is removed."""
+        self.plans.pop(id, None)
+        self.create_table()
+        QSqlQuery(f"DELETE FROM LaunchPlan WHERE AppID = {int(id)}")
+
+
+# The launch plans shared by the app widgets, the grid view and the app dialog
+launch_plans = LaunchPlans()
@@ -1,12 +1,19 @@
 #!/usr/bin/env python
+import os
 import sys
 
-from PyQt5 import uic
+from PyQt5.QtCore import QTimer
 from PyQt5.QtSql import QSqlDatabase, QSqlQuery
-from PyQt5.QtWidgets import QApplication, QMainWindow
+from PyQt5.QtWidgets import QApplication, QMainWindow, QMessageBox
 
+from appgrid import AppGridView, AppListModel
 from appwidget import AppWidget
-from editdialog import EditDialog
+from bashpool import bash_pool
+from catalog import app_catalog
+from iconcache import icon_cache, icon_loader
+from launcher import Launcher
+from profiling import profiled
+from uicache import load_ui
 
 
 class MainWindow(QMainWindow):
@@ -20,77 +27,449 @@ class MainWindow(QMainWindow):
 
     con : QSqlDatabase
         The database storing all the application configurations.
+
+    grid : bool
+        True to display the applications in the grid view instead of creating an app widget for each application.
+
+    widgets : dict
+        The app widgets keyed by App ID. They are kept while hidden by the search, so they are never created twice.
+
+    search_delay : int
+        The time in milliseconds to wait after the last keystroke in the search box before filtering the apps.
+
+    jobs : dict
+        The launches running the additional commands in the grid view keyed by App ID.
+
+    batch : BatchLaunch
+        The launch of the selected apps. None if the selected apps have not been launched.
+
+    results : list
+        The results of the last launch of the selected apps.
     """
 
     col: int = 0
     con = QSqlDatabase.addDatabase("QSQLITE")
+    grid: bool = False
+    widgets: dict = {}
+    search_delay: int = 150
+    jobs: dict = {}
+    batch: "BatchLaunch" = None
+    results: list = []
+
+    def __init__(self, grid=False, prewarm=False, database="AppDatabase.db"):
+        """Load UI, connect to the database and add the existing app widgets.
+
+        Parameters
+        ----------
+        grid: bool
+            True to display the applications in the grid view, which only paints the tiles in the viewport.
 
-    def __init__(self):
-        """Load UI, connect to the database and add the existing app widgets."""
+        prewarm: bool
+            True to prepare the launches of the most launched apps and of the app under the mouse in the background.
+
+        database: str
+            The database file, e.g. a generated catalog for the scale benchmark.
+        """
         super(MainWindow, self).__init__()
+        self.grid = grid
+        self.widgets = {}
+        self.jobs = {}
+        self.batch = None
+        self.results = []
         # Load UI
-        uic.loadUi("ui/main.ui", self)
+        load_ui("ui/main.ui", self)
+        # Replace the scroll area with the grid view in grid mode
+        if self.grid:
+            self.model = AppListModel(self)
+            self.grid_view = AppGridView()
+            self.grid_view.setModel(self.model)
+            self.scrollArea.hide()
+            self.verticalLayout.addWidget(self.grid_view)
+            delegate = self.grid_view.itemDelegate()
+            delegate.launch_requested.connect(self.launch)
+            delegate.edit_requested.connect(self.edit)
+            delegate.remove_requested.connect(self.remove)
+            self.grid_view.launch_hovered.connect(self.warm)
+            self.model.selection_changed.connect(self.selection_changed)
+        # Filter the apps once the user stops typing. Each keystroke restarts the timer, which cancels the superseded search.
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.search_delay)
+        self.search_timer.timeout.connect(self.add_widgets)
         # Maximize the main window
         self.showMaximized()
         # Calculate the number of columns of the grid layout for responsive layout
         self.col = int((self.size().width() - 36) / 238)
         # Initalise the database connection.
-        self.con.setDatabaseName("AppDatabase.db")
+        self.con.setDatabaseName(database)
         self.con.open()
         # Connect signals to corresponding functions
         self.add_new_btn.clicked.connect(self.new)
-        self.search.textChanged.connect(self.add_widgets)
-        # Add widgets
-        self.add_widgets()
+        self.launch_selected_btn.clicked.connect(self.launch_selected)
+        self.launch_times_btn.clicked.connect(self.launch_times)
+        self.search.textChanged.connect(self.search_changed)
+        self.search.returnPressed.connect(self.search_now)
+        # The profiled add_widgets takes any arguments, so the checked state is not passed to it
+        self.fuzzy.toggled.connect(lambda checked: self.add_widgets())
+        # Decode the icons of the app widgets scrolled into the view first
+        self.scrollArea.verticalScrollBar().valueChanged.connect(self.promote_visible_icons)
+        # Update the widgets when the applications in the catalog are changed
+        app_catalog.changed.connect(self.reload_widgets)
+        app_catalog.app_changed.connect(self.update_widget)
+        app_catalog.app_removed.connect(self.remove_widget)
+        # Load the applications into the catalog once, which adds the widgets
+        app_catalog.load()
+        # Start the bash workers running the additional commands after the first paint
+        QTimer.singleShot(0, bash_pool.start)
+        # Prepare the launches of the most launched apps after the first paint. The pre-warmer is only imported at start-up if it is turned on.
+        if prewarm or os.environ.get("APPLAUNCHER_PREWARM", "0") == "1":
+            from prewarm import prewarmer
 
+            prewarmer.enabled = True
+            QTimer.singleShot(0, prewarmer.warm_most_launched)
+
+    @profiled
     def add_widgets(self):
-        """Function for getting data from database and adding app widgets to the main window."""
-        # Remove all widgets
+        """Function for getting data from the catalog and laying out the app widgets matching the search in the main window.
+        The existing app widgets are shown, hidden or moved, and an app widget is only created for an app without one."""
+        # A pending search is done now, so cancel it
+        self.search_timer.stop()
+        # In grid mode, only replace the rows of the model
+        if self.grid:
+            self.model.set_apps(app_catalog.search(self.search.text(), self.fuzzy.isChecked()))
+            return
+        # Take all the widgets out of the grid layout without deleting them
         while self.frame_layout.count():
-            self.frame_layout.takeAt(0).widget().deleteLater()
-        # If there is no input in the search box, get all apps
-        if self.search.text() == "":
-            query = QSqlQuery("SELECT AppID FROM App ORDER BY Name ASC")
-        # Otherwise, get apps whose name matches with the input in the search box
-        else :
-            query = QSqlQuery(f"SELECT AppID FROM App WHERE Name LIKE '%{self.search.text()}%' ORDER BY Name ASC")
+            self.frame_layout.takeAt(0)
+        # Get the apps matching with the input in the search box, or all apps if there is no input, from the catalog
+        apps = app_catalog.search(self.search.text(), self.fuzzy.isChecked())
         # Add the app widgets
         row = 0
         column = 0
-        while query.next():
-            app = AppWidget(query.value(0))
+        shown = set()
+        for data in apps:
+            app = self.widgets.get(data["AppID"])
+            if app is None:
+                app = AppWidget(data["AppID"], data)
+                app.selection_changed.connect(self.selection_changed)
+                self.widgets[data["AppID"]] = app
             self.frame_layout.addWidget(app, row, column)
-            # Connect the removed signal, which the app widget emits when removed, to add_widgets function to remove the widget from the window
-            app.removed.connect(self.add_widgets)
+            app.show()
+            shown.add(data["AppID"])
             column = column + 1
             if column >= self.col:
                 column = 0
                 row = row + 1
+        # Hide the app widgets which do not match the search
+        for id, app in self.widgets.items():
+            if id not in shown:
+                app.hide()
+        # Check which app widgets are visible once the layout is updated
+        QTimer.singleShot(0, self.promote_visible_icons)
+
+    def promote_visible_icons(self):
+        """Function for decoding the icons of the app widgets visible in the scroll area before the icons of the other widgets."""
+        if not icon_loader.pending:
+            return
+        for id, app in self.widgets.items():
+            if app.waiting and not app.visibleRegion().isEmpty():
+                icon_loader.promote(id)
+
+    def search_changed(self, text):
+        """Function for the search box. It restarts the search timer, so the apps are filtered once after the user stops typing.
+
+        Parameters
+        ----------
+        text: str
+            The text in the search box.
+        """
+        self.search_timer.start()
+
+    def search_now(self):
+        """Function for the return key in the search box. It filters the apps without waiting for the search timer."""
+        if self.search_timer.isActive():
+            self.add_widgets()
+
+    def reload_widgets(self):
+        """Function for recreating all the app widgets when the whole catalog is reloaded."""
+        for app in self.widgets.values():
+            app.deleteLater()
+        self.widgets = {}
+        self.add_widgets()
+
+    def update_widget(self, id):
+        """Function for updating the app widget of an application added or updated in the catalog.
+
+        Parameters
+        ----------
+        id: int
+            The App ID of the changed application.
+        """
+        # Remove the previous icon, which is keyed by the previous PNG data
+        icon_cache.discard(id)
+        if id in self.widgets:
+            self.widgets[id].get_data(app_catalog.app(id))
+        self.add_widgets()
+
+    def remove_widget(self, id):
+        """Function for deleting the app widget of an application removed from the catalog.
+
+        Parameters
+        ----------
+        id: int
+            The App ID of the removed application.
+        """
+        icon_cache.discard(id)
+        if id in self.widgets:
+            self.widgets.pop(id).deleteLater()
+        if self.grid:
+            self.model.selected.discard(id)
+        self.selection_changed()
+        self.add_widgets()
 
     def new(self):
         """This function opens an Add New Dialog.
-        It updates the app widgets displaying on the main window when a new application is added.
+        The app widgets displaying on the main window are updated by the catalog when a new application is added.
         Otherwise, it removes the temporary saved environment variables."""
+        # The dialogs are imported when first used, so they do not slow down the start-up
+        from editdialog import EditDialog
+
         self.editdialog = EditDialog()
-        # Call add_widgets function to add the newly added app when it was saved
-        if self.editdialog.exec():
-            self.add_widgets()
-        # Otherwise, remove the temporary saved environment variables
-        else:
+        # Remove the temporary saved environment variables if the dialog was not saved
+        if not self.editdialog.exec():
             QSqlQuery("DELETE FROM Env WHERE AppID = -1 OR AppID = -2")
 
+    def launch(self, id):
+        """Function for the launch area of a tile in the grid view. It launches the app without creating an app widget.
+        The busy indicator is displayed on the tile while the additional commands are running, and clicking the tile again cancels them.
+
+        Parameters
+        ----------
+        id: int
+            The App ID saved in the database.
+        """
+        # Cancel the launch if the additional commands are still running
+        if id in self.jobs:
+            self.jobs[id].cancel()
+            return
+        launcher = Launcher(id, self)
+        # Use the pre-warmed environment if the launch is prepared
+        from prewarm import prewarmer
+
+        prewarmer.apply(launcher)
+        job = launcher.launch()
+        if job.is_running():
+            self.jobs[id] = job
+            self.model.set_busy(id, True)
+            job.stderr_received.connect(lambda text: self.statusbar.showMessage(f"{launcher.name}: {text.strip()}"))
+            job.finished.connect(lambda launched: self.launch_finished(id))
+
+    def launch_finished(self, id):
+        """Function called when a launch in the grid view finishes. It hides the busy indicator on the tile.
+
+        Parameters
+        ----------
+        id: int
+            The App ID saved in the database.
+        """
+        self.jobs.pop(id, None)
+        self.model.set_busy(id, False)
+        self.statusbar.clearMessage()
+
+    def warm(self, id):
+        """Function called when the mouse moves over the launch area of a tile in the grid view. It pre-warms the launch of the app.
+
+        Parameters
+        ----------
+        id: int
+            The App ID saved in the database.
+        """
+        # The pre-warmer is imported when first used, so it does not slow down the start-up
+        from prewarm import prewarmer
+
+        prewarmer.warm(id)
+
+    def selected_ids(self):
+        """Function for getting the applications selected with Ctrl+click, including the ones hidden by the search.
+
+        Returns
+        -------
+        list
+            The App IDs of the selected applications.
+        """
+        if self.grid:
+            return sorted(self.model.selected)
+        return [id for id, app in self.widgets.items() if app.selected]
+
+    def selection_changed(self):
+        """Function called when an application is selected or unselected. The Launch Selected button is enabled if an application is selected."""
+        count = len(self.selected_ids())
+        self.launch_selected_btn.setEnabled(count > 0 or self.batch is not None)
+        self.launch_selected_btn.setText(f"Launch Selected ({count})" if count > 0 else "Launch Selected")
+
+    def set_busy(self, id, busy):
+        """Function for showing or hiding the busy indicator of an application in the app widget or the grid view.
+
+        Parameters
+        ----------
+        id: int
+            The App ID saved in the database.
+
+        busy: bool
+            True while the application is being launched.
+        """
+        if self.grid:
+            self.model.set_busy(id, busy)
+        elif id in self.widgets:
+            self.widgets[id].busy_bar.setVisible(busy)
+
+    def launch_selected(self):
+        """Function for the Launch Selected button. The selected apps are prepared at the same time and started together,
+        and a summary with the preparation time and the failures of each app is displayed. Clicking the button again cancels the apps not prepared yet."""
+        if self.batch is not None:
+            self.batch.cancel()
+            return
+        ids = self.selected_ids()
+        if not ids:
+            return
+        # The batch launch is imported when first used, so it does not slow down the start-up
+        from batchlaunch import BatchLaunch
+
+        self.batch = BatchLaunch(ids, self)
+        self.batch.app_started.connect(lambda id: self.set_busy(id, True))
+        self.batch.app_finished.connect(lambda id: self.set_busy(id, False))
+        self.batch.finished.connect(self.batch_finished)
+        self.launch_selected_btn.setText("Cancel")
+        self.statusbar.showMessage(f"Preparing {len(ids)} apps")
+        self.batch.start()
+
+    def batch_finished(self, results):
+        """Function called when the selected apps are launched. The selection is cleared and the summary is displayed.
+
+        Parameters
+        ----------
+        results: list
+            The result of each app given by BatchLaunch.
+        """
+        from batchlaunch import summary
+
+        self.batch.deleteLater()
+        self.batch = None
+        self.results = results
+        for id in [result["AppID"] for result in results]:
+            if self.grid:
+                self.model.set_selected(id, False)
+            elif id in self.widgets:
+                self.widgets[id].set_selected(False)
+        self.selection_changed()
+        self.statusbar.clearMessage()
+        if all(result["Launched"] for result in results):
+            QMessageBox.information(self, "Launch Selected", summary(results))
+        else:
+            QMessageBox.warning(self, "Launch Selected", summary(results))
+
+    def launch_times(self):
+        """Function for the Launch Times button. It displays the p50 and p95 launch time of each app and of each stage of its launches."""
+        # The dialog is imported when first used, so it does not slow down the start-up
+        from timesdialog import LaunchTimesDialog
+
+        self.timesdialog = LaunchTimesDialog()
+        self.timesdialog.exec()
+
+    def edit(self, id):
+        """Function for the edit button of a tile in the grid view. It displays an Edit Dialog with exisitng data.
+        The tiles are updated by the catalog if editted. Otherwise, remove the newly added environment variables and get the previously saved ones.
+
+        Parameters
+        ----------
+        id: int
+            The App ID saved in the database.
+        """
+        from editdialog import EditDialog
+
+        self.editdialog = EditDialog(id)
+        if not self.editdialog.exec():
+            QSqlQuery("DELETE FROM Env WHERE AppID = -1")
+            QSqlQuery(f"UPDATE Env Set AppID = {id} WHERE AppID = -2")
+
+    def remove(self, id):
+        """Function for the remove button of a tile in the grid view. It displays a message box to confirm the action.
+        Remove the data from the database and the catalog if confirmed.
+
+        Parameters
+        ----------
+        id: int
+            The App ID saved in the database.
+        """
+        name = app_catalog.app(id)["Name"]
+        msg = QMessageBox.question(
+            self,
+            "Remove App",
+            f"Are you sure you want to remove {name} ?",
+        )
+        if msg == QMessageBox.Yes:
+            QSqlQuery(f"DELETE FROM App WHERE AppID = {id}")
+            QSqlQuery(f"DELETE FROM Env WHERE AppID = {id}")
+            app_catalog.remove_app(id)
+
+    def raise_window(self):
+        """Function for displaying the window in front of the other windows, e.g. when the App Launcher is opened again while it is running."""
+        self.showMaximized()
+        self.raise_()
+        self.activateWindow()
+
     def resizeEvent(self, event):
         """Override function to change the number of columns for the grid layout depending on the window width."""
         # Calculate the number of columns of the grid layout and check if it's changed.
         # It also changes if the database is connected to avoid calling add_widgets function before the connection is initialised.
-        if int((self.size().width() - 36) / 238) != self.col and self.con.isOpen():
+        # The grid view lays out the tiles by itself, so the tiles do not need to be added again in grid mode.
+        if not self.grid and int((self.size().width() - 36) / 238) != self.col and self.con.isOpen():
             self.col = int((self.size().width() - 36) / 238)
             self.add_widgets()
         QMainWindow.resizeEvent(self, event)
 
 
+def save_session():
+    """Function for writing the launches kept in memory and the profile of the session when the App Launcher quits.
+    The launch log and the profiler are imported here if no launch or profiling has imported them."""
+    from launchlog import launch_log
+    from profiler import profiler
+
+    launch_log.flush()
+    profiler.save()
+
+
 if __name__ == "__main__":
+    # The single instance is only needed by the start-up script, so importing the main window does not import QtNetwork
+    from instance import InstanceServer, send_request
+
     app = QApplication([])
-    window = MainWindow()
-    window.show()
+    # Hand over to the running instance, which raises its window, or stops if --quit is given
+    if "--quit" in sys.argv:
+        sys.exit(0 if send_request({"command": "quit"}, 1000) is not None else 1)
+    if "--new-instance" not in sys.argv and send_request({"command": "show"}, 1000) is not None:
+        sys.exit(0)
+    # Profile the session with --profile, or with --pstats for cProfile. The profiler is only imported if profiling is turned on.
+    if "--pstats" in sys.argv or "--profile" in sys.argv or os.environ.get("APPLAUNCHER_PROFILE"):
+        from profiler import profiler
+
+        if "--pstats" in sys.argv:
+            profiler.start("pstats")
+        elif "--profile" in sys.argv:
+            profiler.start("trace")
+    window = MainWindow(grid="--grid" in sys.argv, prewarm="--prewarm" in sys.argv)
+    # Keep the catalog and the caches loaded for the later invocations
+    server = InstanceServer(os.path.abspath(window.con.databaseName()), window)
+    server.show_requested.connect(window.raise_window)
+    server.quit_requested.connect(app.quit)
+    server.listen()
+    app.aboutToQuit.connect(server.close)
+    app.aboutToQuit.connect(bash_pool.close)
+    app.aboutToQuit.connect(save_session)
+    # In daemon mode, the window is hidden and closing it does not quit, so the next invocation starts warm
+    if "--daemon" in sys.argv:
+        app.setQuitOnLastWindowClosed(False)
+        window.hide()
+    else:
+        window.show()
     sys.exit(app.exec())
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+import os
+import time
+
+from PyQt5.QtCore import QObject
+
+from catalog import app_catalog, most_launched
+from launcher import LaunchJob, Launcher
+
+
+class Prewarmer(QObject):
+    """Class for preparing the launches in the background before the launch button is clicked.
+    The additional commands are run and the environment variables are set when the mouse moves over a launch button,
+    or at start-up for the most launched apps. The prepared launcher is kept for a short time, so the launch only starts the app.
+    It is opt-in, as the additional commands are run for apps which may not be launched.
+
+    Attributes
+    ----------
+    enabled : bool
+        True to pre-warm the launches. It is set by the APPLAUNCHER_PREWARM environment variable or the --prewarm option of the main window.
+
+    hold : float
+        The time in seconds a prepared launcher is kept.
+
+    top : int
+        The number of the most launched apps pre-warmed at start-up.
+
+    jobs : dict
+        The jobs preparing the launches keyed by App ID.
+
+    ready : dict
+        The time of preparation and the prepared launcher keyed by App ID.
+    """
+
+    enabled: bool = os.environ.get("APPLAUNCHER_PREWARM", "0") == "1"
+    hold: float = 60
+    top: int = 5
+    jobs: dict = {}
+    ready: dict = {}
+
+    def __init__(self):
+        """Initialise the pre-warmer without any prepared launchers. They are dropped when the app is changed."""
+        super(Prewarmer, self).__init__()
+        self.jobs = {}
+        self.ready = {}
+        app_catalog.app_changed.connect(self.discard)
+        app_catalog.app_removed.connect(self.discard)
+        app_catalog.envs_changed.connect(self.discard)
+
+    def warm(self, id):
+        """Function for preparing the launch of an app in the background if it is not prepared or being prepared already.
+
+        Parameters
+        ----------
+        id: int
+            The App ID saved in the database.
+        """
+        if not self.enabled or id in self.jobs or self.is_ready(id):
+            return
+        job = LaunchJob(Launcher(id), self)
+        job.prepare_only = True
+        job.finished.connect(lambda prepared: self.warmed(id, prepared))
+        self.jobs[id] = job
+        job.start()
+
+    def warm_most_launched(self):
+        """Function for preparing the launches of the most launched apps, e.g. at start-up."""
+        if not self.enabled:
+            return
+        for id in most_launched(self.top):
+            self.warm(id)
+
+    def warmed(self, id, prepared):
+        """Function called when a launch is prepared. The launcher is kept if the additional commands did not fail.
+
+        Parameters
+        ----------
+        id: int
+            The App ID saved in the database.
+
+        prepared: bool
+            True if the launcher is prepared.
+        """
+        job = self.jobs.pop(id, None)
+        if job is None:
+            return
+        if prepared:
+            self.ready[id] = (time.monotonic(), job.launcher)
+        job.deleteLater()
+
+    def is_ready(self, id):
+        """Function for checking if the launch of an app is prepared and not expired.
+
+        Returns
+        -------
+        bool
+            True if the app has a prepared launcher.
+        """
+        if id in self.ready and time.monotonic() - self.ready[id][0] > self.hold:
+            del self.ready[id]
+        return id in self.ready
+
+    def apply(self, launcher):
+        """Function for giving the prepared environment to a launcher, so it starts the app without running the additional commands.
+        The prepared launcher is used once.
+
+        Parameters
+        ----------
+        launcher: Launcher
+            The launcher about to launch the app.
+
+        Returns
+        -------
+        bool
+            True if the launcher is prepared.
+        """
+        if not self.is_ready(launcher.id):
+            return False
+        prepared = self.ready.pop(launcher.id)[1]
+        launcher.env = prepared.env
+        launcher.env_version = prepared.env_version
+        launcher.prepared = True
+        return True
+
+    def discard(self, id):
+        """Function for dropping the prepared launcher of an app, e.g. after the app is changed.
+
+        Parameters
+        ----------
+        id: int
+            The App ID saved in the database.
+        """
+        self.ready.pop(id, None)
+        job = self.jobs.pop(id, None)
+        if job is not None:
+            job.cancel()
+            job.deleteLater()
+
+
+# The pre-warmer shared by the app widgets and the grid view
+prewarmer = Prewarmer()
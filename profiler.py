@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+import atexit
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# The decorator is kept in its own module, so the modules using it do not import the profiler
+from profiling import profiled
+
+# The directory of the profiles, next to the environment snapshots
+PROFILE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "applauncher", "profiles")
+
+# The profiling modes: "trace" records the spans of the profiled functions as Chrome trace JSON, "pstats" runs cProfile while they run
+MODES = ("trace", "pstats")
+
+
+def profile_mode(value):
+    """Function for getting the profiling mode from the value of APPLAUNCHER_PROFILE or the --profile option.
+
+    Parameters
+    ----------
+    value: str
+        The value. "pstats" for cProfile, "0" or empty to turn profiling off and anything else for the trace.
+
+    Returns
+    -------
+    str
+        The mode in MODES. None if profiling is off.
+    """
+    if value is None or value in ("", "0"):
+        return None
+    return value if value in MODES else "trace"
+
+
+class Profiler:
+    """Class for the opt-in profiling of a session, so a report that the launcher is slow can come with a trace instead of a guess.
+    The profiled functions record their spans in memory, and the trace or the statistics are written to a file when the session ends.
+    Nothing is recorded while profiling is off.
+
+    Attributes
+    ----------
+    mode : str
+        The profiling mode in MODES. None if profiling is off.
+
+    directory : str
+        The directory the profile of the session is written to.
+
+    events : list
+        The Chrome trace events recorded in trace mode.
+
+    profile : cProfile.Profile
+        The profile recorded in pstats mode.
+
+    depth : int
+        The number of profiled functions running, so cProfile is only started by the outermost one.
+
+    path : str
+        The file the profile is written to. Empty until it is written.
+    """
+
+    mode: str = None
+    directory: str = PROFILE_DIR
+    events: list = []
+    profile: cProfile.Profile = None
+    depth: int = 0
+    path: str = ""
+
+    def __init__(self, mode=None, directory=PROFILE_DIR):
+        """Initialise the profiler.
+
+        Parameters
+        ----------
+        mode: str
+            The profiling mode in MODES. None to turn profiling off until start is called.
+
+        directory: str
+            The directory the profile of the session is written to.
+        """
+        self.directory = directory
+        self.events = []
+        self.profile = None
+        self.depth = 0
+        self.path = ""
+        self.mode = None
+        if mode is not None:
+            self.start(mode)
+
+    def start(self, mode="trace"):
+        """Function for turning profiling on. The profile is written when the process exits if save is not called before.
+
+        Parameters
+        ----------
+        mode: str
+            The profiling mode in MODES.
+        """
+        if self.mode is None:
+            atexit.register(self.save)
+        self.mode = mode
+        if mode == "pstats" and self.profile is None:
+            self.profile = cProfile.Profile()
+
+    @contextmanager
+    def span(self, name):
+        """Function for profiling a block of code.
+
+        Parameters
+        ----------
+        name: str
+            The name of the span, e.g. the qualified name of the function.
+        """
+        if self.mode is None:
+            yield
+            return
+        if self.mode == "pstats":
+            self.depth = self.depth + 1
+            if self.depth == 1:
+                self.profile.enable()
+            try:
+                yield
+            finally:
+                self.depth = self.depth - 1
+                if self.depth == 0:
+                    self.profile.disable()
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter() - start)
+
+    def record(self, name, start, duration, args=None):
+        """Function for recording a span which is already finished, e.g. a launch running in the background, in trace mode.
+
+        Parameters
+        ----------
+        name: str
+            The name of the span.
+
+        start: float
+            The time.perf_counter value at the start of the span.
+
+        duration: float
+            The duration in seconds.
+
+        args: dict
+            The details displayed with the span.
+        """
+        if self.mode != "trace":
+            return
+        event = {"name": name, "ph": "X", "ts": start * 1e6, "dur": duration * 1e6, "pid": os.getpid(), "tid": threading.get_ident()}
+        if args is not None:
+            event["args"] = args
+        self.events.append(event)
+
+    def save(self):
+        """Function for writing the profile of the session, e.g. when the application quits. The file is printed to stderr.
+
+        Returns
+        -------
+        str
+            The file written. Empty if profiling is off.
+        """
+        if self.mode is None:
+            return ""
+        os.makedirs(self.directory, exist_ok=True)
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        if self.mode == "pstats":
+            self.path = os.path.join(self.directory, name + ".pstats")
+            self.profile.dump_stats(self.path)
+        else:
+            self.path = os.path.join(self.directory, name + ".json")
+            with open(self.path, "w") as file:
+                json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, file)
+        # The profile is written once per session
+        atexit.unregister(self.save)
+        print(f"Profile written to {self.path}", file=sys.stderr)
+        return self.path
+
+
+# The profiler of the session, turned on by the APPLAUNCHER_PROFILE environment variable or the --profile option
+profiler = Profiler(profile_mode(os.environ.get("APPLAUNCHER_PROFILE")))
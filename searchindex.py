@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+import re
+
+
+def normalise(text):
+    """Function for normalising a text for fuzzy matching. It lowercases the text and keeps only letters and digits.
+
+    Returns
+    -------
+    list
+        The words in the text.
+    """
+    return re.findall(r"[^\W_]+", (text or "").lower())
+
+
+def trigrams(text):
+    """Function for splitting a text into trigrams. Each word is padded, so the beginning and the end of the words are matched as well.
+
+    Returns
+    -------
+    set
+        The trigrams of the words in the text.
+    """
+    grams = set()
+    for word in normalise(text):
+        word = f"  {word} "
+        for i in range(len(word) - 2):
+            grams.add(word[i : i + 3])
+    return grams
+
+
+def is_subsequence(query, text):
+    """Function for checking if all the characters in the query appear in the text in the same order, e.g. "gafr" in "gaffer".
+
+    Returns
+    -------
+    bool
+        True if the query is a subsequence of the text.
+    """
+    chars = iter(text)
+    return all(char in chars for char in query)
+
+
+class TrigramIndex:
+    """Class for the inverted trigram index used for fuzzy search over the app names and descriptions.
+    Apps are added, updated and removed one at a time, so the index never has to be rebuilt while typing.
+
+    Attributes
+    ----------
+    postings : dict
+        The App IDs containing each trigram, keyed by trigram.
+
+    name_grams : dict
+        The trigrams of the app names keyed by App ID.
+
+    description_grams : dict
+        The trigrams of the app descriptions keyed by App ID.
+
+    names : dict
+        The normalised app names without spaces keyed by App ID, used to match abbreviations.
+
+    threshold : float
+        The minimum ratio of the trigrams of the search text found in an app for the app to match.
+    """
+
+    postings: dict = {}
+    name_grams: dict = {}
+    description_grams: dict = {}
+    names: dict = {}
+    threshold: float = 0.3
+
+    def __init__(self):
+        """Initialise an empty index."""
+        self.postings = {}
+        self.name_grams = {}
+        self.description_grams = {}
+        self.names = {}
+
+    def __len__(self):
+        """Return the number of apps in the index."""
+        return len(self.names)
+
+    def add(self, id, name, description=""):
+        """Function for adding an app to the index. The app is replaced if it is already in the index.
+
+        Parameters
+        ----------
+        id: int
+            The App ID saved in the database.
+
+        name: str
+            The app name.
+
+        description: str
+            The app description.
+        """
+        if id in self.names:
+            self.remove(id)
+        self.name_grams[id] = trigrams(name)
+        self.description_grams[id] = trigrams(description)
+        self.names[id] = "".join(normalise(name))
+        for gram in self.name_grams[id] | self.description_grams[id]:
+            self.postings.setdefault(gram, set()).add(id)
+
+    def remove(self, id):
+        """Function for removing an app from the index.
+
+        Parameters
+        ----------
+        id: int
+            The App ID saved in the database.
+        """
+        if id not in self.names:
+            return
+        for gram in self.name_grams.pop(id) | self.description_grams.pop(id):
+            ids = self.postings[gram]
+            ids.discard(id)
+            if not ids:
+                del self.postings[gram]
+        del self.names[id]
+
+    def search(self, text):
+        """Function for finding the apps matching the text approximately.
+        Only the apps sharing a trigram with the text are scored. Matches in the name score higher than matches in the description,
+        and abbreviations of the name such as "hou19" for "Houdini 19" get an extra score.
+
+        Parameters
+        ----------
+        text: str
+            The text in the search box.
+
+        Returns
+        -------
+        list
+            The App IDs and their scores as tuples, ordered by score.
+        """
+        grams = trigrams(text)
+        if not grams:
+            return []
+        query = "".join(normalise(text))
+        candidates = set()
+        for gram in grams:
+            candidates |= self.postings.get(gram, set())
+        results = []
+        for id in candidates:
+            name = len(grams & self.name_grams[id]) / len(grams)
+            description = len(grams & self.description_grams[id]) / len(grams)
+            abbreviation = is_subsequence(query, self.names[id])
+            if name < self.threshold and description < self.threshold and not abbreviation:
+                continue
+            score = 2 * name + description
+            if abbreviation:
+                score = score + 1
+                if self.names[id].startswith(query):
+                    score = score + 1
+            results.append((id, score))
+        results.sort(key=lambda result: -result[1])
+        return results
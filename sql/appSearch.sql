@@ -0,0 +1,26 @@
+BEGIN TRANSACTION;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS AppSearch USING fts5(
+    Name, Description, Command, Argument, content='App', content_rowid='AppID', prefix='2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS AppSearch_insert AFTER INSERT ON App BEGIN
+    INSERT INTO AppSearch (rowid, Name, Description, Command, Argument)
+    VALUES (new.AppID, new.Name, new.Description, new.Command, new.Argument);
+END;
+
+CREATE TRIGGER IF NOT EXISTS AppSearch_delete AFTER DELETE ON App BEGIN
+    INSERT INTO AppSearch (AppSearch, rowid, Name, Description, Command, Argument)
+    VALUES ('delete', old.AppID, old.Name, old.Description, old.Command, old.Argument);
+END;
+
+CREATE TRIGGER IF NOT EXISTS AppSearch_update AFTER UPDATE ON App BEGIN
+    INSERT INTO AppSearch (AppSearch, rowid, Name, Description, Command, Argument)
+    VALUES ('delete', old.AppID, old.Name, old.Description, old.Command, old.Argument);
+    INSERT INTO AppSearch (rowid, Name, Description, Command, Argument)
+    VALUES (new.AppID, new.Name, new.Description, new.Command, new.Argument);
+END;
+
+INSERT INTO AppSearch (AppSearch) VALUES ('rebuild');
+
+COMMIT;
@@ -2,6 +2,14 @@ BEGIN TRANSACTION;
 
 DROP TABLE IF EXISTS App_old;
 DROP TABLE IF EXISTS Env_old;
+DROP TRIGGER IF EXISTS AppSearch_insert;
+DROP TRIGGER IF EXISTS AppSearch_delete;
+DROP TRIGGER IF EXISTS AppSearch_update;
+DROP TABLE IF EXISTS AppSearch;
+DROP TABLE IF EXISTS Icon;
+DROP TABLE IF EXISTS LaunchCount;
+DROP TABLE IF EXISTS LaunchPlan;
+DROP TABLE IF EXISTS LaunchLog;
 
 ALTER TABLE App RENAME TO App_old;
 ALTER TABLE Env RENAME TO Env_old;
@@ -10,10 +18,41 @@ CREATE TABLE 'App' (
     'Name' TEXT NOT NULL,
     'Path' TEXT NOT NULL,
     'Description' TEXT,
-    'Icon' BLOB,
     'Command' TEXT,
     'Argument' TEXT,
-    'AppID' INTEGER PRIMARY KEY AUTOINCREMENT
+    'AppID' INTEGER PRIMARY KEY AUTOINCREMENT,
+    'IconHash' TEXT
+);
+
+CREATE TABLE 'Icon' (
+    'Hash' TEXT PRIMARY KEY,
+    'Data' BLOB NOT NULL
+);
+
+CREATE TABLE 'LaunchCount' (
+    'AppID' INTEGER PRIMARY KEY,
+    'Count' INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE 'LaunchPlan' (
+    'AppID' INTEGER PRIMARY KEY,
+    'Version' INTEGER NOT NULL,
+    'Stamp' TEXT NOT NULL,
+    'Program' TEXT NOT NULL,
+    'Arguments' TEXT NOT NULL,
+    'Env' TEXT NOT NULL
+);
+
+CREATE TABLE 'LaunchLog' (
+    'LogID' INTEGER PRIMARY KEY AUTOINCREMENT,
+    'AppID' INTEGER NOT NULL,
+    'Started' REAL NOT NULL,
+    'Substitution' REAL,
+    'Commands' REAL,
+    'Env' REAL,
+    'Exec' REAL,
+    'Total' REAL NOT NULL,
+    'State' TEXT NOT NULL
 );
 
 CREATE TABLE 'Env' (
@@ -24,4 +63,27 @@ CREATE TABLE 'Env' (
     'AppID' INTEGER NOT NULL
 );
 
+CREATE VIRTUAL TABLE IF NOT EXISTS AppSearch USING fts5(
+    Name, Description, Command, Argument, content='App', content_rowid='AppID', prefix='2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS AppSearch_insert AFTER INSERT ON App BEGIN
+    INSERT INTO AppSearch (rowid, Name, Description, Command, Argument)
+    VALUES (new.AppID, new.Name, new.Description, new.Command, new.Argument);
+END;
+
+CREATE TRIGGER IF NOT EXISTS AppSearch_delete AFTER DELETE ON App BEGIN
+    INSERT INTO AppSearch (AppSearch, rowid, Name, Description, Command, Argument)
+    VALUES ('delete', old.AppID, old.Name, old.Description, old.Command, old.Argument);
+END;
+
+CREATE TRIGGER IF NOT EXISTS AppSearch_update AFTER UPDATE ON App BEGIN
+    INSERT INTO AppSearch (AppSearch, rowid, Name, Description, Command, Argument)
+    VALUES ('delete', old.AppID, old.Name, old.Description, old.Command, old.Argument);
+    INSERT INTO AppSearch (rowid, Name, Description, Command, Argument)
+    VALUES (new.AppID, new.Name, new.Description, new.Command, new.Argument);
+END;
+
+INSERT INTO AppSearch (AppSearch) VALUES ('rebuild');
+
 COMMIT;
\ No newline at end of file
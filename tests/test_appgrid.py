@@ -0,0 +1,166 @@
+import unittest
+
+from appgrid import AppDelegate, AppGridView, AppListModel
+from bashpool import bash_pool
+from catalog import app_catalog, save_icon
+from iconcache import icon_cache, icon_loader
+from mainwindow import MainWindow
+from PyQt5.QtCore import QBuffer, QByteArray, QIODevice, QRect, Qt, QTimer
+from PyQt5.QtGui import QPixmap
+from PyQt5.QtSql import QSqlQuery
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QApplication, QMessageBox
+
+
+class Test_AppGrid(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.app = QApplication([])
+        self.window = MainWindow(grid=True)
+
+        self.image = QPixmap("icons/test.png")
+        icon = QByteArray()
+        buffer = QBuffer(icon)
+        buffer.open(QIODevice.WriteOnly)
+        self.image.save(buffer, "PNG")
+
+        query = QSqlQuery()
+        query.prepare(
+            "INSERT INTO App (Name, Path, Description, IconHash, Command, Argument) VALUES (?,?,?,?,?,?)"
+        )
+        query.bindValue(0, "Test Grid Name")
+        query.bindValue(1, "Test Path")
+        query.bindValue(2, "Test Description")
+        query.bindValue(3, save_icon(icon))
+        query.bindValue(4, "")
+        query.bindValue(5, "")
+        if not query.exec():
+            self.assertTrue(False, msg=query.lastError().text())
+        self.id = query.lastInsertId()
+        app_catalog.update_app(self.id)
+
+    def setUp(self):
+        self.test = False
+        self.window.search.setText("Test Grid Name")
+        self.window.add_widgets()
+
+    def test_grid_mode(self):
+        self.assertTrue(self.window.grid)
+        self.assertFalse(self.window.scrollArea.isVisible())
+        self.assertEqual(type(self.window.grid_view), AppGridView)
+        self.assertEqual(type(self.window.grid_view.itemDelegate()), AppDelegate)
+        self.assertEqual(self.window.frame_layout.count(), 0)
+
+    def test_model(self):
+        model = self.window.model
+        self.assertEqual(model.rowCount(), 1)
+        index = model.index(0)
+        self.assertEqual(index.data(AppListModel.IdRole), self.id)
+        self.assertEqual(index.data(Qt.DisplayRole), "Test Grid Name")
+        self.assertEqual(index.data(Qt.ToolTipRole), "Test Description")
+        # The placeholder is displayed until the icon is decoded in the background
+        icon_cache.discard(self.id)
+        self.signals = []
+        model.dataChanged.connect(lambda top, bottom, roles: self.signals.append((top.row(), roles)))
+        self.assertEqual(index.data(Qt.DecorationRole).cacheKey(), icon_loader.placeholder().cacheKey())
+        icon_loader.wait()
+        self.assertEqual(self.signals, [(0, [Qt.DecorationRole])])
+        # The icon is scaled to the same size as the app widget
+        pixmap = index.data(Qt.DecorationRole)
+        self.assertEqual(pixmap.size(), self.image.scaled(128, 128).size())
+        self.assertEqual(pixmap.toImage(), self.image.scaled(128, 128).toImage())
+
+        self.window.search.setText("No Such App Name")
+        self.window.add_widgets()
+        self.assertEqual(model.rowCount(), 0)
+        # Filtering the apps keeps the decoded icons
+        self.window.search.setText("Test Grid Name")
+        self.window.add_widgets()
+        self.assertEqual(model.index(0).data(Qt.DecorationRole).cacheKey(), pixmap.cacheKey())
+        self.assertEqual(icon_loader.pending, {})
+
+    def test_busy(self):
+        model = self.window.model
+        self.assertFalse(model.index(0).data(AppListModel.BusyRole))
+        model.set_busy(self.id, True)
+        self.assertTrue(model.index(0).data(AppListModel.BusyRole))
+        self.window.grid_view.viewport().repaint()
+        model.set_busy(self.id, False)
+        self.assertFalse(model.index(0).data(AppListModel.BusyRole))
+
+    def test_select(self):
+        model = self.window.model
+        self.assertFalse(model.index(0).data(AppListModel.SelectedRole))
+        # Clicking the launch area with Ctrl selects the app without launching it
+        self.click("launch", Qt.ControlModifier)
+        self.assertTrue(model.index(0).data(AppListModel.SelectedRole))
+        self.assertEqual(self.window.jobs, {})
+        self.assertEqual(self.window.selected_ids(), [self.id])
+        self.assertTrue(self.window.launch_selected_btn.isEnabled())
+        self.window.grid_view.viewport().repaint()
+        # The selection is kept while the app is hidden by the search
+        self.window.search.setText("No Such App Name")
+        self.window.add_widgets()
+        self.assertEqual(self.window.selected_ids(), [self.id])
+        self.window.search.setText("Test Grid Name")
+        self.window.add_widgets()
+        self.click("launch", Qt.ControlModifier)
+        self.assertFalse(model.index(0).data(AppListModel.SelectedRole))
+        self.assertFalse(self.window.launch_selected_btn.isEnabled())
+
+    def test_regions(self):
+        delegate = self.window.grid_view.itemDelegate()
+        tile, launch, edit, remove = delegate.regions(QRect(0, 0, 238, 274))
+        self.assertEqual(tile.size(), delegate.tile_size)
+        self.assertTrue(tile.contains(launch))
+        self.assertTrue(tile.contains(edit))
+        self.assertTrue(tile.contains(remove))
+        self.assertFalse(launch.intersects(edit))
+        self.assertFalse(edit.intersects(remove))
+
+    def test_edit(self):
+        qTimer = QTimer(self.window)
+        qTimer.setSingleShot(True)
+        qTimer.timeout.connect(self.close_dialog)
+        qTimer.start(100)
+        self.click("edit")
+        self.assertTrue(self.test, msg="Failed to open Edit Dialog")
+
+    def test_remove_no(self):
+        qTimer = QTimer(self.window)
+        qTimer.timeout.connect(self.messagebox_no)
+        qTimer.start(100)
+        self.click("remove")
+        self.assertTrue(self.test, msg="Failed to open Message Box")
+        self.assertEqual(self.window.model.rowCount(), 1)
+
+    def click(self, button, modifier=Qt.NoModifier):
+        view = self.window.grid_view
+        rect = view.visualRect(self.window.model.index(0))
+        tile, launch, edit, remove = view.itemDelegate().regions(rect)
+        regions = {"launch": launch, "edit": edit, "remove": remove}
+        QTest.mouseClick(view.viewport(), Qt.LeftButton, modifier, regions[button].center())
+
+    def messagebox_no(self):
+        widget = self.app.activeModalWidget()
+        if type(widget).__name__ == "QMessageBox":
+            QTest.mouseClick(widget.button(QMessageBox.No), Qt.LeftButton)
+            self.test = True
+        else:
+            self.test = False
+
+    def close_dialog(self):
+        widget = self.app.activeModalWidget()
+        if type(widget).__name__ == "EditDialog":
+            QTest.keyPress(widget, Qt.Key_Escape)
+            self.test = True
+        else:
+            self.test = False
+
+    @classmethod
+    def tearDownClass(self):
+        QSqlQuery(f"DELETE FROM App WHERE AppID = {self.id}")
+        app_catalog.remove_app(self.id)
+        self.app.closeAllWindows()
+        bash_pool.close()
+        self.window.con.close()
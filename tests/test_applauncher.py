@@ -0,0 +1,113 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from bashpool import bash_pool
+from mainwindow import MainWindow
+from PyQt5.QtSql import QSqlQuery
+from PyQt5.QtWidgets import QApplication
+
+# The command line run in a new process, as it is used from a terminal
+COMMAND = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "applauncher.py")
+
+
+class Test_AppLauncher(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.app = QApplication([])
+        self.window = MainWindow()
+        # Keep the environment snapshots of the test out of the user cache
+        self.cache = tempfile.mkdtemp()
+        self.ids = []
+        for name, command, argument in (
+            ("Test CLI Alpha", "export TEST_CLI=`echo alpha`", ""),
+            ("Test CLI Beta", "export TEST_CLI=beta", "--bad"),
+            ("Test CLI Fail", "echo broken >&2", ""),
+            ("Test Quoted Values", 'export TEST_QUOTED_MULTI="a\nb=c"\nexport TEST_QUOTED=\'"q" $x\'', ""),
+        ):
+            query = QSqlQuery()
+            query.prepare("INSERT INTO App (Name, Path, Description, IconHash, Command, Argument) VALUES (?,?,?,?,?,?)")
+            query.bindValue(0, name)
+            query.bindValue(1, "true")
+            query.bindValue(2, "")
+            query.bindValue(3, "")
+            query.bindValue(4, command)
+            query.bindValue(5, argument)
+            query.exec()
+            self.ids.append(query.lastInsertId())
+        query = QSqlQuery()
+        query.prepare("INSERT INTO Env (Name, Value, AppID, ExeOrder) VALUES (?,?,?,?)")
+        query.bindValue(0, "TEST_CLI_ENV")
+        query.bindValue(1, '"$TEST_CLI"-env')
+        query.bindValue(2, self.ids[0])
+        query.bindValue(3, 1)
+        query.exec()
+
+    def run_command(self, *args):
+        # The command does not need a display
+        env = {name: value for name, value in os.environ.items() if name not in ("DISPLAY", "WAYLAND_DISPLAY", "QT_QPA_PLATFORM")}
+        env["XDG_CACHE_HOME"] = self.cache
+        return subprocess.run([sys.executable, COMMAND] + list(args), capture_output=True, text=True, timeout=60, env=env, cwd=tempfile.gettempdir())
+
+    def test_list(self):
+        process = self.run_command("list", "Test CLI")
+        self.assertEqual(process.returncode, 0, msg=process.stderr)
+        self.assertEqual(sorted(process.stdout.splitlines()), ["Test CLI Alpha", "Test CLI Beta", "Test CLI Fail"])
+        process = self.run_command("list", "--json", "Test CLI Beta")
+        apps = json.loads(process.stdout)
+        self.assertEqual([app["AppID"] for app in apps], [self.ids[1]])
+        self.assertEqual(apps[0]["Argument"], "--bad")
+
+    def test_env(self):
+        process = self.run_command("env", "test cli alpha")
+        self.assertEqual(process.returncode, 0, msg=process.stderr)
+        lines = process.stdout.splitlines()
+        self.assertTrue("TEST_CLI=alpha" in lines)
+        self.assertTrue("TEST_CLI_ENV=alpha-env" in lines)
+        process = self.run_command("env", "-0", str(self.ids[1]))
+        self.assertTrue("TEST_CLI=beta" in process.stdout.split("\0"))
+
+    def test_env_quoted(self):
+        # The quotes, = and newlines in the additional commands are kept when bash is started for the command line
+        process = self.run_command("env", "-0", str(self.ids[3]))
+        self.assertEqual(process.returncode, 0, msg=process.stderr)
+        values = process.stdout.split("\0")
+        self.assertTrue("TEST_QUOTED_MULTI=a\nb=c" in values)
+        self.assertTrue('TEST_QUOTED="q" $x' in values)
+
+    def test_launch(self):
+        process = self.run_command("launch", "Test CLI Alpha", "--timing")
+        self.assertEqual(process.returncode, 0, msg=process.stderr)
+        self.assertTrue(process.stderr.startswith("Started Test CLI Alpha in "))
+        self.assertTrue(process.stderr.strip().endswith(" ms"))
+        query = QSqlQuery(f"SELECT Count FROM LaunchCount WHERE AppID = {self.ids[0]}")
+        self.assertTrue(query.next())
+        self.assertEqual(query.value(0), 1)
+
+    def test_launch_failed(self):
+        process = self.run_command("launch", "Test CLI Fail")
+        self.assertEqual(process.returncode, 1)
+        self.assertEqual(process.stderr.strip(), "Run Additional Command Failed: broken")
+
+    def test_no_match(self):
+        process = self.run_command("launch", "No Such CLI App")
+        self.assertEqual(process.returncode, 1)
+        self.assertEqual(process.stderr.strip(), 'No app matches "No Such CLI App"')
+        process = self.run_command("env", "Test CLI")
+        self.assertEqual(process.returncode, 1)
+        self.assertTrue(process.stderr.startswith('More than one app matches "Test CLI"'))
+
+    @classmethod
+    def tearDownClass(self):
+        shutil.rmtree(self.cache, ignore_errors=True)
+        for id in self.ids:
+            QSqlQuery(f"DELETE FROM App WHERE AppID = {id}")
+            QSqlQuery(f"DELETE FROM Env WHERE AppID = {id}")
+            QSqlQuery(f"DELETE FROM LaunchCount WHERE AppID = {id}")
+            QSqlQuery(f"DELETE FROM LaunchPlan WHERE AppID = {id}")
+        bash_pool.close()
+        self.window.con.close()
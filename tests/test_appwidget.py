@@ -1,12 +1,20 @@
-import unittest
+import os
+import shutil
+import tempfile
 import time
+import unittest
 
 from appwidget import AppWidget
+from bashpool import bash_pool
+from catalog import app_catalog, save_icon
+from envcache import EnvCache
+from iconcache import icon_cache, icon_loader
+from launcher import LaunchJob
 from mainwindow import MainWindow
 from PyQt5.QtCore import QBuffer, QByteArray, QDir, QFile, QIODevice, Qt, QTimer
 from PyQt5.QtGui import QPixmap
 from PyQt5.QtSql import QSqlQuery
-from PyQt5.QtTest import QTest
+from PyQt5.QtTest import QSignalSpy, QTest
 from PyQt5.QtWidgets import QApplication, QMessageBox
 
 
@@ -21,15 +29,16 @@ class Test_AppWidget(unittest.TestCase):
         buffer = QBuffer(icon)
         buffer.open(QIODevice.WriteOnly)
         self.image.save(buffer, "PNG")
+        self.icon = icon
 
         query = QSqlQuery()
         query.prepare(
-            "INSERT INTO App (Name, Path, Description, Icon, Command, Argument) VALUES (?,?,?,?,?,?)"
+            "INSERT INTO App (Name, Path, Description, IconHash, Command, Argument) VALUES (?,?,?,?,?,?)"
         )
         query.bindValue(0, "Test Name")
         query.bindValue(1, "Test Path")
         query.bindValue(2, "Test Description")
-        query.bindValue(3, icon)
+        query.bindValue(3, save_icon(icon))
         query.bindValue(4, "Test Command")
         query.bindValue(5, "Test Argument")
         if not query.exec():
@@ -57,6 +66,8 @@ class Test_AppWidget(unittest.TestCase):
         self.assertEqual(self.widget.launch_btn.layout().alignment(), Qt.AlignCenter)
         self.assertEqual(type(self.widget.launch_btn.layout().itemAt(0).widget()).__name__, "QLabel")
 
+        # Wait for the icon decoded in the background
+        icon_loader.wait()
         icon = QByteArray()
         buffer = QBuffer(icon)
         buffer.open(QIODevice.WriteOnly)
@@ -82,10 +93,32 @@ class Test_AppWidget(unittest.TestCase):
         self.assertEqual(self.widget.remove_btn.iconSize().width(), 16)
         self.assertEqual(self.widget.remove_btn.iconSize().height(), 16)
 
+    def test_widget_placeholder(self):
+        query = QSqlQuery()
+        query.prepare("INSERT INTO App (Name, Path, Description, IconHash, Command, Argument) VALUES (?,?,?,?,?,?)")
+        query.bindValue(0, "Test Name")
+        query.bindValue(1, "Test Path")
+        query.bindValue(2, "Test Description")
+        query.bindValue(3, save_icon(self.icon))
+        query.bindValue(4, "Test Command")
+        query.bindValue(5, "Test Argument")
+        if not query.exec():
+            self.assertTrue(False, msg=query.lastError().text())
+        id = query.lastInsertId()
+
+        widget = AppWidget(id)
+        self.assertTrue(widget.waiting)
+        self.assertEqual(widget.icon_label.pixmap().cacheKey(), icon_loader.placeholder().cacheKey())
+        icon_loader.wait()
+        self.assertFalse(widget.waiting)
+        self.assertEqual(widget.icon_label.pixmap().toImage(), self.image.scaled(128, 128).toImage())
+        QSqlQuery(f"DELETE FROM App WHERE AppID = {id}")
+        icon_cache.discard(id)
+
     def test_widget_noicon(self):
         query = QSqlQuery()
         query.prepare(
-            "INSERT INTO App (Name, Path, Description, Icon, Command, Argument) VALUES (?,?,?,?,?,?)"
+            "INSERT INTO App (Name, Path, Description, IconHash, Command, Argument) VALUES (?,?,?,?,?,?)"
         )
         query.bindValue(0, "Test Name")
         query.bindValue(1, "Test Path")
@@ -171,7 +204,7 @@ unset DATE"""
     def test_launch_success(self):
         query = QSqlQuery()
         query.prepare(
-            "INSERT INTO App (Name, Path, Description, Icon, Command, Argument) VALUES (?,?,?,?,?,?)"
+            "INSERT INTO App (Name, Path, Description, IconHash, Command, Argument) VALUES (?,?,?,?,?,?)"
         )
         query.bindValue(0, "Test Name")
         query.bindValue(1, "mkdir")
@@ -193,10 +226,109 @@ unset DATE"""
 
         QSqlQuery(f"DELETE FROM App WHERE AppID = {id}")
 
+    def add_env_app(self):
+        query = QSqlQuery()
+        query.prepare("INSERT INTO App (Name, Path, Description, IconHash, Command, Argument) VALUES (?,?,?,?,?,?)")
+        query.bindValue(0, "Test Name")
+        query.bindValue(1, "true")
+        query.bindValue(2, "Test Description")
+        query.bindValue(3, "")
+        query.bindValue(4, "export TEST_WIDGET_CMD=1")
+        query.bindValue(5, "")
+        if not query.exec():
+            self.assertTrue(False, msg=query.lastError().text())
+        id = query.lastInsertId()
+        query = QSqlQuery()
+        query.prepare("INSERT INTO Env (Name, Value, AppID, ExeOrder) VALUES (?,?,?,?)")
+        query.bindValue(0, "TEST_WIDGET_PATH")
+        query.bindValue(1, '"$TEST_WIDGET_PATH":/extra')
+        query.bindValue(2, id)
+        query.bindValue(3, 1)
+        query.exec()
+        app_catalog.update_app(id)
+        return id
+
+    def remove_env_app(self, id):
+        QSqlQuery(f"DELETE FROM Env WHERE AppID = {id}")
+        QSqlQuery(f"DELETE FROM App WHERE AppID = {id}")
+        app_catalog.remove_app(id)
+
+    def test_launch_repeat(self):
+        id = self.add_env_app()
+        # Keep the environment snapshots of the test out of the user cache
+        cache = EnvCache(tempfile.mkdtemp())
+        env_cache = LaunchJob.env_cache
+        LaunchJob.env_cache = cache
+        try:
+            widget = AppWidget(id)
+            values = []
+            for i in range(3):
+                job = widget.launch()
+                if job.is_running():
+                    self.assertTrue(QSignalSpy(job.finished).wait(5000))
+                values.append(widget.env.value("TEST_WIDGET_PATH"))
+        finally:
+            LaunchJob.env_cache = env_cache
+            shutil.rmtree(cache.directory)
+            self.remove_env_app(id)
+        # Each launch starts from the system environment instead of the environment of the previous launch
+        self.assertEqual(values, [":/extra"] * 3)
+        self.assertFalse(os.environ.get("TEST_WIDGET_PATH"))
+
+    def test_launch_cached(self):
+        id = self.add_env_app()
+        cache = EnvCache(tempfile.mkdtemp())
+        env_cache = LaunchJob.env_cache
+        LaunchJob.env_cache = cache
+        try:
+            widget = AppWidget(id)
+            job = widget.launch()
+            self.assertTrue(job.is_running())
+            self.assertTrue(QSignalSpy(job.finished).wait(5000))
+            # The repeat launch from the same widget finds the snapshot and starts the app without running bash
+            job = widget.launch()
+            self.assertEqual(job.state, LaunchJob.LAUNCHED)
+            self.assertEqual((job.request, job.process), (None, None))
+            self.assertEqual(len(os.listdir(cache.directory)), 1)
+            self.assertEqual(widget.env.value("TEST_WIDGET_CMD"), "1")
+        finally:
+            LaunchJob.env_cache = env_cache
+            shutil.rmtree(cache.directory)
+            self.remove_env_app(id)
+
+    def test_launch_cancel(self):
+        query = QSqlQuery()
+        query.prepare(
+            "INSERT INTO App (Name, Path, Description, IconHash, Command, Argument) VALUES (?,?,?,?,?,?)"
+        )
+        query.bindValue(0, "Test Name")
+        query.bindValue(1, "mkdir")
+        query.bindValue(2, "Test Description")
+        query.bindValue(3, "")
+        query.bindValue(4, "sleep 10")
+        query.bindValue(5, "LaunchTest")
+        if not query.exec():
+            self.assertTrue(False, msg=query.lastError().text())
+        id = query.lastInsertId()
+
+        widget = AppWidget(id)
+        widget.show()
+        # The busy indicator is displayed while the additional commands are running
+        QTest.mouseClick(widget.launch_btn, Qt.LeftButton)
+        self.assertTrue(widget.job.is_running())
+        self.assertTrue(widget.busy_bar.isVisible())
+        # Clicking the launch button again cancels the launch
+        QTest.mouseClick(widget.launch_btn, Qt.LeftButton)
+        self.assertEqual(widget.job.state, LaunchJob.CANCELLED)
+        self.assertFalse(widget.busy_bar.isVisible())
+        self.assertFalse(QDir("LaunchTest").exists())
+
+        QSqlQuery(f"DELETE FROM App WHERE AppID = {id}")
+
     def test_launch_fail(self):
         query = QSqlQuery()
         query.prepare(
-            "INSERT INTO App (Name, Path, Description, Icon, Command, Argument) VALUES (?,?,?,?,?,?)"
+            "INSERT INTO App (Name, Path, Description, IconHash, Command, Argument) VALUES (?,?,?,?,?,?)"
         )
         query.bindValue(0, "Test Name")
         query.bindValue(1, "Test Path")
@@ -293,4 +425,5 @@ unset DATE"""
     @classmethod
     def tearDownClass(self):
         QSqlQuery(f"DELETE FROM App WHERE AppID = {self.id}")
+        bash_pool.close()
         self.window.con.close()
@@ -0,0 +1,116 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+from bashpool import BashPool
+from PyQt5.QtCore import QProcessEnvironment
+from PyQt5.QtTest import QSignalSpy
+from PyQt5.QtWidgets import QApplication
+
+BENCHMARK = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "bashpool.py")
+
+
+class Test_BashPool(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.app = QApplication([])
+
+    def setUp(self):
+        self.pool = BashPool(size=1)
+        self.pool.start()
+        self.errors = []
+
+    def run_commands(self, commands, env=None):
+        request = self.pool.run(commands, env)
+        request.stderr_received.connect(self.errors.append)
+        self.assertTrue(request.wait(5000))
+        return request
+
+    def test_run(self):
+        request = self.run_commands('export TEST_POOL="a=b\nc"\nexport TEST_POOL2=$TEST_POOL')
+        self.assertEqual(request.status, 0)
+        # The values with = and newlines are kept
+        self.assertEqual(request.values["TEST_POOL"], "a=b\nc")
+        self.assertEqual(request.values["TEST_POOL2"], "a=b\nc")
+
+    def test_isolated(self):
+        env = QProcessEnvironment()
+        env.insert("PATH", QProcessEnvironment.systemEnvironment().value("PATH"))
+        env.insert("TEST_POOL_BASE", "base")
+        request = self.run_commands("export TEST_POOL=1\ncd /", env)
+        self.assertEqual(request.values["TEST_POOL_BASE"], "base")
+        self.assertNotIn("HOME", request.values)
+        # The worker is reused and the previous commands do not change it
+        worker = self.pool.workers[0]
+        request = self.run_commands("true")
+        self.assertEqual(self.pool.workers, [worker])
+        self.assertNotIn("TEST_POOL", request.values)
+        self.assertNotEqual(request.values["PWD"], "/")
+
+    def test_stderr(self):
+        request = self.run_commands("echo test stderr >&2")
+        self.assertEqual("".join(self.errors), "test stderr\n")
+        self.assertEqual(request.status, 0)
+        # A syntax error does not stop the worker
+        self.run_commands('echo "unterminated')
+        self.assertTrue(self.errors[-1])
+        self.assertEqual(self.run_commands("true").status, 0)
+
+    def test_exit(self):
+        request = self.run_commands("exit 3")
+        self.assertEqual(request.status, 3)
+        self.assertIsNone(request.values)
+
+    def test_extra_worker(self):
+        requests = [self.pool.run("sleep 0.2"), self.pool.run("sleep 0.2")]
+        self.assertEqual(len(self.pool.workers), 2)
+        for request in requests:
+            request.wait(5000)
+        # The extra worker stops once it is idle
+        self.assertEqual(len(self.pool.workers), 1)
+
+    def test_max_size(self):
+        self.pool.close()
+        self.pool = BashPool(size=1, max_size=2)
+        requests = [self.pool.run(f"sleep 0.2\nexport TEST_POOL={i}") for i in range(5)]
+        # Only max_size workers are started and the other requests wait for them
+        self.assertEqual(len(self.pool.workers), 2)
+        self.assertEqual(self.pool.queue, requests[2:])
+        # A waiting request is dropped when it is cancelled
+        destroyed = QSignalSpy(requests[3].destroyed)
+        requests[3].cancel()
+        self.assertTrue(destroyed.wait(1000))
+        values = []
+        for request in requests[:3] + requests[4:]:
+            request.finished.connect(lambda request=request: values.append(request.values["TEST_POOL"]))
+        for request in requests[:3] + requests[4:]:
+            self.assertLessEqual(len(self.pool.workers), 2)
+            if request.status == -1:
+                self.assertTrue(request.wait(5000))
+        self.assertEqual(sorted(values), ["0", "1", "2", "4"])
+        self.assertEqual(self.pool.queue, [])
+        self.assertEqual(len(self.pool.workers), 1)
+
+    def test_cancel(self):
+        request = self.pool.run("sleep 10")
+        finished = QSignalSpy(request.finished)
+        destroyed = QSignalSpy(request.destroyed)
+        request.cancel()
+        self.assertEqual(self.pool.workers, [])
+        self.assertEqual(len(finished), 0)
+        # The cancelled request is deleted, although it does not finish
+        self.assertTrue(destroyed.wait(1000))
+        # A new worker is started for the next request
+        self.assertEqual(self.run_commands("true").status, 0)
+
+    def test_benchmark(self):
+        env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+        process = subprocess.run([sys.executable, BENCHMARK, "--json", "--launches", "3"], capture_output=True, text=True, env=env, timeout=120)
+        results = json.loads(process.stdout)
+        self.assertEqual(set(results), {"fork", "pool"})
+        self.assertGreater(results["pool"]["median"], 0)
+
+    def tearDown(self):
+        self.pool.close()
@@ -0,0 +1,169 @@
+import shutil
+import tempfile
+import unittest
+
+from bashpool import bash_pool
+from batchlaunch import BatchLaunch, summary
+from catalog import app_catalog
+from envcache import EnvCache, env_cache
+from launcher import LaunchJob
+from mainwindow import MainWindow
+from prewarm import prewarmer
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtSql import QSqlQuery
+from PyQt5.QtTest import QSignalSpy, QTest
+from PyQt5.QtWidgets import QApplication
+
+
+class Test_BatchLaunch(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.app = QApplication([])
+        self.window = MainWindow()
+        # Keep the environment snapshots of the test out of the user cache
+        LaunchJob.env_cache = EnvCache(tempfile.mkdtemp())
+        self.ids = []
+        for name, command in (
+            ("Test Batch Alpha", "export TEST_BATCH=`echo alpha`"),
+            ("Test Batch Beta", "export TEST_BATCH=beta"),
+            ("Test Batch Fail", "echo broken >&2"),
+        ):
+            query = QSqlQuery()
+            query.prepare("INSERT INTO App (Name, Path, Description, IconHash, Command, Argument) VALUES (?,?,?,?,?,?)")
+            query.bindValue(0, name)
+            query.bindValue(1, "true")
+            query.bindValue(2, "")
+            query.bindValue(3, "")
+            query.bindValue(4, command)
+            query.bindValue(5, "")
+            query.exec()
+            self.ids.append(query.lastInsertId())
+            app_catalog.update_app(self.ids[-1])
+
+    def setUp(self):
+        self.test = False
+
+    def run_batch(self, ids, max_workers=None):
+        batch = BatchLaunch(ids, max_workers=max_workers)
+        spy = QSignalSpy(batch.finished)
+        running = []
+        batch.app_started.connect(lambda id: running.append(len(batch.jobs)))
+        batch.start()
+        if len(spy) == 0:
+            self.assertTrue(spy.wait(10000))
+        return spy[0][0], running
+
+    def test_launch(self):
+        results, running = self.run_batch(self.ids[:2])
+        self.assertEqual([result["AppID"] for result in results], self.ids[:2])
+        self.assertEqual([result["Name"] for result in results], ["Test Batch Alpha", "Test Batch Beta"])
+        self.assertTrue(all(result["Launched"] for result in results))
+        self.assertTrue(all(result["Error"] == "" for result in results))
+        self.assertTrue(all(result["Time"] >= 0 for result in results))
+        # Both apps are prepared at the same time
+        self.assertEqual(running, [1, 2])
+
+    def test_bounded(self):
+        results, running = self.run_batch(self.ids[:2] + self.ids[:1], max_workers=1)
+        # An app given twice is launched once and only one app is prepared at a time
+        self.assertEqual(len(results), 2)
+        self.assertEqual(running, [1, 1])
+
+    def test_failure(self):
+        results, running = self.run_batch(self.ids)
+        launched = {result["AppID"]: result["Launched"] for result in results}
+        self.assertEqual(launched, {self.ids[0]: True, self.ids[1]: True, self.ids[2]: False})
+        self.assertEqual(results[2]["Error"], "broken")
+        text = summary(results)
+        self.assertTrue(text.startswith("Launched 2 of 3 apps"))
+        self.assertTrue("Test Batch Alpha: prepared in" in text)
+        self.assertTrue("Test Batch Fail: failed after" in text and text.endswith("- broken"))
+
+    def test_cancel(self):
+        # The backtick command is always run, so the app is still being prepared
+        batch = BatchLaunch(self.ids[:1])
+        spy = QSignalSpy(batch.finished)
+        batch.start()
+        self.assertTrue(batch.is_running())
+        batch.cancel()
+        self.assertFalse(batch.is_running())
+        self.assertEqual(spy[0][0][0]["Error"], "Cancelled")
+        self.assertFalse(spy[0][0][0]["Launched"])
+
+    def test_prewarm(self):
+        query = QSqlQuery()
+        query.prepare("INSERT INTO Env (Name, Value, AppID, ExeOrder) VALUES (?,?,?,?)")
+        query.bindValue(0, "TEST_BATCH_DBL")
+        query.bindValue(1, '"$TEST_BATCH_DBL"-x')
+        query.bindValue(2, self.ids[1])
+        query.bindValue(3, 1)
+        query.exec()
+        app_catalog.update_app(self.ids[1])
+        prewarmer.enabled = True
+        try:
+            prewarmer.warm(self.ids[1])
+            if self.ids[1] in prewarmer.jobs:
+                self.assertTrue(QSignalSpy(prewarmer.jobs[self.ids[1]].finished).wait(5000))
+            self.assertTrue(prewarmer.is_ready(self.ids[1]))
+            batch = BatchLaunch(self.ids[1:2])
+            values = []
+            batch.app_finished.connect(lambda id: values.append(batch.launchers[id].env.value("TEST_BATCH_DBL")))
+            spy = QSignalSpy(batch.finished)
+            batch.start()
+            if len(spy) == 0:
+                self.assertTrue(spy.wait(10000))
+        finally:
+            prewarmer.enabled = False
+            QSqlQuery(f"DELETE FROM Env WHERE AppID = {self.ids[1]}")
+            app_catalog.update_app(self.ids[1])
+        # The environment variables of the pre-warmed app are set once
+        self.assertEqual(values, ["-x"])
+        self.assertTrue(spy[0][0][0]["Launched"])
+
+    def test_launch_selected(self):
+        self.window.search.setText("Test Batch")
+        self.window.add_widgets()
+        self.assertFalse(self.window.launch_selected_btn.isEnabled())
+        # Clicking with Ctrl selects the app instead of launching it
+        for id in self.ids[:2]:
+            QTest.mouseClick(self.window.widgets[id].launch_btn, Qt.LeftButton, Qt.ControlModifier)
+            self.assertTrue(self.window.widgets[id].selected)
+            self.assertEqual(self.window.widgets[id].job, None)
+        self.assertEqual(self.window.selected_ids(), self.ids[:2])
+        self.assertTrue(self.window.launch_selected_btn.isEnabled())
+        self.assertEqual(self.window.launch_selected_btn.text(), "Launch Selected (2)")
+
+        qTimer = QTimer(self.window)
+        qTimer.setSingleShot(True)
+        qTimer.timeout.connect(self.close_summary)
+        spy = QSignalSpy(self.window.launch_selected_btn.clicked)
+        QTest.mouseClick(self.window.launch_selected_btn, Qt.LeftButton)
+        self.assertEqual(len(spy), 1)
+        qTimer.start(100)
+        if self.window.batch is not None:
+            self.assertTrue(QSignalSpy(self.window.batch.finished).wait(10000))
+        self.assertTrue(self.test, msg="Failed to open Message Box")
+        self.assertEqual(len(self.window.results), 2)
+        # The selection is cleared once the apps are launched
+        self.assertEqual(self.window.selected_ids(), [])
+        self.assertFalse(self.window.launch_selected_btn.isEnabled())
+
+    def close_summary(self):
+        widget = self.app.activeModalWidget()
+        if type(widget).__name__ == "QMessageBox" and widget.text().startswith("Launched 2 of 2 apps"):
+            widget.accept()
+            self.test = True
+        else:
+            self.test = False
+
+    @classmethod
+    def tearDownClass(self):
+        shutil.rmtree(LaunchJob.env_cache.directory, ignore_errors=True)
+        LaunchJob.env_cache = env_cache
+        for id in self.ids:
+            QSqlQuery(f"DELETE FROM App WHERE AppID = {id}")
+            QSqlQuery(f"DELETE FROM Env WHERE AppID = {id}")
+            QSqlQuery(f"DELETE FROM LaunchCount WHERE AppID = {id}")
+            QSqlQuery(f"DELETE FROM LaunchPlan WHERE AppID = {id}")
+        bash_pool.close()
+        self.window.con.close()
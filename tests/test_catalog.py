@@ -0,0 +1,317 @@
+import unittest
+
+from bashpool import bash_pool
+from catalog import (
+    APP_COLUMNS,
+    Catalog,
+    app_catalog,
+    count_launch,
+    create_search_index,
+    icon_hash,
+    load_app,
+    load_apps,
+    load_envs,
+    load_icon,
+    migrate_icons,
+    most_launched,
+    save_icon,
+    search_apps,
+    table_columns,
+)
+from mainwindow import MainWindow
+from PyQt5.QtCore import QBuffer, QByteArray, QIODevice
+from PyQt5.QtGui import QPixmap
+from PyQt5.QtSql import QSqlQuery
+from PyQt5.QtWidgets import QApplication
+
+
+class Test_Catalog(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.app = QApplication([])
+        self.window = MainWindow()
+
+        self.icon = QByteArray()
+        buffer = QBuffer(self.icon)
+        buffer.open(QIODevice.WriteOnly)
+        QPixmap("icons/test.png").save(buffer, "PNG")
+
+        self.icon2 = QByteArray()
+        buffer = QBuffer(self.icon2)
+        buffer.open(QIODevice.WriteOnly)
+        QPixmap("icons/test2.png").save(buffer, "PNG")
+
+        self.ids = []
+        for name, icon in (("Test Catalog B", self.icon), ("Test Catalog A", "")):
+            query = QSqlQuery()
+            query.prepare(
+                "INSERT INTO App (Name, Path, Description, IconHash, Command, Argument) VALUES (?,?,?,?,?,?)"
+            )
+            query.bindValue(0, name)
+            query.bindValue(1, "Test Path")
+            query.bindValue(2, "Test Description")
+            query.bindValue(3, save_icon(icon))
+            query.bindValue(4, "Test Command")
+            query.bindValue(5, "Test Argument")
+            if not query.exec():
+                self.assertTrue(False, msg=query.lastError().text())
+            self.ids.append(query.lastInsertId())
+
+        for order, (name, value) in enumerate((("TEST_ENV_B", "b=1"), ("TEST_ENV_A", "a"))):
+            query = QSqlQuery()
+            query.prepare("INSERT INTO Env (Name, Value, AppID, ExeOrder) VALUES (?,?,?,?)")
+            query.bindValue(0, name)
+            query.bindValue(1, value)
+            query.bindValue(2, self.ids[0])
+            query.bindValue(3, order + 1)
+            if not query.exec():
+                self.assertTrue(False, msg=query.lastError().text())
+
+    def setUp(self):
+        self.signals = []
+        app_catalog.load()
+
+    def test_load_apps(self):
+        apps = load_apps("Test Catalog")
+        self.assertEqual([app["Name"] for app in apps], ["Test Catalog A", "Test Catalog B"])
+        self.assertEqual(tuple(apps[0].keys()), APP_COLUMNS)
+        self.assertFalse("Icon" in apps[0])
+        self.assertEqual(apps[1]["AppID"], self.ids[0])
+        self.assertEqual(apps[1]["Path"], "Test Path")
+        self.assertEqual(apps[1]["Command"], "Test Command")
+        self.assertEqual(apps[1]["Argument"], "Test Argument")
+
+        query = QSqlQuery("SELECT COUNT(*) FROM App")
+        query.next()
+        self.assertEqual(len(load_apps()), query.value(0))
+
+    def test_load_apps_quote(self):
+        self.assertEqual(load_apps("Test Catalog' OR '1'='1"), [])
+
+    def test_load_app(self):
+        app = load_app(self.ids[1])
+        self.assertEqual(app["Name"], "Test Catalog A")
+        self.assertEqual(app["Description"], "Test Description")
+        self.assertEqual(load_app(-100), None)
+
+    def test_load_icon(self):
+        self.assertEqual(load_app(self.ids[0])["IconHash"], icon_hash(self.icon))
+        self.assertEqual(load_icon(load_app(self.ids[0])["IconHash"]), self.icon)
+        self.assertFalse(load_app(self.ids[1])["IconHash"])
+        self.assertEqual(load_icon(None), None)
+
+    def test_save_icon(self):
+        # The same icon is saved only once
+        self.assertEqual(save_icon(QByteArray(self.icon)), icon_hash(self.icon))
+        query = QSqlQuery()
+        query.prepare("SELECT COUNT(*) FROM Icon WHERE Hash = ?")
+        query.bindValue(0, icon_hash(self.icon))
+        query.exec()
+        query.next()
+        self.assertEqual(query.value(0), 1)
+        self.assertEqual(save_icon(QByteArray()), None)
+
+    def test_migrate_icons(self):
+        self.assertFalse("Icon" in table_columns("App"))
+        self.assertTrue("Icon" in self.window.con.tables())
+        # Add the old column back and save the same icon inline in two apps
+        QSqlQuery("ALTER TABLE App ADD COLUMN Icon BLOB")
+        ids = []
+        for name in ("Test Migrate A", "Test Migrate B"):
+            query = QSqlQuery()
+            query.prepare("INSERT INTO App (Name, Path, Icon) VALUES (?,?,?)")
+            query.bindValue(0, name)
+            query.bindValue(1, "Test Path")
+            query.bindValue(2, self.icon2)
+            if not query.exec():
+                self.assertTrue(False, msg=query.lastError().text())
+            ids.append(query.lastInsertId())
+        self.assertTrue(migrate_icons())
+        self.assertFalse("Icon" in table_columns("App"))
+        self.assertEqual([load_app(id)["IconHash"] for id in ids], [icon_hash(self.icon2)] * 2)
+        self.assertEqual(load_icon(icon_hash(self.icon2)), self.icon2)
+        query = QSqlQuery()
+        query.prepare("SELECT COUNT(*) FROM Icon WHERE Hash = ?")
+        query.bindValue(0, icon_hash(self.icon2))
+        query.exec()
+        query.next()
+        self.assertEqual(query.value(0), 1)
+        # A migrated database is not cleaned up again on every load
+        catalog = Catalog()
+        catalog.load()
+        QSqlQuery(f"DELETE FROM App WHERE AppID = {ids[0]}")
+        catalog.remove_app(ids[0])
+        self.assertEqual(load_icon(icon_hash(self.icon2)), self.icon2)
+        # The icon is removed with the last app using it
+        QSqlQuery(f"DELETE FROM App WHERE AppID = {ids[1]}")
+        self.assertTrue(migrate_icons())
+        self.assertEqual(load_icon(icon_hash(self.icon2)), self.icon2)
+        catalog.remove_app(ids[1])
+        self.assertEqual(load_icon(icon_hash(self.icon2)), None)
+
+    def test_load_envs(self):
+        self.assertEqual(load_envs(self.ids[0]), [("TEST_ENV_B", "b=1"), ("TEST_ENV_A", "a")])
+        self.assertEqual(load_envs(self.ids[1]), [])
+
+    def test_catalog_search(self):
+        self.assertEqual(len(app_catalog.apps), len(load_apps()))
+        apps = app_catalog.search("test catalog")
+        self.assertEqual([app["AppID"] for app in apps], [self.ids[1], self.ids[0]])
+        self.assertEqual(app_catalog.search("Test Catalog B"), [load_app(self.ids[0])])
+
+    def test_catalog_lazy(self):
+        # Use a catalog which is not displayed by the main window
+        catalog = Catalog()
+        catalog.load()
+        self.assertEqual(catalog.icons, {})
+        self.assertEqual(catalog.envs, {})
+        self.assertEqual(catalog.icon(self.ids[0]), self.icon)
+        self.assertEqual(catalog.icon(self.ids[1]), None)
+        self.assertEqual(catalog.get_envs(self.ids[0]), load_envs(self.ids[0]))
+        self.assertEqual(list(catalog.icons), [icon_hash(self.icon)])
+        self.assertTrue(self.ids[0] in catalog.envs)
+
+    def test_catalog_update(self):
+        app_catalog.app_changed.connect(self.signals.append)
+        query = QSqlQuery()
+        query.prepare("UPDATE App SET Name = ? WHERE AppID = ?")
+        query.bindValue(0, "Test Catalog C")
+        query.bindValue(1, self.ids[1])
+        query.exec()
+        # The catalog is not read from the database until it is patched
+        self.assertEqual(app_catalog.app(self.ids[1])["Name"], "Test Catalog A")
+        app_catalog.update_app(self.ids[1])
+        self.assertEqual(self.signals, [self.ids[1]])
+        self.assertEqual(app_catalog.search("Test Catalog")[-1]["Name"], "Test Catalog C")
+        query.bindValue(0, "Test Catalog A")
+        query.exec()
+        app_catalog.app_changed.disconnect(self.signals.append)
+
+    def test_catalog_update_icon(self):
+        # Use a catalog which is not displayed by the main window
+        catalog = Catalog()
+        catalog.load()
+        catalog.icon(self.ids[1])
+        query = QSqlQuery()
+        query.prepare("UPDATE App SET IconHash = ? WHERE AppID = ?")
+        query.bindValue(0, save_icon(QByteArray(self.icon2)))
+        query.bindValue(1, self.ids[1])
+        query.exec()
+        catalog.update_app(self.ids[1])
+        self.assertEqual(catalog.icon(self.ids[1]), self.icon2)
+        # The previous icon is dropped once no app uses it
+        query.bindValue(0, icon_hash(self.icon))
+        query.exec()
+        catalog.update_app(self.ids[1])
+        self.assertEqual(load_icon(icon_hash(self.icon2)), None)
+        self.assertFalse(icon_hash(self.icon2) in catalog.icons)
+        # The icon shared with another app is kept
+        query.bindValue(0, None)
+        query.exec()
+        catalog.update_app(self.ids[1])
+        self.assertEqual(load_icon(icon_hash(self.icon)), self.icon)
+
+    def test_catalog_remove(self):
+        app_catalog.app_removed.connect(self.signals.append)
+        app_catalog.get_envs(self.ids[0])
+        app_catalog.remove_app(self.ids[0])
+        self.assertEqual(self.signals, [self.ids[0]])
+        self.assertEqual([app["AppID"] for app in app_catalog.search("Test Catalog")], [self.ids[1]])
+        self.assertFalse(self.ids[0] in app_catalog.envs)
+        app_catalog.app_removed.disconnect(self.signals.append)
+
+    def test_catalog_fuzzy(self):
+        self.assertEqual(len(app_catalog.fuzzy_index), len(app_catalog.apps))
+        apps = app_catalog.search("tstctlgb", fuzzy=True)
+        self.assertEqual(apps[0]["AppID"], self.ids[0])
+        app_catalog.remove_app(self.ids[0])
+        self.assertFalse(self.ids[0] in [app["AppID"] for app in app_catalog.search("tstctlgb", fuzzy=True)])
+        app_catalog.update_app(self.ids[0])
+        self.assertEqual(app_catalog.search("tstctlgb", fuzzy=True)[0]["AppID"], self.ids[0])
+
+    def test_catalog_invalidate_envs(self):
+        app_catalog.envs_changed.connect(self.signals.append)
+        app_catalog.get_envs(self.ids[0])
+        app_catalog.invalidate_envs(self.ids[0])
+        self.assertEqual(self.signals, [self.ids[0]])
+        self.assertFalse(self.ids[0] in app_catalog.envs)
+        app_catalog.envs_changed.disconnect(self.signals.append)
+
+    def test_search_index(self):
+        self.assertTrue(app_catalog.search_index)
+        self.assertTrue("AppSearch" in self.window.con.tables())
+        # Creating the index again keeps the existing one
+        self.assertTrue(create_search_index())
+        self.assertEqual(search_apps("Test Catalog"), [self.ids[1], self.ids[0]])
+        self.assertEqual(search_apps("test catal"), [self.ids[1], self.ids[0]])
+        self.assertEqual(search_apps("Catalog B"), [self.ids[0]])
+        self.assertEqual(search_apps("!!!"), None)
+        self.assertEqual(search_apps("Test Catalog' OR \"1\"=\"1"), [])
+
+    def test_search_index_sync(self):
+        query = QSqlQuery()
+        query.prepare("INSERT INTO App (Name, Path, Description, IconHash, Command, Argument) VALUES (?,?,?,?,?,?)")
+        query.bindValue(0, "Test Index Launcher")
+        query.bindValue(1, "houdini")
+        query.bindValue(2, "Procedural fxtestindex tool")
+        query.bindValue(3, "")
+        query.bindValue(4, "cd /opt/hfs19\nsource fxtestindex_setup_bash")
+        query.bindValue(5, "")
+        if not query.exec():
+            self.assertTrue(False, msg=query.lastError().text())
+        id = query.lastInsertId()
+        app_catalog.update_app(id)
+        # Found by the description and the command
+        self.assertEqual(search_apps("fxtestindex"), [id])
+        self.assertEqual(search_apps("fxtestindex_setup"), [id])
+        self.assertEqual([app["AppID"] for app in app_catalog.search("fxtestind")], [id])
+
+        query = QSqlQuery()
+        query.prepare("UPDATE App SET Description = ?, Command = ? WHERE AppID = ?")
+        query.bindValue(0, "")
+        query.bindValue(1, "")
+        query.bindValue(2, id)
+        query.exec()
+        self.assertEqual(search_apps("fxtestindex"), [])
+        self.assertEqual(search_apps("Test Index Launcher"), [id])
+
+        QSqlQuery(f"DELETE FROM App WHERE AppID = {id}")
+        app_catalog.remove_app(id)
+        self.assertEqual(search_apps("Test Index Launcher"), [])
+
+    def test_search_ranking(self):
+        ids = []
+        for name, description in (("Test Rank Other", "Test Rank Zebrafx"), ("Test Rank Zebrafx", "")):
+            query = QSqlQuery()
+            query.prepare("INSERT INTO App (Name, Path, Description, IconHash, Command, Argument) VALUES (?,?,?,?,?,?)")
+            query.bindValue(0, name)
+            query.bindValue(1, "Test Path")
+            query.bindValue(2, description)
+            query.bindValue(3, "")
+            query.bindValue(4, "")
+            query.bindValue(5, "")
+            if not query.exec():
+                self.assertTrue(False, msg=query.lastError().text())
+            ids.append(query.lastInsertId())
+        # A match in the name ranks higher than a match in the description
+        self.assertEqual(search_apps("zebrafx"), [ids[1], ids[0]])
+        for id in ids:
+            QSqlQuery(f"DELETE FROM App WHERE AppID = {id}")
+
+    def test_launch_count(self):
+        count_launch(self.ids[1])
+        count_launch(self.ids[1])
+        count_launch(self.ids[0])
+        # The apps are ordered by the number of launches and the removed apps are skipped
+        self.assertEqual(most_launched(1000)[:2], [self.ids[1], self.ids[0]])
+        self.assertEqual(len(most_launched(1)), 1)
+        self.assertNotIn(-1, most_launched(1000))
+        QSqlQuery(f"DELETE FROM LaunchCount WHERE AppID IN ({self.ids[0]}, {self.ids[1]})")
+
+    @classmethod
+    def tearDownClass(self):
+        for id in self.ids:
+            QSqlQuery(f"DELETE FROM App WHERE AppID = {id}")
+            QSqlQuery(f"DELETE FROM Env WHERE AppID = {id}")
+        bash_pool.close()
+        self.window.con.close()
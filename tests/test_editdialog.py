@@ -1,14 +1,17 @@
 import unittest
 import os
 
+from bashpool import bash_pool
 from PyQt5.QtCore import Qt, QByteArray, QBuffer, QIODevice, QTimer
 from PyQt5.QtSql import QSqlQuery
 from PyQt5.QtGui import QPixmap
 from PyQt5.QtWidgets import QApplication, QAbstractItemView
 from PyQt5.QtTest import QTest
 
+from catalog import icon_hash, load_icon, save_icon
 from mainwindow import MainWindow
 from editdialog import EditDialog
+from launchplan import load_plan
 
 
 class Test_EditDialog(unittest.TestCase):
@@ -38,11 +41,11 @@ class Test_EditDialog(unittest.TestCase):
         image.save(buffer, "PNG")
 
         query = QSqlQuery()
-        query.prepare("INSERT INTO App (Name, Path, Description, Icon, Command, Argument) VALUES (?,?,?,?,?,?)")
+        query.prepare("INSERT INTO App (Name, Path, Description, IconHash, Command, Argument) VALUES (?,?,?,?,?,?)")
         query.bindValue(0, "Test Name")
         query.bindValue(1, "Test Path")
         query.bindValue(2, "Test Description")
-        query.bindValue(3, self.icon)
+        query.bindValue(3, save_icon(self.icon))
         query.bindValue(4, "Test Command")
         query.bindValue(5, "Test Argument")
         if not query.exec():
@@ -355,11 +358,11 @@ class Test_EditDialog(unittest.TestCase):
     def test_save_new(self) :
         # Remove existing test app
         query = QSqlQuery()
-        query.prepare("DELETE FROM App WHERE Name = ? AND Path = ? AND Description = ? AND Icon = ? AND Command = ? AND Argument = ?")
+        query.prepare("DELETE FROM App WHERE Name = ? AND Path = ? AND Description = ? AND IconHash = ? AND Command = ? AND Argument = ?")
         query.bindValue(0, "New Name")
         query.bindValue(1, "New Path")
         query.bindValue(2, "New Description")
-        query.bindValue(3, self.icon)
+        query.bindValue(3, icon_hash(self.icon))
         query.bindValue(4, "New Command")
         query.bindValue(5, "New Argument")
         if not query.exec():
@@ -380,11 +383,11 @@ class Test_EditDialog(unittest.TestCase):
         QTest.mouseClick(newdialog.save_btn, Qt.LeftButton)
 
         query = QSqlQuery()
-        query.prepare(f"SELECT * FROM App WHERE Name = ? AND Path = ? AND Description = ? AND Icon = ? AND Command = ? AND Argument = ?")
+        query.prepare(f"SELECT * FROM App WHERE Name = ? AND Path = ? AND Description = ? AND IconHash = ? AND Command = ? AND Argument = ?")
         query.bindValue(0, "New Name")
         query.bindValue(1, "New Path")
         query.bindValue(2, "New Description")
-        query.bindValue(3, self.icon)
+        query.bindValue(3, icon_hash(self.icon))
         query.bindValue(4, "New Command")
         query.bindValue(5, "New Argument")
         if not query.exec():
@@ -410,9 +413,13 @@ class Test_EditDialog(unittest.TestCase):
         self.assertEqual(query.value("Name"), "New Name")
         self.assertEqual(query.value("Path"), "New Path")
         self.assertEqual(query.value("Description"), "New Description")
-        self.assertEqual(query.value("Icon"), self.icon)
+        self.assertEqual(load_icon(query.value("IconHash")), self.icon)
         self.assertEqual(query.value("Command"), "New Command")
         self.assertEqual(query.value("Argument"), "New Argument")
+        # The launch plan is compiled when the app is saved
+        plan = load_plan(self.id)
+        self.assertEqual(plan.program, "New Path")
+        self.assertEqual(plan.arguments, ["New", "Argument"])
 
     def tearDown(self) :
         self.app.closeAllWindows()
@@ -422,14 +429,15 @@ class Test_EditDialog(unittest.TestCase):
         QSqlQuery(f"DELETE FROM App WHERE AppID = {self.id}")
         QSqlQuery(f"DELETE FROM Env WHERE AppID = {self.id}")
         query = QSqlQuery()
-        query.prepare("DELETE FROM App WHERE Name = ? AND Path = ? AND Description = ? AND Icon = ? AND Command = ? AND Argument = ?")
+        query.prepare("DELETE FROM App WHERE Name = ? AND Path = ? AND Description = ? AND IconHash = ? AND Command = ? AND Argument = ?")
         query.bindValue(0, "New Name")
         query.bindValue(1, "New Path")
         query.bindValue(2, "New Description")
-        query.bindValue(3, self.icon)
+        query.bindValue(3, icon_hash(self.icon))
         query.bindValue(4, "New Command")
         query.bindValue(5, "New Argument")
         if not query.exec():
             self.assertTrue(False, msg=query.lastError().text())
+        bash_pool.close()
         self.window.con.close()
         
\ No newline at end of file
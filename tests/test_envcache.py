@@ -0,0 +1,65 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from envcache import EnvCache, sourced_files
+
+
+class Test_EnvCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = EnvCache(os.path.join(self.directory, "env"))
+        self.script = os.path.join(self.directory, "setup_bash")
+        with open(self.script, "w") as file:
+            file.write("export TEST=1\n")
+
+    def test_put_get(self):
+        key = self.cache.key("export TEST=1", {"HOME": "/home/test"})
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, {"TEST": "1"})
+        self.assertEqual(self.cache.get(key), {"TEST": "1"})
+        # A new cache reads the snapshot saved by the previous one
+        self.assertEqual(EnvCache(self.cache.directory).get(key), {"TEST": "1"})
+
+    def test_mode(self):
+        # The snapshots can hold secrets, so only the user can read them, also in a directory created before
+        os.makedirs(self.cache.directory, mode=0o755)
+        os.chmod(self.cache.directory, 0o755)
+        self.cache.put("secret", {"TOKEN": "1"})
+        self.assertEqual(os.stat(self.cache.path("secret")).st_mode & 0o777, 0o600)
+        self.assertEqual(os.stat(self.cache.directory).st_mode & 0o777, 0o700)
+
+    def test_key(self):
+        key = self.cache.key("export TEST=1", {"HOME": "/home/test"})
+        self.assertEqual(key, self.cache.key("export TEST=1", {"HOME": "/home/test"}))
+        # The key changes with the commands and the environment they are run in
+        self.assertNotEqual(key, self.cache.key("export TEST=2", {"HOME": "/home/test"}))
+        self.assertNotEqual(key, self.cache.key("export TEST=1", {"HOME": "/home/other"}))
+
+    def test_sourced_files(self):
+        commands = f'export VERSION=setup\ncd "{self.directory}"\nsource "$VERSION"_bash; . /etc/profile'
+        self.assertEqual(sourced_files(commands, {}), [self.script, "/etc/profile"])
+        # The key changes when a sourced file is modified
+        commands = f"source {self.script}"
+        key = self.cache.key(commands, {})
+        mtime = os.path.getmtime(self.script)
+        os.utime(self.script, (mtime + 10, mtime + 10))
+        self.assertNotEqual(key, self.cache.key(commands, {}))
+
+    def test_ttl(self):
+        self.cache.put("expired", {"TEST": "1"})
+        self.cache.ttl = -1
+        self.assertIsNone(self.cache.get("expired"))
+        self.assertFalse(os.path.exists(self.cache.path("expired")))
+
+    def test_clear(self):
+        self.cache.put("first", {"TEST": "1"})
+        self.cache.put("second", {"TEST": "2"})
+        self.cache.remove("first")
+        self.assertIsNone(self.cache.get("first"))
+        self.cache.clear()
+        self.assertEqual(os.listdir(self.cache.directory), [])
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
@@ -1,6 +1,7 @@
 import os
 import unittest
 
+from bashpool import bash_pool
 from envdialog import EnvDialog
 from mainwindow import MainWindow
 from PyQt5.QtCore import Qt, QTimer
@@ -17,7 +18,7 @@ class Test_EnvDialog(unittest.TestCase):
 
         query = QSqlQuery()
         query.prepare(
-            "INSERT INTO App (Name, Path, Description, Icon, Command, Argument) VALUES (?,?,?,?,?,?)"
+            "INSERT INTO App (Name, Path, Description, IconHash, Command, Argument) VALUES (?,?,?,?,?,?)"
         )
         query.bindValue(0, "Test Name")
         query.bindValue(1, "Test Path")
@@ -259,4 +260,5 @@ class Test_EnvDialog(unittest.TestCase):
     def tearDownClass(self) :
         QSqlQuery(f"DELETE FROM App WHERE AppID = {self.appid}")
         QSqlQuery(f"DELETE FROM Env WHERE EnvID = {self.envid}")
+        bash_pool.close()
         self.window.con.close()
@@ -0,0 +1,32 @@
+import unittest
+
+from envreader import EnvReader
+
+
+class Test_EnvReader(unittest.TestCase):
+    def test_feed(self):
+        reader = EnvReader()
+        output = b"A=1\0JSON={\"a\": \"b=c\"}\0MULTI=line1\nline2\0EMPTY=\0"
+        # The entries split across the chunks are read once complete
+        for i in range(0, len(output), 5):
+            reader.feed(output[i : i + 5])
+        self.assertEqual(reader.finish(), {"A": "1", "JSON": '{"a": "b=c"}', "MULTI": "line1\nline2", "EMPTY": ""})
+
+    def test_start_end(self):
+        reader = EnvReader(b"token", b"token ")
+        reader.feed(b"output of the commands\0token\0A=1\0\0token 0\0B=2\0")
+        self.assertTrue(reader.ended)
+        self.assertEqual(reader.end_entry, "token 0")
+        self.assertEqual(reader.finish(), {"A": "1"})
+
+    def test_not_started(self):
+        reader = EnvReader(b"token", b"token ")
+        reader.feed(b"A=1\0\0token 3\0")
+        self.assertTrue(reader.ended)
+        self.assertIsNone(reader.finish())
+
+    def test_last_entry(self):
+        reader = EnvReader()
+        reader.feed(b"A=1\0B=2")
+        self.assertEqual(reader.values, {"A": "1"})
+        self.assertEqual(reader.finish(), {"A": "1", "B": "2"})
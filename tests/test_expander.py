@@ -0,0 +1,54 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+from expander import Expander, compile_template, new_version
+from PyQt5.QtCore import QProcessEnvironment
+
+BENCHMARK = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "expansion.py")
+
+
+class Test_Expander(unittest.TestCase):
+    def setUp(self):
+        self.env = QProcessEnvironment()
+        self.env.insert("HOME", "/home/test")
+        self.env.insert("EMPTY", "")
+        self.expander = Expander()
+
+    def test_forms(self):
+        expand = lambda text: self.expander.expand(text, self.env)
+        self.assertEqual(expand("$HOME/bin"), "/home/test/bin")
+        self.assertEqual(expand("${HOME}bin"), "/home/testbin")
+        self.assertEqual(expand('/opt/"$HOME"/bin'), "/opt//home/test/bin")
+        self.assertEqual(expand('"${HOME}"'), "/home/test")
+        self.assertEqual(expand("${UNSET:-/tmp}:${EMPTY:-empty}:${HOME:-/tmp}"), "/tmp:empty:/home/test")
+        self.assertEqual(expand('"${UNSET:-a b}"'), "a b")
+        # Unset variables are replaced with an empty text and a lone $ is kept
+        self.assertEqual(expand("$UNSET:$ 5$"), ":$ 5$")
+
+    def test_compile(self):
+        self.assertEqual(compile_template('a"$B"${C:-d}'), ("a", ("B", None), ("C", "d")))
+        self.assertIs(compile_template("$HOME"), compile_template("$HOME"))
+
+    def test_memoize(self):
+        version = new_version()
+        self.assertEqual(self.expander.expand("$HOME", self.env, version), "/home/test")
+        self.env.insert("HOME", "/home/other")
+        # The result is kept until the version changes
+        self.assertEqual(self.expander.expand("$HOME", self.env, version), "/home/test")
+        self.assertEqual(self.expander.expand("$HOME", self.env, new_version()), "/home/other")
+        self.assertEqual(self.expander.expand("$HOME", self.env), "/home/other")
+
+    def test_max_size(self):
+        expander = Expander(max_size=2)
+        for text in ("a", "b", "c"):
+            expander.expand(text, self.env, 1)
+        self.assertEqual(list(expander.results), [("b", 1), ("c", 1)])
+
+    def test_benchmark(self):
+        process = subprocess.run([sys.executable, BENCHMARK, "--json", "--sizes", "500", "5000"], capture_output=True, text=True, timeout=120)
+        results = json.loads(process.stdout)
+        # The time grows linearly with the number of references
+        self.assertLess(results["5000"]["expander"] / results["500"]["expander"], 40)
@@ -0,0 +1,108 @@
+import unittest
+
+from catalog import icon_hash
+from iconcache import ICON_SIZE, IconCache, IconLoader, icon_cache
+from PyQt5 import sip
+from PyQt5.QtCore import QBuffer, QByteArray, QIODevice, QObject, QSize
+from PyQt5.QtGui import QPixmap
+from PyQt5.QtWidgets import QApplication
+
+
+def png(pixmap):
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    pixmap.save(buffer, "PNG")
+    return data
+
+
+class Receiver(QObject):
+    def __init__(self):
+        super(Receiver, self).__init__()
+        self.ids = []
+
+    def icon_loaded(self, id):
+        self.ids.append(id)
+
+
+class Test_IconCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.app = QApplication([])
+        self.icon = png(QPixmap("icons/test.png"))
+        self.other = png(QPixmap("icons/bin.png"))
+        self.hash = icon_hash(self.icon)
+        self.other_hash = icon_hash(self.other)
+
+    def test_pixmap(self):
+        cache = IconCache()
+        pixmap = cache.pixmap(1, self.hash, self.icon)
+        self.assertEqual(pixmap.size(), QSize(ICON_SIZE, ICON_SIZE))
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+        # The same icon is not decoded again, and its data is not needed to find it
+        self.assertEqual(cache.pixmap(1, self.hash, QByteArray(self.icon)).cacheKey(), pixmap.cacheKey())
+        self.assertEqual(cache.get(1, self.hash).cacheKey(), pixmap.cacheKey())
+        self.assertEqual(cache.key(1, self.hash), (1, self.hash))
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+        self.assertEqual(len(cache), 1)
+
+    def test_changed_icon(self):
+        cache = IconCache()
+        cache.pixmap(1, self.hash, self.icon)
+        cache.pixmap(1, self.other_hash, self.other)
+        self.assertEqual(cache.misses, 2)
+        self.assertNotEqual(cache.key(1, self.hash), cache.key(1, self.other_hash))
+        cache.discard(1)
+        self.assertEqual(len(cache), 0)
+
+    def test_eviction(self):
+        cache = IconCache(max_size=2)
+        cache.pixmap(1, self.hash, self.icon)
+        cache.pixmap(2, self.hash, self.icon)
+        # Using the first icon makes the second one the least recently used
+        cache.pixmap(1, self.hash, self.icon)
+        cache.pixmap(3, self.hash, self.icon)
+        self.assertEqual(len(cache), 2)
+        self.assertTrue(cache.key(1, self.hash) in cache.pixmaps)
+        self.assertFalse(cache.key(2, self.hash) in cache.pixmaps)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_loader(self):
+        loader = IconLoader()
+        loaded = []
+        loader.loaded.connect(loaded.append)
+        # Reserve the only thread, so the tasks after the first one wait in the queue
+        loader.pool.setMaxThreadCount(1)
+        loader.pool.reserveThread()
+        for id in (-10, -11, -12):
+            loader.request(id, self.hash, self.icon)
+        loader.request(-12, self.hash, self.icon)
+        self.assertEqual(len(loader.pending), 3)
+        # The icon of a visible tile is decoded before the icons requested earlier
+        loader.promote(-12)
+        loader.pool.releaseThread()
+        loader.wait()
+        self.assertEqual(loaded, [-10, -12, -11])
+        self.assertEqual(loader.pending, {})
+        pixmap = icon_cache.get(-12, self.hash)
+        self.assertEqual(pixmap.size(), QSize(ICON_SIZE, ICON_SIZE))
+        self.assertEqual(pixmap.toImage(), IconCache().pixmap(-12, self.hash, self.icon).toImage())
+        self.assertEqual(loader.placeholder().size(), QSize(ICON_SIZE, ICON_SIZE))
+        for id in (-10, -11, -12):
+            icon_cache.discard(id)
+
+    def test_callbacks(self):
+        loader = IconLoader()
+        first, second, deleted = Receiver(), Receiver(), Receiver()
+        loader.request(-20, self.hash, self.icon, callback=first.icon_loaded)
+        loader.request(-21, self.hash, self.icon, callback=second.icon_loaded)
+        loader.request(-21, self.hash, self.icon, callback=second.icon_loaded)
+        loader.request(-21, self.hash, self.icon, callback=deleted.icon_loaded)
+        sip.delete(deleted)
+        loader.wait()
+        # Each decoded icon only calls the objects waiting for it, once each, and skips the deleted ones
+        self.assertEqual((first.ids, second.ids), ([-20], [-21]))
+        self.assertEqual(loader.callbacks, {})
+        for id in (-20, -21):
+            icon_cache.discard(id)
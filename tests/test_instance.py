@@ -0,0 +1,163 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from applauncher import DATABASE, CommandLine
+from bashpool import bash_pool
+from catalog import app_catalog
+from envcache import EnvCache, env_cache
+from instance import InstanceServer
+from launcher import LaunchJob
+from mainwindow import MainWindow
+from PyQt5.QtCore import QProcess, QProcessEnvironment
+from PyQt5.QtSql import QSqlQuery
+from PyQt5.QtTest import QSignalSpy, QTest
+from PyQt5.QtWidgets import QApplication
+
+# The command line run in a new process, as it is used from a terminal
+COMMAND = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "applauncher.py")
+
+
+class Test_Instance(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.app = QApplication([])
+        self.window = MainWindow()
+        # Keep the environment snapshots of the test out of the user cache
+        self.cache = tempfile.mkdtemp()
+        # The command lines handed to the server are run in this process, and the invocations run in their own with XDG_CACHE_HOME
+        LaunchJob.env_cache = EnvCache(self.cache)
+        self.name = f"applauncher-test-{os.getpid()}"
+        self.server = InstanceServer(DATABASE, name=self.name)
+        self.server.listen()
+        query = QSqlQuery()
+        query.prepare("INSERT INTO App (Name, Path, Description, IconHash, Command, Argument) VALUES (?,?,?,?,?,?)")
+        query.bindValue(0, "Test Instance")
+        query.bindValue(1, "true")
+        query.bindValue(2, "")
+        query.bindValue(3, "")
+        query.bindValue(4, "export TEST_INSTANCE=`echo warm`")
+        query.bindValue(5, "")
+        query.exec()
+        self.id = query.lastInsertId()
+        query = QSqlQuery()
+        query.prepare("INSERT INTO Env (Name, Value, AppID, ExeOrder) VALUES (?,?,?,?)")
+        query.bindValue(0, "TEST_INSTANCE_ENV")
+        query.bindValue(1, '"$TEST_INSTANCE_CALLER"-"$TEST_INSTANCE"')
+        query.bindValue(2, self.id)
+        query.bindValue(3, 1)
+        query.exec()
+        app_catalog.update_app(self.id)
+        query = QSqlQuery()
+        query.prepare("INSERT INTO App (Name, Path, Description, IconHash, Command, Argument) VALUES (?,?,?,?,?,?)")
+        query.bindValue(0, "Sleeper App")
+        query.bindValue(1, "true")
+        query.bindValue(2, "")
+        query.bindValue(3, "")
+        query.bindValue(4, "sleep 1")
+        query.bindValue(5, "")
+        query.exec()
+        self.slow_id = query.lastInsertId()
+        app_catalog.update_app(self.slow_id)
+
+    def start_command(self, *args):
+        # Start the command line without waiting for it, so the server in this process can reply
+        process = QProcess()
+        env = QProcessEnvironment.systemEnvironment()
+        env.insert("APPLAUNCHER_INSTANCE", self.name)
+        env.insert("XDG_CACHE_HOME", self.cache)
+        env.insert("TEST_INSTANCE_CALLER", "caller")
+        process.setProcessEnvironment(env)
+        process.start(sys.executable, [COMMAND] + list(args))
+        return process
+
+    def run_command(self, *args):
+        process = self.start_command(*args)
+        spy = QSignalSpy(process.finished)
+        self.assertTrue(spy.wait(30000))
+        return process.exitCode(), process.readAllStandardOutput().data().decode(), process.readAllStandardError().data().decode()
+
+    def test_listen(self):
+        self.assertTrue(self.server.server.isListening())
+        self.assertEqual(self.server.server.serverName(), self.name)
+
+    def test_handle(self):
+        self.assertEqual(self.server.handle({"command": "ping"}), {"status": 0})
+        spy = QSignalSpy(self.server.show_requested)
+        self.assertEqual(self.server.handle({"command": "show"}), {"status": 0})
+        self.assertEqual(len(spy), 1)
+        # The command lines using another database are run by the invocation
+        self.assertEqual(self.server.handle({"command": "cli", "argv": ["list"], "database": "/tmp/other.db"}), {"status": None})
+        self.assertEqual(self.server.handle({"command": "unknown"}), {"status": None})
+
+    def test_command_line(self):
+        command = CommandLine(["list", "--json", "Test Instance"])
+        command.start()
+        reply = command.output()
+        self.assertEqual(reply["status"], 0)
+        self.assertEqual([app["AppID"] for app in json.loads(reply["stdout"])], [self.id])
+        command = CommandLine(["launch"])
+        command.start()
+        reply = command.output()
+        self.assertEqual(reply["status"], 2)
+        self.assertTrue("usage: applauncher" in reply["stderr"])
+        # The launch runs in the background and the output goes to the command line only
+        command = CommandLine(["env", "Test Instance"], dict(os.environ, TEST_INSTANCE_CALLER="direct"))
+        spy = QSignalSpy(command.finished)
+        command.start()
+        self.assertEqual(command.status, None)
+        print("Error not for the command line")
+        self.assertTrue(spy.wait(10000))
+        self.assertEqual(spy[0][0], 0)
+        self.assertTrue("TEST_INSTANCE_ENV=direct-warm" in command.output()["stdout"].splitlines())
+        self.assertFalse("Error" in command.output()["stdout"])
+        # The reply of a command line is written when it ends
+        self.assertEqual(self.server.handle({"command": "cli", "argv": ["list"], "database": DATABASE}), None)
+
+    def test_concurrent(self):
+        slow = self.start_command("launch", "Sleeper App")
+        slow_spy = QSignalSpy(slow.finished)
+        # Wait until the slow launch is running in the server
+        for i in range(100):
+            if self.server.commands:
+                break
+            QTest.qWait(50)
+        self.assertEqual(len(self.server.commands), 1)
+        status, stdout, stderr = self.run_command("list", "Test Instance")
+        self.assertEqual(status, 0, msg=stderr)
+        # The later invocation is not held up by the slow launch
+        self.assertEqual(len(slow_spy), 0)
+        self.assertTrue(slow_spy.wait(30000))
+        self.assertEqual(slow.exitCode(), 0, msg=slow.readAllStandardError().data().decode())
+
+    def test_forward(self):
+        spy = QSignalSpy(self.server.server.newConnection)
+        status, stdout, stderr = self.run_command("env", "Test Instance")
+        self.assertEqual(status, 0, msg=stderr)
+        # The command line is run by the instance with the environment of the invocation
+        self.assertEqual(len(spy), 1)
+        self.assertTrue("TEST_INSTANCE_ENV=caller-warm" in stdout.splitlines())
+
+    def test_local(self):
+        spy = QSignalSpy(self.server.server.newConnection)
+        status, stdout, stderr = self.run_command("--local", "launch", "Test Instance")
+        self.assertEqual(status, 0, msg=stderr)
+        self.assertEqual(len(spy), 0)
+
+    @classmethod
+    def tearDownClass(self):
+        self.server.close()
+        shutil.rmtree(self.cache, ignore_errors=True)
+        LaunchJob.env_cache = env_cache
+        QSqlQuery(f"DELETE FROM App WHERE AppID = {self.id}")
+        QSqlQuery(f"DELETE FROM App WHERE AppID = {self.slow_id}")
+        QSqlQuery(f"DELETE FROM LaunchCount WHERE AppID = {self.slow_id}")
+        QSqlQuery(f"DELETE FROM LaunchPlan WHERE AppID = {self.slow_id}")
+        QSqlQuery(f"DELETE FROM Env WHERE AppID = {self.id}")
+        QSqlQuery(f"DELETE FROM LaunchCount WHERE AppID = {self.id}")
+        QSqlQuery(f"DELETE FROM LaunchPlan WHERE AppID = {self.id}")
+        bash_pool.close()
+        self.window.con.close()
@@ -0,0 +1,168 @@
+import shutil
+import tempfile
+import time
+import unittest
+
+from bashpool import bash_pool
+from envcache import EnvCache
+from launcher import LaunchJob, Launcher, Substitution, bash_script, find_backticks, run_backticks, substitute
+from mainwindow import MainWindow
+from PyQt5.QtTest import QSignalSpy
+from PyQt5.QtWidgets import QApplication
+
+
+class Test_Launcher(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.app = QApplication([])
+        self.window = MainWindow()
+
+    def setUp(self):
+        self.cache = EnvCache(tempfile.mkdtemp())
+
+    def job(self, command, timeout=None):
+        launcher = Launcher()
+        launcher.path = "true"
+        launcher.command = command
+        job = LaunchJob(launcher, timeout=timeout)
+        job.env_cache = self.cache
+        self.states = []
+        self.errors = []
+        job.state_changed.connect(self.states.append)
+        job.stderr_received.connect(self.errors.append)
+        return job
+
+    def test_find_backticks(self):
+        self.assertEqual(find_backticks("export A=`date +%s`\ncd `pwd`"), ["date +%s", "pwd"])
+        self.assertEqual(find_backticks("export A=1"), [])
+        self.assertEqual(bash_script("export A=1\n\nexport B=2"), "export A=1\n\nexport B=2\nprintf '\\0\\0'\nenv -0")
+
+    def test_substitute(self):
+        self.assertEqual(substitute("a`x`b`y`c`x`d`e", {"x": "1", "y": "2"}), "a1b2c1d`e")
+        # Each identical command is run once
+        self.assertEqual(Substitution("`echo a` `echo b` `echo a`").pending, ["echo a", "echo b"])
+        self.assertEqual(run_backticks(["echo a", "echo b", "echo a"], max_workers=1), {"echo a": "a\n", "echo b": "b\n"})
+
+    def test_parallel_backticks(self):
+        job = self.job("export TEST_A=`sleep 0.5`\nexport TEST_B=`sleep 0.5`\nexport TEST_C=`echo c`\nexport TEST_D=d")
+        spy = QSignalSpy(job.finished)
+        start = time.perf_counter()
+        job.start()
+        self.assertTrue(spy.wait(5000))
+        # The backtick commands run at the same time and are substituted in order
+        self.assertLess(time.perf_counter() - start, 0.95)
+        self.assertEqual(job.commands, "export TEST_A=\nexport TEST_B=\nexport TEST_C=c\n\nexport TEST_D=d")
+        self.assertEqual(job.launcher.env.value("TEST_C"), "c")
+
+    def test_launch(self):
+        job = self.job("export TEST_JOB=`echo hello`\nexport TEST_JOB2=$TEST_JOB")
+        spy = QSignalSpy(job.finished)
+        job.start()
+        # The commands run in the background
+        self.assertTrue(job.is_running())
+        self.assertEqual(job.state, LaunchJob.SUBSTITUTING)
+        self.assertTrue(spy.wait(5000))
+        self.assertEqual(spy[0], [True])
+        self.assertEqual(self.states, [LaunchJob.SUBSTITUTING, LaunchJob.PREPARING, LaunchJob.STARTING, LaunchJob.LAUNCHED])
+        self.assertEqual(job.launcher.env.value("TEST_JOB"), "hello")
+        self.assertEqual(job.launcher.env.value("TEST_JOB2"), "hello")
+
+    def test_cached_env(self):
+        job = self.job("export TEST_JOB=cached")
+        spy = QSignalSpy(job.finished)
+        job.start()
+        self.assertTrue(spy.wait(5000))
+        # The repeat launch starts the app with the cached environment without running bash
+        job = self.job("export TEST_JOB=cached")
+        job.start()
+        self.assertEqual(self.states, [LaunchJob.STARTING, LaunchJob.LAUNCHED])
+        self.assertEqual(job.launcher.env.value("TEST_JOB"), "cached")
+
+    def test_fork(self):
+        job = self.job('echo output\nexport TEST_JOB=a=b\nexport TEST_MULTI="a\nb=c"\nexport TEST_QUOTE=\'"q" $x\'')
+        job.bash_pool = None
+        spy = QSignalSpy(job.finished)
+        job.start()
+        self.assertTrue(spy.wait(5000))
+        self.assertEqual(spy[0], [True])
+        # The output of the commands is skipped, and the quotes, = and newlines are kept through bash -c and env -0
+        self.assertEqual(job.launcher.env.value("TEST_JOB"), "a=b")
+        self.assertEqual(job.launcher.env.value("TEST_MULTI"), "a\nb=c")
+        self.assertEqual(job.launcher.env.value("TEST_QUOTE"), '"q" $x')
+        launcher = Launcher()
+        self.assertTrue(launcher.run_commands('export TEST_MULTI="a\nb=c"'))
+        self.assertEqual(launcher.env.value("TEST_MULTI"), "a\nb=c")
+
+    def test_fork_repeat(self):
+        launcher = None
+        values = []
+        for i in range(2):
+            job = self.job('export TEST_FORK="$TEST_FORK"-x')
+            if launcher is not None:
+                job.launcher = launcher
+            launcher = job.launcher
+            job.bash_pool = None
+            job.env_cache = None
+            spy = QSignalSpy(job.finished)
+            job.start()
+            self.assertTrue(spy.wait(5000))
+            values.append(launcher.env.value("TEST_FORK"))
+        # The commands run in the base environment instead of the one left by the previous launch
+        self.assertEqual(values, ["-x", "-x"])
+
+    def test_no_commands(self):
+        job = self.job("")
+        job.start()
+        # The app is started at once
+        self.assertEqual(job.state, LaunchJob.LAUNCHED)
+
+    def test_stderr(self):
+        job = self.job("echo test stderr >&2")
+        failed = QSignalSpy(job.failed)
+        finished = QSignalSpy(job.finished)
+        job.start()
+        self.assertTrue(finished.wait(5000))
+        self.assertEqual(finished[0], [False])
+        self.assertEqual(job.state, LaunchJob.FAILED)
+        self.assertEqual("".join(self.errors), "test stderr\n")
+        self.assertEqual(failed[0], ["Run Additional Command Failed", "test stderr\n"])
+
+    def test_timeout(self):
+        job = self.job("sleep 10", timeout=200)
+        failed = QSignalSpy(job.failed)
+        job.start()
+        self.assertTrue(failed.wait(5000))
+        self.assertEqual(job.state, LaunchJob.TIMED_OUT)
+        self.assertFalse(job.is_running())
+
+    def test_cancel(self):
+        job = self.job("sleep 10")
+        finished = QSignalSpy(job.finished)
+        job.start()
+        job.cancel()
+        self.assertEqual(job.state, LaunchJob.CANCELLED)
+        self.assertEqual(finished[0], [False])
+        # The cancelled job does not go on when the killed process finishes
+        QSignalSpy(job.state_changed).wait(300)
+        self.assertEqual(self.states[-1], LaunchJob.CANCELLED)
+
+    def test_concurrent(self):
+        jobs = [self.job("sleep 0.5"), self.job("sleep 0.5")]
+        spies = [QSignalSpy(job.finished) for job in jobs]
+        start = time.perf_counter()
+        for job in jobs:
+            job.start()
+        for spy in spies:
+            if len(spy) == 0:
+                self.assertTrue(spy.wait(5000))
+        # Both jobs run at the same time
+        self.assertLess(time.perf_counter() - start, 0.95)
+        self.assertEqual([job.state for job in jobs], [LaunchJob.LAUNCHED] * 2)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache.directory)
+
+    @classmethod
+    def tearDownClass(self):
+        bash_pool.close()
+        self.window.con.close()
@@ -0,0 +1,144 @@
+import shutil
+import tempfile
+import unittest
+
+from bashpool import bash_pool
+from catalog import app_catalog
+from envcache import EnvCache, env_cache
+from launcher import LaunchJob, Launcher
+from launchlog import STAGES, LaunchLog, launch_log, percentile
+from mainwindow import MainWindow
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtSql import QSqlQuery
+from PyQt5.QtTest import QSignalSpy, QTest
+from PyQt5.QtWidgets import QApplication
+
+
+class Test_LaunchLog(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.app = QApplication([])
+        self.window = MainWindow()
+        # Keep the environment snapshots of the test out of the user cache
+        LaunchJob.env_cache = EnvCache(tempfile.mkdtemp())
+        query = QSqlQuery()
+        query.prepare("INSERT INTO App (Name, Path, Description, IconHash, Command, Argument) VALUES (?,?,?,?,?,?)")
+        query.bindValue(0, "Test Launch Log")
+        query.bindValue(1, "true")
+        query.bindValue(2, "")
+        query.bindValue(3, "")
+        query.bindValue(4, "export TEST_LOG=`echo log`")
+        query.bindValue(5, "")
+        query.exec()
+        self.id = query.lastInsertId()
+        app_catalog.update_app(self.id)
+
+    def setUp(self):
+        self.test = False
+        QSqlQuery(f"DELETE FROM LaunchLog WHERE AppID = {self.id}")
+        self.log = LaunchLog()
+        LaunchJob.launch_log = self.log
+
+    def launch(self, prepare_only=False):
+        job = LaunchJob(Launcher(self.id))
+        job.prepare_only = prepare_only
+        spy = QSignalSpy(job.finished)
+        job.start()
+        self.assertTrue(spy.wait(5000))
+        return job
+
+    def test_percentile(self):
+        self.assertEqual(percentile([], 0.5), None)
+        self.assertEqual(percentile([3.0], 0.95), 3.0)
+        values = list(range(100, 0, -1))
+        self.assertEqual(percentile(values, 0.5), 50)
+        self.assertEqual(percentile(values, 0.95), 95)
+
+    def test_batch(self):
+        self.log.batch_size = 3
+        self.log.record(self.id, {"Exec": 0.001}, 0.002, "launched")
+        self.log.record(self.id, {}, 0.003, "failed")
+        # The launches are kept until the batch is full or the timer fires
+        self.assertEqual(self.log.written, 0)
+        self.assertTrue(self.log.timer.isActive())
+        self.log.record(self.id, {"Commands": 0.004, "Exec": 0.001}, 0.006, "launched")
+        self.assertEqual(self.log.written, 3)
+        self.assertEqual(self.log.pending, [])
+        query = QSqlQuery(f"SELECT Commands, Exec, Total, State FROM LaunchLog WHERE AppID = {self.id} ORDER BY LogID")
+        rows = []
+        while query.next():
+            rows.append([query.value(column) for column in range(4)])
+        self.assertEqual(rows[1][2:], [3.0, "failed"])
+        self.assertAlmostEqual(rows[2][0], 4.0)
+        self.assertAlmostEqual(rows[2][1], 1.0)
+
+    def test_timer(self):
+        self.log.delay = 10
+        self.log.record(self.id, {}, 0.001, "launched")
+        QTest.qWait(100)
+        self.assertEqual(self.log.written, 1)
+
+    def test_statistics(self):
+        for total in range(1, 21):
+            self.log.record(self.id, {"Exec": total / 1000}, total / 100, "launched")
+        self.log.record(self.id, {}, 1, "timed out")
+        statistics = self.log.statistics()[self.id]
+        self.assertEqual(statistics["Count"], 21)
+        self.assertEqual(statistics["Failed"], 1)
+        self.assertAlmostEqual(statistics["Total"][0], 100.0)
+        self.assertAlmostEqual(statistics["Total"][1], 190.0)
+        self.assertAlmostEqual(statistics["Exec"][1], 19.0)
+        self.assertEqual(statistics["Substitution"], (None, None))
+
+    def test_launch_job(self):
+        self.launch()
+        self.assertEqual(len(self.log.pending), 1)
+        row = self.log.pending[0]
+        self.assertEqual(row[0], self.id)
+        self.assertEqual(row[-1], LaunchJob.LAUNCHED)
+        # Every stage is timed and the stages are part of the total time
+        stages = dict(zip(STAGES, row[2:6]))
+        self.assertTrue(all(stages[stage] is not None and stages[stage] >= 0 for stage in STAGES))
+        self.assertTrue(sum(stages.values()) <= row[6])
+        # The preparation of a launch is not a launch
+        self.launch(prepare_only=True)
+        self.assertEqual(len(self.log.pending), 1)
+
+    def test_run_commands(self):
+        launcher = Launcher(self.id)
+        self.assertTrue(launcher.run_commands(launcher.command))
+        self.assertTrue("Substitution" in launcher.timings and "Commands" in launcher.timings)
+
+    def test_dialog(self):
+        self.log.record(self.id, {"Exec": 0.002}, 0.0125, "launched")
+        self.log.flush()
+        LaunchJob.launch_log = launch_log
+        launch_log.flush()
+        qTimer = QTimer(self.window)
+        qTimer.setSingleShot(True)
+        qTimer.timeout.connect(self.check_dialog)
+        qTimer.start(100)
+        QTest.mouseClick(self.window.launch_times_btn, Qt.LeftButton)
+        self.assertTrue(self.test, msg="Failed to open Launch Times Dialog")
+
+    def check_dialog(self):
+        widget = self.app.activeModalWidget()
+        if type(widget).__name__ == "LaunchTimesDialog":
+            table = widget.times_table
+            rows = [row for row in range(table.rowCount()) if table.item(row, 0).text() == "Test Launch Log"]
+            self.test = len(rows) == 1 and table.item(rows[0], 3).text() == "12.5" and table.item(rows[0], 8).text() == "2.0 / 2.0"
+            QTest.mouseClick(widget.close_btn, Qt.LeftButton)
+        else:
+            self.test = False
+
+    @classmethod
+    def tearDownClass(self):
+        shutil.rmtree(LaunchJob.env_cache.directory, ignore_errors=True)
+        LaunchJob.env_cache = env_cache
+        LaunchJob.launch_log = launch_log
+        QSqlQuery(f"DELETE FROM App WHERE AppID = {self.id}")
+        QSqlQuery(f"DELETE FROM LaunchCount WHERE AppID = {self.id}")
+        QSqlQuery(f"DELETE FROM LaunchPlan WHERE AppID = {self.id}")
+        QSqlQuery(f"DELETE FROM LaunchLog WHERE AppID = {self.id}")
+        bash_pool.close()
+        self.window.con.close()
@@ -0,0 +1,92 @@
+import unittest
+
+from bashpool import bash_pool
+from catalog import app_catalog
+from launcher import Launcher
+from launchplan import PLAN_VERSION, LaunchPlan, launch_plans, load_plan, split_arguments
+from mainwindow import MainWindow
+from PyQt5.QtSql import QSqlQuery
+from PyQt5.QtWidgets import QApplication
+
+
+class Test_LaunchPlan(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.app = QApplication([])
+        self.window = MainWindow()
+
+    def setUp(self):
+        query = QSqlQuery()
+        query.prepare("INSERT INTO App (Name, Path, Description, IconHash, Command, Argument) VALUES (?,?,?,?,?,?)")
+        query.bindValue(0, "Test Plan")
+        query.bindValue(1, '"$TEST_PLAN_ROOT"/bin/app')
+        query.bindValue(2, "")
+        query.bindValue(3, "")
+        query.bindValue(4, "export TEST_PLAN_ROOT=/opt/plan")
+        query.bindValue(5, '-v --title "Test Plan" "$TEST_PLAN_ROOT"')
+        query.exec()
+        self.id = query.lastInsertId()
+        for order, (name, value) in enumerate((("TEST_PLAN_A", "a"), ("TEST_PLAN_B", '"$TEST_PLAN_A"b'))):
+            query = QSqlQuery()
+            query.prepare("INSERT INTO Env (Name, Value, AppID, ExeOrder) VALUES (?,?,?,?)")
+            query.bindValue(0, name)
+            query.bindValue(1, value)
+            query.bindValue(2, self.id)
+            query.bindValue(3, order + 1)
+            query.exec()
+
+    def test_compile(self):
+        plan = launch_plans.compile(self.id)
+        self.assertEqual(plan.program, '"$TEST_PLAN_ROOT"/bin/app')
+        self.assertEqual(plan.arguments, ["-v", "--title", "Test Plan", "$TEST_PLAN_ROOT"])
+        self.assertEqual(plan.envs, [("TEST_PLAN_A", "a"), ("TEST_PLAN_B", '"$TEST_PLAN_A"b')])
+        # The plan is saved with the version stamp
+        saved = load_plan(self.id)
+        self.assertEqual(saved.version, PLAN_VERSION)
+        self.assertEqual(saved.stamp, plan.stamp)
+        self.assertEqual(saved.arguments, plan.arguments)
+        self.assertEqual(saved.envs, plan.envs)
+
+    def test_get(self):
+        launch_plans.compile(self.id)
+        compiled = launch_plans.compiled
+        launch_plans.discard(self.id)
+        # The saved plan is used if its inputs are not changed
+        self.assertEqual(launch_plans.get(self.id).envs[0], ("TEST_PLAN_A", "a"))
+        self.assertEqual(launch_plans.compiled, compiled)
+        # The plan is compiled again when the app is changed
+        QSqlQuery(f"UPDATE App SET Argument = '-x' WHERE AppID = {self.id}")
+        app_catalog.update_app(self.id)
+        self.assertEqual(launch_plans.get(self.id).arguments, ["-x"])
+        self.assertEqual(launch_plans.compiled, compiled + 1)
+
+    def test_version(self):
+        launch_plans.compile(self.id)
+        QSqlQuery(f"UPDATE LaunchPlan SET Version = 0 WHERE AppID = {self.id}")
+        launch_plans.discard(self.id)
+        self.assertEqual(launch_plans.get(self.id).version, PLAN_VERSION)
+        self.assertEqual(load_plan(self.id).version, PLAN_VERSION)
+
+    def test_launch(self):
+        launcher = Launcher(self.id)
+        launcher.load_env({"PATH": "/usr/bin:/bin", "TEST_PLAN_ROOT": "/opt/plan"})
+        launcher.set_envs()
+        self.assertEqual(launcher.env.value("TEST_PLAN_B"), "ab")
+        plan = launcher.plan()
+        self.assertEqual([launcher.replace_env(argument) for argument in plan.arguments], ["-v", "--title", "Test Plan", "/opt/plan"])
+        self.assertEqual(launcher.replace_env(plan.program), "/opt/plan/bin/app")
+
+    def test_split_arguments(self):
+        self.assertEqual(split_arguments("a 'b c' \"d e\""), ["a", "b c", "d e"])
+        self.assertEqual(split_arguments('a "b'), ["a", '"b'])
+        self.assertEqual(LaunchPlan.build(None, {"Path": "p", "Argument": "", "Command": ""}, []).arguments, [])
+
+    def tearDown(self):
+        QSqlQuery(f"DELETE FROM App WHERE AppID = {self.id}")
+        QSqlQuery(f"DELETE FROM Env WHERE AppID = {self.id}")
+        app_catalog.remove_app(self.id)
+
+    @classmethod
+    def tearDownClass(self):
+        bash_pool.close()
+        self.window.con.close()
@@ -1,6 +1,8 @@
 import math
 import unittest
 
+from bashpool import bash_pool
+from catalog import app_catalog
 from mainwindow import MainWindow
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtSql import QSqlQuery
@@ -51,6 +53,55 @@ class Test_MainWindow(unittest.TestCase):
             math.ceil((query.at() + 1) / int((self.window.size().width() - 36) / 238)),
         )
 
+    def test_search(self):
+        ids = []
+        for name in ("Test Search Alpha", "Test Search Beta"):
+            query = QSqlQuery()
+            query.prepare("INSERT INTO App (Name, Path, Description, IconHash, Command, Argument) VALUES (?,?,?,?,?,?)")
+            query.bindValue(0, name)
+            query.bindValue(1, "Test Path")
+            query.bindValue(2, "Test Description")
+            query.bindValue(3, "")
+            query.bindValue(4, "")
+            query.bindValue(5, "")
+            if not query.exec():
+                self.assertTrue(False, msg=query.lastError().text())
+            ids.append(query.lastInsertId())
+            app_catalog.update_app(ids[-1])
+        alpha = self.window.widgets[ids[0]]
+        beta = self.window.widgets[ids[1]]
+
+        # Typing only restarts the search timer
+        QTest.keyClicks(self.window.search, "Test Search Be")
+        self.assertTrue(self.window.search_timer.isActive())
+        self.assertTrue(alpha.isVisibleTo(self.window))
+        QTest.qWait(self.window.search_delay + 100)
+        self.assertFalse(self.window.search_timer.isActive())
+        self.assertFalse(alpha.isVisibleTo(self.window))
+        self.assertTrue(beta.isVisibleTo(self.window))
+        self.assertEqual(self.window.frame_layout.count(), 1)
+        self.assertEqual(self.window.frame_layout.itemAtPosition(0, 0).widget(), beta)
+
+        # The existing widgets are shown again instead of being recreated
+        self.window.search.clear()
+        QTest.keyClick(self.window.search, Qt.Key_Return)
+        self.assertFalse(self.window.search_timer.isActive())
+        self.assertEqual(self.window.widgets[ids[0]], alpha)
+        self.assertEqual(self.window.widgets[ids[1]], beta)
+        self.assertTrue(alpha.isVisibleTo(self.window))
+
+        # Fuzzy search matches abbreviations of the names
+        self.window.search.setText("tsalph")
+        self.window.fuzzy.setChecked(True)
+        self.assertFalse(self.window.search_timer.isActive())
+        self.assertEqual(self.window.frame_layout.itemAtPosition(0, 0).widget(), alpha)
+        self.assertFalse(beta.isVisibleTo(self.window))
+
+        for id in ids:
+            QSqlQuery(f"DELETE FROM App WHERE AppID = {id}")
+            app_catalog.remove_app(id)
+        self.assertFalse(ids[0] in self.window.widgets)
+
     def test_resize(self):
         self.window.resize(1280, 720)
         self.assertEqual(self.window.size().width(), 1280)
@@ -83,4 +134,5 @@ class Test_MainWindow(unittest.TestCase):
 
     def tearDown(self) :
         self.app.closeAllWindows()
+        bash_pool.close()
         self.window.con.close()
\ No newline at end of file
@@ -0,0 +1,92 @@
+import shutil
+import tempfile
+import unittest
+
+from bashpool import bash_pool
+from catalog import app_catalog
+from envcache import EnvCache, env_cache
+from launcher import LaunchJob, Launcher
+from mainwindow import MainWindow
+from prewarm import prewarmer
+from PyQt5.QtSql import QSqlQuery
+from PyQt5.QtTest import QSignalSpy
+from PyQt5.QtWidgets import QApplication
+
+
+class Test_Prewarm(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.app = QApplication([])
+        self.window = MainWindow()
+        # Keep the environment snapshots of the test out of the user cache
+        LaunchJob.env_cache = EnvCache(tempfile.mkdtemp())
+        query = QSqlQuery()
+        query.prepare("INSERT INTO App (Name, Path, Description, IconHash, Command, Argument) VALUES (?,?,?,?,?,?)")
+        query.bindValue(0, "Test Prewarm")
+        query.bindValue(1, "true")
+        query.bindValue(2, "")
+        query.bindValue(3, "")
+        query.bindValue(4, "export TEST_PREWARM=`echo warm`\nexport TEST_PREWARM2=$TEST_PREWARM")
+        query.bindValue(5, "")
+        query.exec()
+        self.id = query.lastInsertId()
+        query = QSqlQuery()
+        query.prepare("INSERT INTO Env (Name, Value, AppID, ExeOrder) VALUES (?,?,?,?)")
+        query.bindValue(0, "TEST_PREWARM_ENV")
+        query.bindValue(1, '"$TEST_PREWARM"')
+        query.bindValue(2, self.id)
+        query.bindValue(3, 1)
+        query.exec()
+
+    def setUp(self):
+        prewarmer.enabled = True
+        prewarmer.ready = {}
+
+    def warm(self):
+        prewarmer.warm(self.id)
+        self.assertTrue(self.id in prewarmer.jobs)
+        self.assertTrue(QSignalSpy(prewarmer.jobs[self.id].finished).wait(5000))
+
+    def test_warm(self):
+        self.warm()
+        self.assertTrue(prewarmer.is_ready(self.id))
+        launcher = Launcher(self.id)
+        self.assertTrue(prewarmer.apply(launcher))
+        # The prepared launch only starts the app
+        states = []
+        job = LaunchJob(launcher)
+        job.state_changed.connect(states.append)
+        job.start()
+        self.assertEqual(states, [LaunchJob.STARTING, LaunchJob.LAUNCHED])
+        self.assertEqual(launcher.env.value("TEST_PREWARM2"), "warm")
+        self.assertEqual(launcher.env.value("TEST_PREWARM_ENV"), "warm")
+        # The prepared launcher is used once
+        self.assertFalse(prewarmer.apply(Launcher(self.id)))
+
+    def test_expired(self):
+        self.warm()
+        prewarmer.hold = -1
+        self.assertFalse(prewarmer.apply(Launcher(self.id)))
+        prewarmer.hold = 60
+
+    def test_discard(self):
+        self.warm()
+        # The prepared launcher is dropped when the app is changed
+        app_catalog.update_app(self.id)
+        self.assertFalse(prewarmer.is_ready(self.id))
+
+    def test_disabled(self):
+        prewarmer.enabled = False
+        prewarmer.warm(self.id)
+        self.assertFalse(self.id in prewarmer.jobs)
+
+    @classmethod
+    def tearDownClass(self):
+        prewarmer.enabled = False
+        shutil.rmtree(LaunchJob.env_cache.directory, ignore_errors=True)
+        LaunchJob.env_cache = env_cache
+        QSqlQuery(f"DELETE FROM App WHERE AppID = {self.id}")
+        QSqlQuery(f"DELETE FROM Env WHERE AppID = {self.id}")
+        QSqlQuery(f"DELETE FROM LaunchCount WHERE AppID = {self.id}")
+        bash_pool.close()
+        self.window.con.close()
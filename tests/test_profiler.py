@@ -0,0 +1,103 @@
+import json
+import os
+import pstats
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from bashpool import bash_pool
+from mainwindow import MainWindow
+from profiler import Profiler, profile_mode, profiled, profiler
+from PyQt5.QtWidgets import QApplication
+
+# The command line run in a new process, as it is used from a terminal
+COMMAND = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "applauncher.py")
+
+
+class Test_Profiler(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.app = QApplication([])
+        self.window = MainWindow()
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_profile_mode(self):
+        self.assertEqual(profile_mode(None), None)
+        self.assertEqual(profile_mode(""), None)
+        self.assertEqual(profile_mode("0"), None)
+        self.assertEqual(profile_mode("pstats"), "pstats")
+        self.assertEqual(profile_mode("1"), "trace")
+
+    def test_off(self):
+        test_profiler = Profiler(directory=self.directory)
+        with test_profiler.span("off"):
+            pass
+        test_profiler.record("off", 0, 1)
+        self.assertEqual(test_profiler.events, [])
+        self.assertEqual(test_profiler.save(), "")
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_trace(self):
+        test_profiler = Profiler("trace", self.directory)
+        with test_profiler.span("outer"):
+            with test_profiler.span("inner"):
+                pass
+        test_profiler.record("launch", 1.0, 0.5, {"Exec": 2.0})
+        path = test_profiler.save()
+        self.assertTrue(path.endswith(".json"))
+        with open(path) as file:
+            events = json.load(file)["traceEvents"]
+        # The inner span ends first and lies within the outer span
+        self.assertEqual([event["name"] for event in events], ["inner", "outer", "launch"])
+        inner, outer, launch = events
+        self.assertTrue(all(event["ph"] == "X" for event in events))
+        self.assertTrue(outer["ts"] <= inner["ts"] and inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"])
+        self.assertEqual((launch["ts"], launch["dur"], launch["args"]), (1e6, 5e5, {"Exec": 2.0}))
+
+    def test_pstats(self):
+        test_profiler = Profiler("pstats", self.directory)
+        with test_profiler.span("outer"):
+            with test_profiler.span("inner"):
+                sorted(range(100))
+        self.assertEqual(test_profiler.depth, 0)
+        path = test_profiler.save()
+        self.assertTrue(path.endswith(".pstats"))
+        functions = [function[2] for function in pstats.Stats(path).stats]
+        self.assertTrue("<built-in method builtins.sorted>" in functions)
+
+    def test_profiled(self):
+        mode = profiler.mode
+        events = profiler.events
+        profiler.mode = "trace"
+        profiler.events = []
+        try:
+            self.window.add_widgets()
+            names = [event["name"] for event in profiler.events]
+        finally:
+            profiler.mode = mode
+            profiler.events = events
+        self.assertTrue("MainWindow.add_widgets" in names)
+        # The decorated function keeps its name and docstring
+        self.assertEqual(MainWindow.add_widgets.__name__, "add_widgets")
+        self.assertEqual(profiled(len)(range(3)), 3)
+
+    def test_command(self):
+        env = dict(os.environ, XDG_CACHE_HOME=self.directory)
+        env.pop("DISPLAY", None)
+        result = subprocess.run([sys.executable, COMMAND, "--profile", "list"], env=env, capture_output=True, text=True, timeout=60)
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        files = os.listdir(os.path.join(self.directory, "applauncher", "profiles"))
+        self.assertEqual(len(files), 1)
+        self.assertTrue(files[0] in result.stderr)
+
+    @classmethod
+    def tearDownClass(self):
+        bash_pool.close()
+        self.window.con.close()
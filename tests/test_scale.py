@@ -0,0 +1,46 @@
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import unittest
+
+BENCHMARK = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "scale.py")
+sys.path.insert(0, os.path.dirname(BENCHMARK))
+
+from scale import compare, generate
+
+
+class Test_Scale(unittest.TestCase):
+    def test_generate(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "catalog.db")
+            generate(path, 60, max_envs=50)
+            con = sqlite3.connect(path)
+            self.assertEqual(con.execute("SELECT COUNT(*) FROM App").fetchone()[0], 60)
+            self.assertEqual(con.execute("SELECT COUNT(*) FROM Icon").fetchone()[0], 60)
+            self.assertEqual(con.execute("SELECT MAX(ExeOrder) FROM Env").fetchone()[0], 50)
+            # The apps can be found with the full-text search index
+            self.assertEqual(con.execute("SELECT rowid FROM AppSearch WHERE AppSearch MATCH 'Bench'").fetchall()[0][0], 1)
+            con.close()
+
+    def test_compare(self):
+        old = {"results": {"100": {"window": 0.1, "resize": {"p95": 0.01, "count": 4}}}}
+        new = {"results": {"100": {"window": 0.3, "resize": {"p95": 0.01, "count": 4}}, "1000": {"window": 1.0}}}
+        rows, slower = compare(old, new, threshold=1.5)
+        self.assertEqual([row[0] for row in rows], ["100/resize/p95", "100/window"])
+        self.assertEqual(slower, ["100/window"])
+
+    def test_benchmark(self):
+        env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+        process = subprocess.run([sys.executable, BENCHMARK, "--sizes", "20", "--json"], capture_output=True, text=True, env=env, timeout=300)
+        self.assertEqual(process.returncode, 0, msg=process.stderr)
+        run = json.loads(process.stdout)
+        result = run["results"]["20"]
+        self.assertEqual(result["apps"], 20)
+        for name in ("window", "catalog_load", "search_clear", "edit_dialog"):
+            self.assertGreater(result[name], 0)
+        for name in ("search_keystroke", "resize", "env_reorder", "launch_prepare"):
+            self.assertGreater(result[name]["p95"], 0)
+        self.assertEqual(result["launch_prepare_failed"], 0)
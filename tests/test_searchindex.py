@@ -0,0 +1,56 @@
+import unittest
+
+from searchindex import TrigramIndex, is_subsequence, normalise, trigrams
+
+
+class Test_SearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = TrigramIndex()
+        self.index.add(1, "Houdini 19", "SideFX Houdini 19 Description")
+        self.index.add(2, "Houdini 18", "SideFX Houdini 18 Description")
+        self.index.add(3, "Gaffer", "Gaffer Description")
+        self.index.add(4, "Gaffer Python2", "Gaffer Python2 Description")
+        self.index.add(5, "Nuke", "Compositing for gaffer scenes")
+
+    def ids(self, text):
+        return [id for id, score in self.index.search(text)]
+
+    def test_normalise(self):
+        self.assertEqual(normalise("Houdini_19.0 (FX)"), ["houdini", "19", "0", "fx"])
+        self.assertEqual(normalise(None), [])
+
+    def test_trigrams(self):
+        self.assertEqual(trigrams("Hou"), {"  h", " ho", "hou", "ou "})
+        self.assertEqual(trigrams(""), set())
+
+    def test_is_subsequence(self):
+        self.assertTrue(is_subsequence("gafr", "gaffer"))
+        self.assertTrue(is_subsequence("hou19", "houdini19"))
+        self.assertFalse(is_subsequence("hou91", "houdini19"))
+
+    def test_search(self):
+        self.assertEqual(self.ids("hou19")[0], 1)
+        self.assertEqual(set(self.ids("hou19")[:2]), {1, 2})
+        self.assertEqual(self.ids("gafr")[:2], [3, 4])
+        # A match in the description ranks lower than a match in the name
+        self.assertEqual(self.ids("gaffer")[-1], 5)
+        self.assertEqual(self.ids("houdni"), self.ids("houdni")[:2])
+        self.assertEqual(set(self.ids("houdni")), {1, 2})
+        self.assertEqual(self.ids("zzzz"), [])
+        self.assertEqual(self.ids(""), [])
+
+    def test_update(self):
+        self.index.add(3, "Blender", "")
+        self.assertEqual(len(self.index), 5)
+        self.assertEqual(self.ids("gafr"), [4, 5])
+        self.assertEqual(self.ids("blendr"), [3])
+
+    def test_remove(self):
+        self.index.remove(1)
+        self.index.remove(100)
+        self.assertEqual(len(self.index), 4)
+        self.assertFalse(1 in self.ids("houdini"))
+        for ids in self.index.postings.values():
+            self.assertFalse(1 in ids)
+        self.index.remove(2)
+        self.assertFalse(" ho" in self.index.postings)
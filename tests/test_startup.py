@@ -0,0 +1,30 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+BENCHMARK = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "startup.py")
+
+
+class Test_Startup(unittest.TestCase):
+    def run_benchmark(self, *args):
+        env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+        process = subprocess.run(
+            [sys.executable, BENCHMARK, "--json", *args], capture_output=True, text=True, env=env, timeout=120
+        )
+        return process.returncode, json.loads(process.stdout)
+
+    def test_budget(self):
+        code, results = self.run_benchmark("--import-budget", "30", "--window-budget", "30", "--paint-budget", "30")
+        self.assertEqual(code, 0, msg=results["errors"])
+        self.assertEqual(results["errors"], [])
+        for stage in ("import", "window", "paint"):
+            self.assertGreater(results[stage], 0)
+        # The dialogs and the rarely used modules are not imported before the first paint
+        self.assertEqual(results["lazy_modules_loaded"], [])
+
+    def test_over_budget(self):
+        code, results = self.run_benchmark("--widgets", "--import-budget", "0")
+        self.assertEqual(code, 1)
+        self.assertTrue(results["errors"][0].startswith("import took"))
@@ -0,0 +1,55 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from PyQt5.QtWidgets import QApplication, QDialog, QWidget
+from uicache import FormCache, form_cache, load_ui
+
+
+class Test_UiCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.app = QApplication([])
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "app.ui")
+        shutil.copy("ui/app.ui", self.path)
+        self.cache = FormCache(os.path.join(self.directory, "compiled"))
+
+    def test_load(self):
+        widget = QWidget()
+        self.cache.load(self.path, widget)
+        # The child widgets are set as attributes in the same way as uic.loadUi
+        self.assertTrue(widget.isAncestorOf(widget.launch_btn))
+        self.assertEqual(widget.edit_btn.text(), "Edit")
+        self.assertEqual(widget.size().width(), 220)
+        self.assertTrue(os.path.exists(self.cache.compiled_path(self.path)))
+        # The .ui file is compiled only once
+        self.cache.load(self.path, QWidget())
+        self.assertEqual(self.cache.compiled, 1)
+
+    def test_compiled_file(self):
+        form = self.cache.form_class(self.path)
+        # A new cache uses the compiled file of the previous one
+        cache = FormCache(self.cache.directory)
+        self.assertEqual(cache.form_class(self.path).__name__, form.__name__)
+        self.assertEqual(cache.compiled, 0)
+
+    def test_modified(self):
+        self.cache.form_class(self.path)
+        # The .ui file is compiled again when it is newer than the compiled file
+        mtime = os.path.getmtime(self.cache.compiled_path(self.path))
+        os.utime(self.path, (mtime + 10, mtime + 10))
+        self.cache.form_class(self.path)
+        self.assertEqual(self.cache.compiled, 2)
+
+    def test_load_ui(self):
+        dialog = QDialog()
+        load_ui("ui/env.ui", dialog)
+        self.assertTrue("ui/env.ui" in form_cache.forms)
+        self.assertEqual(type(dialog.name).__name__, "QLineEdit")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QDialog, QHeaderView, QTableWidgetItem
+
+from catalog import app_catalog
+from launchlog import STAGES, launch_log
+from uicache import load_ui
+
+
+class LaunchTimesDialog(QDialog):
+    """Class for the dialog displaying the p50 and p95 launch time of each app and of each stage of its launches, from the launch log.
+    The slowest apps are displayed first.
+
+    Attributes
+    ----------
+    columns : tuple
+        The headers of the columns.
+
+    statistics : dict
+        The statistics of each app keyed by App ID, given by LaunchLog.statistics.
+    """
+
+    columns: tuple = ("App", "Launches", "Failed", "Total p50", "Total p95") + tuple(f"{stage} p50 / p95" for stage in STAGES)
+    statistics: dict = {}
+
+    def __init__(self):
+        """Load UI and fill the table from the launch log."""
+        super(LaunchTimesDialog, self).__init__()
+        load_ui("ui/times.ui", self)
+        self.close_btn.clicked.connect(self.accept)
+        self.times_table.setColumnCount(len(self.columns))
+        self.times_table.setHorizontalHeaderLabels(self.columns)
+        self.times_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.load()
+
+    def load(self):
+        """Function for getting the statistics from the launch log and displaying them in the table."""
+        self.statistics = launch_log.statistics()
+        # Display the slowest apps first, and the apps without a successful launch last
+        ids = sorted(self.statistics, key=lambda id: -(self.statistics[id]["Total"][1] or 0))
+        self.times_table.setRowCount(len(ids))
+        for row, id in enumerate(ids):
+            result = self.statistics[id]
+            app = app_catalog.app(id)
+            texts = [app["Name"] if app is not None else f"Removed app {id}", str(result["Count"]), str(result["Failed"])]
+            texts.extend(format_time(value) for value in result["Total"])
+            texts.extend(" / ".join(format_time(value) for value in result[stage]) for stage in STAGES)
+            for column, text in enumerate(texts):
+                item = QTableWidgetItem(text)
+                if column > 0:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.times_table.setItem(row, column, item)
+
+
+def format_time(value):
+    """Function for formatting a time in milliseconds for the table.
+
+    Returns
+    -------
+    str
+        The time with one decimal place, or "-" if the stage is not run.
+    """
+    return "-" if value is None else f"{value:.1f}"
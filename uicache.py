@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+import glob
+import io
+import os
+import sys
+
+# The directory of the Python form classes compiled from the .ui files
+COMPILED_DIR = "ui/compiled"
+
+
+class FormCache:
+    """Class for the cache of the form classes compiled from the .ui files, so the XML is parsed once instead of for every widget.
+    The compiled code is saved in a directory and reused by the next start. It is compiled again if the .ui file is newer.
+
+    Attributes
+    ----------
+    directory : str
+        The directory of the compiled form classes.
+
+    forms : dict
+        The modification time of the .ui file and the form class keyed by the path of the .ui file.
+
+    compiled : int
+        The number of .ui files compiled, for checking that the XML is not parsed again.
+    """
+
+    directory: str = COMPILED_DIR
+    forms: dict = {}
+    compiled: int = 0
+
+    def __init__(self, directory=COMPILED_DIR):
+        """Initialise an empty cache.
+
+        Parameters
+        ----------
+        directory: str
+            The directory of the compiled form classes.
+        """
+        self.directory = directory
+        self.forms = {}
+        self.compiled = 0
+
+    def compiled_path(self, path):
+        """Function for getting the path of the compiled form class.
+
+        Parameters
+        ----------
+        path: str
+            The path of the .ui file.
+
+        Returns
+        -------
+        str
+            The path of the Python file in the directory of the compiled form classes.
+        """
+        name = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(self.directory, f"{name}_ui.py")
+
+    def compile(self, path):
+        """Function for compiling a .ui file into Python code. The code is saved in the directory of the compiled form classes if it is writable.
+
+        Parameters
+        ----------
+        path: str
+            The path of the .ui file.
+
+        Returns
+        -------
+        str
+            The Python code of the form class.
+        """
+        # uic is only needed when a .ui file is modified, so it is imported here
+        from PyQt5 import uic
+
+        code = io.StringIO()
+        with open(path) as ui:
+            uic.compileUi(ui, code)
+        self.compiled = self.compiled + 1
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self.compiled_path(path), "w") as file:
+                file.write(code.getvalue())
+        except OSError as error:
+            print("Error ", error)
+        return code.getvalue()
+
+    def form_class(self, path):
+        """Function for getting the form class of a .ui file.
+        The class is taken from memory, or from the compiled file if it is newer than the .ui file. Otherwise, the .ui file is compiled.
+
+        Parameters
+        ----------
+        path: str
+            The path of the .ui file.
+
+        Returns
+        -------
+        type
+            The form class with the setupUi function.
+        """
+        mtime = os.path.getmtime(path)
+        if path in self.forms and self.forms[path][0] == mtime:
+            return self.forms[path][1]
+        compiled = self.compiled_path(path)
+        if os.path.exists(compiled) and os.path.getmtime(compiled) >= mtime:
+            with open(compiled) as file:
+                code = file.read()
+        else:
+            code = self.compile(path)
+        namespace = {}
+        exec(compile(code, compiled, "exec"), namespace)
+        form = [value for name, value in namespace.items() if name.startswith("Ui_")][0]
+        self.forms[path] = (mtime, form)
+        return form
+
+    def load(self, path, widget):
+        """Function for setting up a widget from a .ui file, which replaces uic.loadUi.
+        The child widgets are set as attributes of the widget in the same way as uic.loadUi.
+
+        Parameters
+        ----------
+        path: str
+            The path of the .ui file.
+
+        widget: QWidget
+            The widget to set up. Its class must be the same as the top level widget in the .ui file.
+        """
+        form = self.form_class(path)()
+        form.setupUi(widget)
+        widget.__dict__.update(form.__dict__)
+
+
+# The form cache shared by the main window, the app widgets and the dialogs
+form_cache = FormCache()
+
+
+def load_ui(path, widget):
+    """Function for setting up a widget from a .ui file with the shared form cache.
+
+    Parameters
+    ----------
+    path: str
+        The path of the .ui file.
+
+    widget: QWidget
+        The widget to set up.
+    """
+    form_cache.load(path, widget)
+
+
+if __name__ == "__main__":
+    # Compile all the .ui files, e.g. before deploying the application
+    paths = sys.argv[1:] or sorted(glob.glob("ui/*.ui"))
+    for path in paths:
+        form_cache.compile(path)
+        print(f"{path} -> {form_cache.compiled_path(path)}")